@@ -8,17 +8,23 @@ Features:
   * all options must be unique
   * the correct answer must be one of the options
 - Separate Question admin for direct editing/viewing when needed.
+- Read-mostly Transcript admin to inspect and purge cached transcripts.
+- QuizJob admin to monitor asynchronous quiz-generation jobs.
+- GeneratedQuiz admin to inspect and purge cached LLM results.
+- ChannelLanguage admin to inspect or correct cached channel languages.
 
 Notes:
 - The Question model is expected to store options in a JSON-like list field
   (e.g., JSONField) named 'question_options'.
 - The inline form mirrors the list into a textarea for comfortable editing,
   and writes it back on save.
+- Quiz.rendered_json (the API snapshot) is not editable here; saves and
+  deletes rebuild it through the model signals in quiz_app/signals.py.
 '''
 
 from django.contrib import admin
 from django import forms
-from .models import Quiz, Question
+from .models import ChannelLanguage, GeneratedQuiz, Quiz, Question, QuizJob, Transcript
 
 # Register your models here.
 
@@ -105,4 +111,45 @@ class QuestionAdmin(admin.ModelAdmin):
     search_fields = ('question_title', 'answer', 'quiz__title', 'quiz__owner__username')
     list_filter = ('quiz__owner',)
     readonly_fields = ('created_at', 'updated_at')
-    ordering = ('quiz', 'id')
\ No newline at end of file
+    ordering = ('quiz', 'id')
+
+@admin.register(Transcript)
+class TranscriptAdmin(admin.ModelAdmin):
+    '''Admin for cached transcripts (inspect hit counts, delete stale entries).'''
+
+    list_display = ('id', 'video_id', 'model_name', 'transcription_model', 'duration_sec', 'queue_depth', 'hits', 'created_at', 'last_used_at')
+    search_fields = ('video_id',)
+    list_filter = ('model_name', 'transcription_model')
+    readonly_fields = ('created_at', 'last_used_at', 'hits')
+    ordering = ('-last_used_at',)
+
+@admin.register(QuizJob)
+class QuizJobAdmin(admin.ModelAdmin):
+    '''Admin for asynchronous quiz-generation jobs.'''
+
+    list_display = ('id', 'owner', 'status', 'stage', 'progress', 'language', 'quiz', 'created_at', 'finished_at')
+    list_filter = ('status', 'stage')
+    search_fields = ('url', 'owner__username', 'error')
+    readonly_fields = ('created_at', 'updated_at', 'started_at', 'finished_at')
+    ordering = ('-created_at',)
+    list_select_related = ('owner', 'quiz')
+
+@admin.register(GeneratedQuiz)
+class GeneratedQuizAdmin(admin.ModelAdmin):
+    '''Admin for cached LLM quiz results.'''
+
+    list_display = ('id', 'transcript_digest', 'num_questions', 'model_name', 'prompt_version', 'hits', 'last_used_at')
+    list_filter = ('model_name', 'prompt_version')
+    search_fields = ('transcript_digest', 'cache_key')
+    readonly_fields = ('created_at', 'last_used_at', 'hits')
+    ordering = ('-last_used_at',)
+
+@admin.register(ChannelLanguage)
+class ChannelLanguageAdmin(admin.ModelAdmin):
+    '''Admin for the per-channel language cache (correct wrong detections here).'''
+
+    list_display = ('id', 'channel_id', 'language', 'hits', 'updated_at')
+    list_filter = ('language',)
+    search_fields = ('channel_id',)
+    readonly_fields = ('created_at', 'updated_at', 'hits')
+    ordering = ('-updated_at',)
@@ -0,0 +1,109 @@
+'''Stream YouTube audio through FFmpeg straight into memory.
+
+Responsibilities:
+- Fetch the selected audio format with yt-dlp's HTTP stack (ranged requests,
+  same headers/cookies as a normal download) and pipe the bytes into an
+  FFmpeg process.
+- Let FFmpeg decode to 16 kHz mono signed 16-bit PCM on stdout and return it
+  as a float32 NumPy array that Whisper accepts directly.
+
+No temporary file is written and the audio is decoded only once.
+
+Only single-file HTTP(S) formats can be streamed this way; fragmented formats
+(DASH/HLS) or merged video+audio selections report `is_streamable() == False`
+and the caller falls back to `download_audio`.
+'''
+
+import subprocess, threading
+
+RANGE_CHUNK = 10 * 1024 * 1024
+
+def is_streamable(info: dict) -> bool:
+    '''Return True if the selected format is a single plain HTTP(S) file.'''
+
+    return bool(info.get('url')) and not info.get('requested_formats') and info.get('protocol', 'https') in ('http', 'https')
+
+def _feed(ydl, info: dict, sink, errors: list):
+    '''Copy the remote audio into `sink` using ranged requests.
+
+    YouTube throttles long unranged responses, so the file is requested in
+    RANGE_CHUNK pieces, like yt-dlp's own HTTP downloader does. A server that
+    ignores the Range header (200 instead of 206) is read in one go.
+    '''
+
+    from yt_dlp.networking import Request
+    from yt_dlp.networking.exceptions import HTTPError
+
+    headers = dict(info.get('http_headers') or {})
+    filesize = info.get('filesize')
+    start = 0
+    try:
+        while not filesize or start < filesize:
+            headers['Range'] = f"bytes={start}-{start + RANGE_CHUNK - 1}"
+            try:
+                resp = ydl.urlopen(Request(info['url'], headers=headers))
+            except HTTPError as e:
+                if e.status == 416 and start:
+                    break
+                raise
+            received = 0
+            while True:
+                block = resp.read(64 * 1024)
+                if not block:
+                    break
+                sink.write(block)
+                received += len(block)
+            start += received
+            if getattr(resp, 'status', 206) != 206 or received < RANGE_CHUNK:
+                break
+    except BrokenPipeError:
+        pass
+    except Exception as e:
+        errors.append(e)
+    finally:
+        try:
+            sink.close()
+        except OSError:
+            pass
+
+def stream_audio(info: dict, ffmpeg: str = 'ffmpeg'):
+    '''Download and decode the selected audio format into a PCM array.
+
+    Args:
+        info: yt-dlp info dict with a selected single-file audio format.
+        ffmpeg: Path of the FFmpeg binary.
+
+    Returns:
+        Mono float32 samples at 16 kHz in the range [-1, 1].
+
+    Raises:
+        ValueError: If the format cannot be streamed, the download fails or
+            FFmpeg cannot decode the data.
+    '''
+
+    import numpy as np
+    import yt_dlp
+    from .chunking import SAMPLE_RATE
+
+    if not is_streamable(info):
+        raise ValueError('Audio format cannot be streamed.')
+    cmd = [ffmpeg, '-nostdin', '-loglevel', 'error', '-i', 'pipe:0',
+           '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), 'pipe:1']
+    errors = []
+    with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        feeder = threading.Thread(target=_feed, args=(ydl, info, proc.stdin, errors), daemon=True)
+        feeder.start()
+        stderr_chunks = []
+        drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+        drain.start()
+        pcm = proc.stdout.read()
+        proc.wait()
+        feeder.join()
+        drain.join()
+    if errors:
+        raise ValueError('Failed to download audio from Youtube.')
+    if proc.returncode != 0 or not pcm:
+        detail = b''.join(stderr_chunks).decode('utf-8', errors='replace').strip()
+        raise ValueError(f"FFmpeg could not decode the audio stream. {detail}".strip())
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
@@ -0,0 +1,129 @@
+'''Parallel chunked transcription for long videos.
+
+Responsibilities:
+- Split 16 kHz mono audio into chunks of roughly WHISPER_CHUNK_SEC seconds,
+  cutting at the quietest frame near each boundary so words are not split.
+- Transcribe the chunks in a process pool (WHISPER_WORKERS processes) and
+  stitch the texts back together in order.
+
+Notes:
+- Every pool process keeps its own warm model in its own registry (the
+  engine object is pickled, its model is loaded in the child), so memory
+  use grows with the number of workers; chunking is therefore off unless
+  WHISPER_CHUNK_SEC is set (see the note next to it in settings).
+- The pool is created lazily and reused for the lifetime of the web/worker
+  process; each child limits torch to its share of the CPU cores.
+'''
+
+import multiprocessing, os, threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+
+def find_split_points(audio: np.ndarray, chunk_sec: float, search_sec: float = 5.0,
+                      frame_ms: int = 30, sr: int = SAMPLE_RATE) -> list[int]:
+    '''Return sample offsets where the audio should be cut.
+
+    For every multiple of `chunk_sec`, the quietest frame (lowest RMS energy)
+    within ±`search_sec` is chosen as the cut point; among equally quiet frames
+    the one closest to the target wins. No cut is placed in the last half
+    chunk, so the final piece is never a tiny fragment.
+
+    Args:
+        audio: Mono float32 samples.
+        chunk_sec: Target chunk length in seconds.
+        search_sec: How far around each target boundary to look for silence.
+        frame_ms: Frame size for the energy computation.
+        sr: Sample rate of `audio`.
+
+    Returns:
+        Sorted list of inner cut offsets (no 0 and no len(audio)).
+    '''
+
+    frame = max(1, sr * frame_ms // 1000)
+    n_frames = len(audio) // frame
+    if n_frames == 0 or len(audio) <= chunk_sec * sr:
+        return []
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames.astype(np.float32) ** 2, axis=1))
+
+    cuts = []
+    window = int(search_sec * sr / frame)
+    step = int(chunk_sec * sr / frame)
+    for target in range(step, n_frames - step // 2, step):
+        lo, hi = max(0, target - window), min(n_frames, target + window + 1)
+        local = energy[lo:hi]
+        quiet = np.flatnonzero(local <= local.min() + 1e-4)
+        quietest = lo + int(quiet[np.argmin(np.abs(quiet + lo - target))])
+        offset = quietest * frame + frame // 2
+        if cuts and offset <= cuts[-1]:
+            continue
+        cuts.append(offset)
+    return cuts
+
+def split_on_silence(audio: np.ndarray, chunk_sec: float, sr: int = SAMPLE_RATE) -> list[np.ndarray]:
+    '''Split audio into chunks of about `chunk_sec` seconds at quiet points.'''
+
+    return np.split(audio, find_split_points(audio, chunk_sec, sr=sr))
+
+def _init_worker(threads: int):
+    '''Pool initializer: give each child an equal share of the CPU threads.'''
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+def _transcribe_chunk(engine, chunk: np.ndarray, language: str | None = None) -> str:
+    '''Transcribe one chunk with the engine's (process-local) warm model.'''
+
+    return engine.transcribe(chunk, language=language).text
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    '''Return the shared process pool, (re)creating it for a new worker count.'''
+
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(threads,),
+            )
+            _pool_workers = workers
+        return _pool
+
+def transcribe_chunked(audio: np.ndarray, engine, chunk_sec: float, workers: int, language: str | None = None) -> str:
+    '''Transcribe audio chunk by chunk, in parallel when `workers` > 1.
+
+    Args:
+        audio: Mono 16 kHz float32 samples.
+        engine: The `engines.TranscriptionEngine` used in every worker.
+        chunk_sec: Target chunk length in seconds.
+        workers: Number of worker processes.
+        language: Language code passed to every chunk (callers detect it once
+            beforehand; None lets every chunk detect on its own).
+
+    Returns:
+        The chunk transcripts joined in their original order.
+    '''
+
+    chunks = [c for c in split_on_silence(audio, chunk_sec) if len(c)]
+    if workers <= 1 or len(chunks) <= 1:
+        texts = [_transcribe_chunk(engine, c, language) for c in chunks]
+    else:
+        n = len(chunks)
+        texts = list(_get_pool(workers).map(_transcribe_chunk, [engine] * n, chunks, [language] * n))
+    return ' '.join(t for t in texts if t)
@@ -0,0 +1,121 @@
+'''Local extractive compression of transcripts before prompting.
+
+Responsibilities:
+- Remove filler words and repeated segments (e.g. Whisper hallucination
+  loops that repeat the same sentence many times).
+- Score sentences by TF-IDF centrality (cosine similarity to the transcript
+  centroid), fully vectorized with NumPy on a sparse term list.
+- Keep the highest scoring sentences up to a target share of the original
+  words, in their original order.
+
+Settings:
+- QUIZ_COMPRESSION_RATIO: Share of words to keep (1.0 = only remove fillers
+  and repeats; 0 or None disables the stage).
+
+NumPy is imported lazily inside the functions that need it.
+'''
+
+import math, re
+
+from django.conf import settings
+
+from .tokens import split_sentences
+
+_WORD = re.compile(r'\w+')
+# Plain "um" is left alone: it is a regular word in German and Portuguese.
+_FILLER = re.compile(r'\b(?:u+h+m*|u+m{2,}|e+r+m+|h+m{2,}|ä+h+m*)\b[,.]?\s*', re.IGNORECASE)
+# Unpunctuated text (automatic captions) is cut into windows so that
+# selection still has units to choose from.
+MAX_SENTENCE_WORDS = 60
+WINDOW_WORDS = 30
+
+def _units(text: str) -> list:
+    '''Split `text` into sentences, windowing overlong ones.'''
+
+    out = []
+    for sentence in split_sentences(_FILLER.sub('', text)):
+        words = sentence.split()
+        if len(words) <= MAX_SENTENCE_WORDS:
+            out.append(sentence)
+            continue
+        out.extend(' '.join(words[i:i + WINDOW_WORDS]) for i in range(0, len(words), WINDOW_WORDS))
+    return out
+
+def dedupe_sentences(sentences: list) -> list:
+    '''Drop sentences whose normalized words repeat an earlier sentence.'''
+
+    seen, out = set(), []
+    for sentence in sentences:
+        key = ' '.join(_WORD.findall(sentence.lower()))
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        out.append(sentence)
+    return out
+
+def sentence_scores(sentences: list):
+    '''Return the TF-IDF centrality of each sentence as a NumPy array.
+
+    Each sentence is an L2-normalized TF-IDF vector; its score is the cosine
+    similarity to the mean vector of all sentences. The term matrix is kept as
+    (row, term, weight) triples, so memory grows with the number of words
+    rather than sentences × vocabulary.
+    '''
+
+    import numpy as np
+
+    n = len(sentences)
+    rows, words = [], []
+    for i, sentence in enumerate(sentences):
+        tokens = _WORD.findall(sentence.lower())
+        rows.extend([i] * len(tokens))
+        words.extend(tokens)
+    if not words:
+        return np.zeros(n)
+
+    vocab, terms = np.unique(np.array(words), return_inverse=True)
+    v = len(vocab)
+    pairs, tf = np.unique(np.asarray(rows, dtype=np.int64) * v + terms, return_counts=True)
+    row, term = pairs // v, pairs % v
+    df = np.bincount(term, minlength=v)
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weight = tf * idf[term]
+    norms = np.sqrt(np.bincount(row, weight * weight, minlength=n))
+    weight = weight / np.where(norms > 0, norms, 1)[row]
+    centroid = np.bincount(term, weight, minlength=v) / n
+    centroid_norm = np.linalg.norm(centroid) or 1.0
+    return np.bincount(row, weight * centroid[term], minlength=n) / centroid_norm
+
+def compress_transcript(text: str, ratio: float | None = None) -> str:
+    '''Return an extractive summary of `text` for the LLM prompt.
+
+    Args:
+        text: The transcript.
+        ratio: Share of the original words to keep; defaults to
+            QUIZ_COMPRESSION_RATIO. Values >= 1 only remove fillers and
+            repeated sentences; 0 returns `text` unchanged.
+
+    Returns:
+        The compressed transcript (sentences in original order).
+    '''
+
+    if ratio is None:
+        ratio = getattr(settings, 'QUIZ_COMPRESSION_RATIO', 1.0)
+    if not ratio:
+        return text
+    sentences = dedupe_sentences(_units(text))
+    if not sentences:
+        return text
+    lengths = [len(s.split()) for s in sentences]
+    target = math.ceil(ratio * len(text.split()))
+    if ratio >= 1 or sum(lengths) <= target:
+        return ' '.join(sentences)
+
+    import numpy as np
+
+    lengths = np.asarray(lengths)
+    order = np.argsort(-sentence_scores(sentences), kind='stable')
+    keep = order[np.cumsum(lengths[order]) <= target]
+    if not len(keep):
+        keep = order[:1]
+    return ' '.join(sentences[i] for i in np.sort(keep))
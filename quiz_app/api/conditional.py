@@ -0,0 +1,116 @@
+'''HTTP validators (ETag / Last-Modified) for quiz responses.
+
+Responsibilities:
+- Compute the validators of a quiz (ETag and Last-Modified) or of a user's
+  quiz library (ETag only, see `library_validators`) with a single
+  aggregate query (quiz and question timestamps and counts), without loading
+  or serializing any rows.
+- Answer conditional requests through Django's `get_conditional_response`:
+  If-None-Match / If-Modified-Since -> 304 on GET, If-Match /
+  If-Unmodified-Since -> 412 on writes when the quiz changed meanwhile.
+
+ETags are strong and differ per representation: for GET the query string
+(view, fields, cursor, ...) is part of the tag, so a sparse or paged response
+never validates a cached full one. Writes compare If-Match against the tag of
+the full representation (GET without parameters).
+'''
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..models import Quiz
+
+@dataclass(frozen=True)
+class Validators:
+    '''ETag and Last-Modified of one representation.'''
+
+    etag: str
+    last_modified: datetime | None
+
+    @property
+    def last_modified_ts(self) -> int | None:
+        '''Last-Modified as epoch seconds (HTTP dates have second precision).'''
+
+        return int(self.last_modified.timestamp()) if self.last_modified else None
+
+def _latest(*values) -> datetime | None:
+    '''Return the newest of the given timestamps, ignoring None.'''
+
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+def _make(request, last_modified, *parts) -> Validators:
+    '''Build validators from the resource state `parts` and the requested representation.'''
+
+    query = ''
+    if request.method in ('GET', 'HEAD'):
+        query = '&'.join(sorted(request.query_params.urlencode().split('&')))
+    raw = '|'.join(str(p) for p in (*parts, query))
+    return Validators(quote_etag(hashlib.sha1(raw.encode()).hexdigest()), last_modified)
+
+def quiz_state(quiz_id) -> dict | None:
+    '''Return owner, timestamps and question count of a quiz, or None if it does not exist.'''
+
+    return (
+        Quiz.objects.filter(pk=quiz_id)
+        .annotate(question_count=Count('questions'), questions_updated_at=Max('questions__updated_at'))
+        .values('id', 'owner_id', 'question_count', 'updated_at', 'questions_updated_at')
+        .first()
+    )
+
+def quiz_validators(request, state: dict) -> Validators:
+    '''Return the validators of a single quiz from `quiz_state`.'''
+
+    last_modified = _latest(state['updated_at'], state['questions_updated_at'])
+    return _make(request, last_modified, state['id'], state['question_count'],
+                 state['updated_at'], state['questions_updated_at'])
+
+def library_validators(request, user) -> Validators:
+    '''Return the ETag of all quizzes owned by `user` in one aggregate query.
+
+    There is no Last-Modified: deleting a quiz does not move the newest
+    timestamp, so If-Modified-Since would validate a list that still shows
+    the deleted quiz. The ETag covers deletions through the quiz count.
+    '''
+
+    state = Quiz.objects.filter(owner=user).aggregate(
+        quiz_count=Count('id', distinct=True),
+        question_count=Count('questions'),
+        updated_at=Max('updated_at'),
+        questions_updated_at=Max('questions__updated_at'),
+    )
+    return _make(request, None, user.pk, state['quiz_count'], state['question_count'],
+                 state['updated_at'], state['questions_updated_at'])
+
+def set_validators(response, validators: Validators):
+    '''Add ETag and Last-Modified headers to `response` and return it.'''
+
+    response['ETag'] = validators.etag
+    if validators.last_modified_ts is not None:
+        response['Last-Modified'] = http_date(validators.last_modified_ts)
+    return response
+
+def conditional_response(request, validators: Validators):
+    '''Return a 304/412 response if the request's preconditions say so, else None.
+
+    Args:
+        request: The DRF request.
+        validators: Current validators of the resource.
+    '''
+
+    response = get_conditional_response(
+        request._request, etag=validators.etag, last_modified=validators.last_modified_ts,
+    )
+    if response is None:
+        return None
+    if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+        return Response({'detail': 'The quiz was modified since you last fetched it.'},
+                        status=status.HTTP_412_PRECONDITION_FAILED)
+    return set_validators(response, validators)
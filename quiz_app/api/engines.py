@@ -0,0 +1,213 @@
+'''Pluggable speech-to-text engines for the quiz pipeline.
+
+Responsibilities:
+- Define the engine interface used by `services.transcribe_audio` and the
+  chunked transcription pool: `transcribe(audio, language=None)` returning
+  the text and the (detected or given) language, and `detect_language(audio)`.
+- Provide the engines selected by TRANSCRIPTION_ENGINE:
+    - 'whisper': openai-whisper on PyTorch (default), optionally with
+      dynamically int8-quantized Linear layers (WHISPER_QUANTIZE=int8).
+    - 'faster-whisper': CTranslate2 backend with int8 weights, usually several
+      times faster on CPU (optional dependency `faster-whisper`).
+    - 'fake': deterministic offline engine for tests and development.
+
+Engines are small picklable objects; models are loaded lazily through a
+process-wide ModelRegistry, so chunk worker processes keep their own warm copy.
+
+Settings:
+- TRANSCRIPTION_ENGINE: Engine name (see ENGINES).
+- WHISPER_MODEL: Model size/name passed to the engine.
+- WHISPER_QUANTIZE: '' (fp32, default) or 'int8' for the whisper engine.
+- FASTER_WHISPER_COMPUTE_TYPE: CTranslate2 compute type (default 'int8').
+'''
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from . import whisper_models
+from .whisper_models import ModelRegistry
+
+SAMPLE_RATE = 16000
+
+@dataclass(frozen=True)
+class TranscriptionResult:
+    '''Text produced by an engine and the language it was transcribed in.'''
+
+    text: str
+    language: str | None = None
+
+class TranscriptionEngine(ABC):
+    '''Abstract base class of all engines.
+
+    Subclasses must implement `load_audio` and `transcribe`; `detect_language`
+    is optional.
+
+    Args:
+        model_name: Model size/name understood by the engine.
+    '''
+
+    name = ''
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @property
+    def source(self) -> str:
+        '''Key under which this engine's transcripts are cached.'''
+
+        return f"{self.name}:{self.model_name}"
+
+    @abstractmethod
+    def load_audio(self, path: str):
+        '''Decode an audio file to mono 16 kHz float32 samples.'''
+
+    @abstractmethod
+    def transcribe(self, audio, language: str | None = None) -> TranscriptionResult:
+        '''Transcribe a file path or 16 kHz float32 samples.'''
+
+    def detect_language(self, audio) -> str | None:
+        '''Return the spoken language of the first 30 s of 16 kHz float32 samples.'''
+
+        return None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.model_name!r})"
+
+class WhisperEngine(TranscriptionEngine):
+    '''openai-whisper on PyTorch, models from `whisper_models.registry`.
+
+    Args:
+        model_name: Whisper model size/name (e.g. 'small').
+        quantize: None for fp32 weights, or 'int8' for dynamic int8
+            quantization of the Linear layers (CPU only).
+    '''
+
+    name = 'whisper'
+
+    def __init__(self, model_name: str, quantize: str | None = None):
+        if quantize not in (None, whisper_models.INT8):
+            raise ValueError(f"Unsupported Whisper precision '{quantize}'.")
+        super().__init__(model_name)
+        self.quantize = quantize
+
+    @property
+    def registry_key(self):
+        '''Key of this engine's model in `whisper_models.registry`.'''
+
+        return (self.model_name, self.quantize) if self.quantize else self.model_name
+
+    @property
+    def source(self) -> str:
+        # Plain model names keep transcripts cached before engines existed valid.
+        return f"{self.model_name}:{self.quantize}" if self.quantize else self.model_name
+
+    def load_audio(self, path: str):
+        from whisper.audio import load_audio
+        return load_audio(path)
+
+    def transcribe(self, audio, language: str | None = None) -> TranscriptionResult:
+        if language:
+            from whisper.tokenizer import LANGUAGES
+            # Unsupported codes would make whisper raise; detect instead.
+            language = language if language in LANGUAGES else None
+        options = {'fp16': False} if self.quantize else {}
+        with whisper_models.registry.lease(self.registry_key) as model:
+            result = model.transcribe(audio, language=language, **options)
+        return TranscriptionResult(result.get('text', '').strip(), result.get('language') or language)
+
+    def detect_language(self, audio) -> str | None:
+        import whisper
+        with whisper_models.registry.lease(self.registry_key) as model:
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels).to(model.device)
+            _, probs = model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+def _load_faster_whisper(key: tuple):
+    '''Loader for `ct2_registry`: key is (model_name, device, compute_type).'''
+
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        raise ValueError('faster-whisper is not installed (pip install faster-whisper).')
+    model_name, device, compute_type = key
+    return WhisperModel(model_name, device=device, compute_type=compute_type)
+
+ct2_registry = ModelRegistry(loader=_load_faster_whisper)
+
+class FasterWhisperEngine(TranscriptionEngine):
+    '''CTranslate2 Whisper implementation (faster-whisper), int8 on CPU by default.
+
+    Args:
+        model_name: Whisper model size/name (e.g. 'small').
+        compute_type: CTranslate2 compute type ('int8', 'int8_float32', 'float32', ...).
+        device: 'cpu' or 'cuda'.
+    '''
+
+    name = 'faster-whisper'
+
+    def __init__(self, model_name: str, compute_type: str = 'int8', device: str = 'cpu'):
+        super().__init__(model_name)
+        self.compute_type, self.device = compute_type, device
+
+    @property
+    def source(self) -> str:
+        return f"{self.name}:{self.model_name}:{self.compute_type}"
+
+    def load_audio(self, path: str):
+        from faster_whisper import decode_audio
+        return decode_audio(path, sampling_rate=SAMPLE_RATE)
+
+    def transcribe(self, audio, language: str | None = None) -> TranscriptionResult:
+        model = ct2_registry.get((self.model_name, self.device, self.compute_type))
+        segments, info = model.transcribe(audio, language=language)
+        text = ' '.join(s.text.strip() for s in segments if s.text.strip())
+        return TranscriptionResult(text, getattr(info, 'language', None) or language)
+
+    def detect_language(self, audio) -> str | None:
+        model = ct2_registry.get((self.model_name, self.device, self.compute_type))
+        language, _, _ = model.detect_language(audio)
+        return language
+
+class FakeEngine(TranscriptionEngine):
+    '''Deterministic engine that describes the audio instead of transcribing it.'''
+
+    name = 'fake'
+
+    def load_audio(self, path: str):
+        import numpy as np
+        with open(path, 'rb') as f:
+            return np.zeros(len(f.read()), dtype=np.float32)
+
+    def transcribe(self, audio, language: str | None = None) -> TranscriptionResult:
+        if isinstance(audio, str):
+            audio = self.load_audio(audio)
+        seconds = len(audio) / SAMPLE_RATE
+        return TranscriptionResult(f"Fake transcript of {seconds:.1f} seconds of audio.", language or 'en')
+
+    def detect_language(self, audio) -> str | None:
+        return 'en'
+
+ENGINES = {
+    WhisperEngine.name: WhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+    FakeEngine.name: FakeEngine,
+}
+
+def get_engine(name: str | None = None, model_name: str | None = None) -> TranscriptionEngine:
+    '''Return the engine configured in settings (or the given one).
+
+    Raises:
+        ValueError: If the engine name is unknown.
+    '''
+
+    name = name or getattr(settings, 'TRANSCRIPTION_ENGINE', 'whisper')
+    model_name = model_name or getattr(settings, 'WHISPER_MODEL', 'small')
+    if name not in ENGINES:
+        raise ValueError(f"Unknown transcription engine '{name}'.")
+    if name == WhisperEngine.name:
+        return WhisperEngine(model_name, quantize=getattr(settings, 'WHISPER_QUANTIZE', None) or None)
+    if name == FasterWhisperEngine.name:
+        return FasterWhisperEngine(model_name, compute_type=getattr(settings, 'FASTER_WHISPER_COMPUTE_TYPE', 'int8'))
+    return ENGINES[name](model_name)
@@ -0,0 +1,109 @@
+'''Sparse fieldsets for quiz responses (?fields= and ?fields[questions]=).
+
+Responsibilities:
+- Parse and validate the requested field names per resource.
+- Narrow the quiz queryset to the requested columns (`only()`) and skip the
+  questions prefetch (or narrow it) when questions are not requested, so
+  unrequested fields are never fetched from the database.
+- Let serializers drop unrequested fields (FieldsetMixin), so they are not
+  serialized either.
+
+Query parameters:
+- fields: Comma separated quiz fields, e.g. 'id,title,updated_at'.
+- fields[questions]: Comma separated question fields, e.g. 'id,question_title'.
+Omitting a parameter keeps all fields of that resource.
+'''
+
+from django.db.models import Count, Prefetch
+from rest_framework.exceptions import ValidationError
+
+from ..models import Question
+
+QUIZ_FIELDS = ('id', 'title', 'description', 'created_at', 'updated_at', 'video_url', 'questions')
+SUMMARY_FIELDS = ('id', 'title', 'description', 'created_at', 'updated_at', 'video_url', 'question_count')
+QUESTION_FIELDS = ('id', 'question_title', 'question_options', 'answer', 'created_at', 'updated_at')
+
+# Columns always loaded: the pk, the owner (permission checks) and created_at (cursor pagination).
+_QUIZ_REQUIRED = {'id', 'owner', 'created_at'}
+_QUESTION_REQUIRED = {'id', 'quiz'}
+
+def _parse(params, key: str, allowed: tuple) -> set | None:
+    '''Return the field names given in `params[key]`, or None if absent.
+
+    Raises:
+        ValidationError: If the list is empty or names an unknown field.
+    '''
+
+    value = params.get(key)
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = sorted(names - set(allowed))
+    if not names or unknown:
+        raise ValidationError({key: f"Unknown field(s): {', '.join(unknown) or '(none given)'}. "
+                                    f"Allowed: {', '.join(allowed)}."})
+    return names
+
+def parse_fieldsets(params, quiz_fields: tuple = QUIZ_FIELDS) -> dict:
+    '''Return {'quiz': names or None, 'questions': names or None} from query parameters.
+
+    Args:
+        params: Request query parameters.
+        quiz_fields: Quiz fields of the serializer in use.
+
+    Raises:
+        ValidationError: For unknown field names.
+    '''
+
+    return {
+        'quiz': _parse(params, 'fields', quiz_fields),
+        'questions': _parse(params, 'fields[questions]', QUESTION_FIELDS),
+    }
+
+def wants(fieldsets: dict, resource: str, field: str) -> bool:
+    '''Return True if `field` of `resource` is part of the response.'''
+
+    names = (fieldsets or {}).get(resource)
+    return names is None or field in names
+
+def apply_fieldsets(queryset, fieldsets: dict, summary: bool = False):
+    '''Narrow a Quiz queryset to what the fieldsets need.
+
+    Args:
+        queryset: Quiz queryset (without prefetches/annotations).
+        fieldsets: Result of `parse_fieldsets`.
+        summary: Annotate `question_count` instead of prefetching questions.
+    '''
+
+    names = fieldsets.get('quiz')
+    if names is not None:
+        queryset = queryset.only(*(_QUIZ_REQUIRED | (names - {'questions', 'question_count'})))
+    else:
+        # The serializers never read the JSON snapshot column (see snapshots.py).
+        queryset = queryset.defer('rendered_json')
+    if summary:
+        if wants(fieldsets, 'quiz', 'question_count'):
+            queryset = queryset.annotate(question_count=Count('questions'))
+        return queryset
+    if not wants(fieldsets, 'quiz', 'questions'):
+        return queryset
+    questions = Question.objects.all()
+    if fieldsets.get('questions') is not None:
+        questions = questions.only(*(_QUESTION_REQUIRED | fieldsets['questions']))
+    return queryset.prefetch_related(Prefetch('questions', queryset=questions))
+
+class FieldsetMixin:
+    '''Serializer mixin dropping the fields not requested in context['fieldsets'].
+
+    Nested serializers see the root context, so QuestionSerializer inside
+    QuizSerializer is narrowed by the 'questions' fieldset.
+    '''
+
+    fieldset = None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        names = (self.context.get('fieldsets') or {}).get(self.fieldset)
+        if names is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in names}
@@ -0,0 +1,178 @@
+'''Database-backed job queue for asynchronous quiz generation.
+
+Responsibilities:
+- Enqueue a quiz-generation request (called by the API, returns immediately).
+- Atomically claim the next pending job so several workers can share the queue.
+- Run the yt-dlp → Whisper → Gemini pipeline for a claimed job and record
+  stage, progress, the resulting quiz or the error message.
+
+Workers are started with the `process_quiz_jobs` management command.
+
+A running job is owned by the claim that started it (its `started_at`):
+a heartbeat thread keeps `updated_at` fresh during long stages (a single
+transcription can run for over an hour on CPU), and progress and the final
+state are only written while the claim still holds, so a worker whose job was
+reclaimed after going stale cannot overwrite the new owner's result.
+
+Settings:
+- QUIZ_JOB_STALE_SEC: Running jobs without a progress update or heartbeat for
+  this long are considered abandoned (e.g. a crashed worker) and are claimed again.
+- QUIZ_JOB_HEARTBEAT_SEC: Interval of the heartbeat of a running job (must be
+  well below QUIZ_JOB_STALE_SEC; 0 disables it).
+'''
+
+import logging, threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import QuizJob
+from .metrics import jobs_finished
+from .services import create_quiz_from_youtube, extract_youtube_id, YOUTUBE_CANONICAL
+
+logger = logging.getLogger(__name__)
+
+def enqueue_quiz_job(url: str, owner, num_questions: int = 10, language: str | None = None) -> QuizJob:
+    '''Validate the URL and create a pending job for it.
+
+    Raises:
+        ValueError: If the URL is not a supported YouTube URL.
+    '''
+
+    vid = extract_youtube_id(url)
+    return QuizJob.objects.create(owner=owner, url=YOUTUBE_CANONICAL.format(vid=vid),
+                                  num_questions=num_questions, language=language or '')
+
+def _claimable():
+    '''Return a queryset of pending jobs plus running jobs that went stale.'''
+
+    cond = Q(status=QuizJob.PENDING)
+    stale_sec = getattr(settings, 'QUIZ_JOB_STALE_SEC', None)
+    if stale_sec:
+        cond |= Q(status=QuizJob.RUNNING, updated_at__lt=timezone.now() - timedelta(seconds=stale_sec))
+    return QuizJob.objects.filter(cond)
+
+def claim_next_job() -> QuizJob | None:
+    '''Atomically move the oldest claimable job to RUNNING and return it.
+
+    The conditional UPDATE guarantees that two workers never claim the same
+    job, without relying on SELECT ... FOR UPDATE (unsupported by SQLite).
+    '''
+
+    while True:
+        candidate = _claimable().order_by('created_at', 'id').values_list('pk', 'status', 'updated_at').first()
+        if candidate is None:
+            return None
+        pk, status, updated_at = candidate
+        now = timezone.now()
+        claimed = QuizJob.objects.filter(pk=pk, status=status, updated_at=updated_at).update(
+            status=QuizJob.RUNNING, stage='starting', progress=0, error='', started_at=now, updated_at=now,
+        )
+        if claimed:
+            return QuizJob.objects.get(pk=pk)
+
+def _owned(job: QuizJob):
+    '''Return a queryset matching `job` only while this worker's claim holds.'''
+
+    return QuizJob.objects.filter(pk=job.pk, status=QuizJob.RUNNING, started_at=job.started_at)
+
+class _Heartbeat(threading.Thread):
+    '''Background thread refreshing a running job's `updated_at`.
+
+    Keeps a job that sits in one long stage from looking stale; stops on its
+    own once the claim is lost.
+
+    Args:
+        job: The claimed job.
+        interval: Seconds between beats.
+    '''
+
+    def __init__(self, job: QuizJob, interval: float):
+        super().__init__(name=f"quiz-job-{job.pk}-heartbeat", daemon=True)
+        self.job, self.interval = job, interval
+        self._done = threading.Event()
+
+    def run(self):
+        try:
+            while not self._done.wait(self.interval):
+                try:
+                    if not _owned(self.job).update(updated_at=timezone.now()):
+                        break
+                except DatabaseError:
+                    # E.g. SQLite busy with the pipeline's own writes; the next beat retries.
+                    continue
+        finally:
+            connection.close()
+
+    def stop(self):
+        '''Stop beating and wait for the thread to exit.'''
+
+        self._done.set()
+        self.join()
+
+def run_job(job: QuizJob) -> QuizJob:
+    '''Run the quiz pipeline for a claimed job and store the outcome.'''
+
+    def progress(stage: str, percent: int):
+        _owned(job).update(stage=stage, progress=percent, updated_at=timezone.now())
+
+    interval = getattr(settings, 'QUIZ_JOB_HEARTBEAT_SEC', 0)
+    heartbeat = _Heartbeat(job, interval) if interval else None
+    if heartbeat:
+        heartbeat.start()
+    try:
+        quiz = create_quiz_from_youtube(job.url, owner=job.owner, num_questions=job.num_questions,
+                                        progress=progress, language=job.language or None)
+    except ValueError as e:
+        _finish(job, QuizJob.FAILED, error=str(e))
+    except Exception as e:
+        # The job only stores a generic message; keep the traceback in the worker log.
+        logger.exception('quiz job %s failed', job.pk)
+        _finish(job, QuizJob.FAILED, error=f"Internal server error: {e}" if settings.DEBUG else 'Internal server error.')
+    else:
+        if not _finish(job, QuizJob.SUCCEEDED, quiz=quiz):
+            # Another worker reclaimed the job and produces its quiz; drop the duplicate.
+            quiz.delete()
+    finally:
+        if heartbeat:
+            heartbeat.stop()
+    return job
+
+def _finish(job: QuizJob, status: str, quiz=None, error: str = '') -> bool:
+    '''Persist the terminal state of a job if this worker still holds its claim.
+
+    Failed jobs keep the stage/progress they reached, so clients can tell
+    where the pipeline stopped.
+
+    Returns:
+        False if the job was reclaimed by another worker (nothing is written).
+    '''
+
+    now = timezone.now()
+    fields = {'status': status, 'quiz': quiz, 'error': error, 'finished_at': now, 'updated_at': now}
+    if status == QuizJob.SUCCEEDED:
+        fields.update(stage='done', progress=100)
+    finished = _owned(job).update(**fields)
+    job.refresh_from_db()
+    if finished:
+        jobs_finished.inc(status=status)
+    return bool(finished)
+
+def run_pending_jobs(max_jobs: int | None = None) -> int:
+    '''Claim and run jobs until the queue is empty (or `max_jobs` were run).
+
+    Returns:
+        The number of processed jobs.
+    '''
+
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        done += 1
+    return done
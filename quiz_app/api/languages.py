@@ -0,0 +1,71 @@
+'''Known spoken language of a video, so transcription can skip detection.
+
+Responsibilities:
+- Normalize language codes from requests and yt-dlp ('en-US' -> 'en').
+- Resolve the language of a video from, in order: the language given with
+  the quiz request, the yt-dlp metadata, the cached language of its channel.
+- Remember the language detected for a channel (ChannelLanguage), so later
+  videos of the same channel are transcribed without a detection pass.
+'''
+
+import re
+
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import ChannelLanguage
+from .metrics import language_sources
+
+_CODE = re.compile(r'^[a-z]{2,3}$')
+
+def normalize_language(code) -> str | None:
+    '''Return the primary subtag of a language code, or None if it is not one.'''
+
+    if not code or not isinstance(code, str):
+        return None
+    primary = re.split(r'[-_]', code.strip().lower(), maxsplit=1)[0]
+    return primary if _CODE.match(primary) else None
+
+def channel_id(info: dict) -> str | None:
+    '''Return the channel identifier from a yt-dlp info dict.'''
+
+    return info.get('channel_id') or info.get('uploader_id') or None
+
+def resolve_language(info: dict, preferred: str | None = None) -> str | None:
+    '''Return the best known language for a video, or None to let the engine detect it.
+
+    Args:
+        info: yt-dlp info dict of the video.
+        preferred: Language given with the quiz request.
+    '''
+
+    language = normalize_language(preferred)
+    if language:
+        language_sources.inc(source='request')
+        return language
+    language = normalize_language(info.get('language'))
+    if language:
+        language_sources.inc(source='metadata')
+        return language
+    channel = channel_id(info)
+    if channel:
+        entry = ChannelLanguage.objects.filter(channel_id=channel).only('id', 'language').first()
+        if entry is not None:
+            ChannelLanguage.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, updated_at=timezone.now())
+            language_sources.inc(source='channel')
+            return entry.language
+    language_sources.inc(source='detected')
+    return None
+
+def remember_language(info: dict, language: str | None) -> None:
+    '''Store the language of a transcribed video for its channel.'''
+
+    channel, language = channel_id(info), normalize_language(language)
+    if not (channel and language):
+        return
+    try:
+        ChannelLanguage.objects.update_or_create(channel_id=channel, defaults={'language': language})
+    except IntegrityError:
+        # A concurrent transcription of the same channel stored it first.
+        pass
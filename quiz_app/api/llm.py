@@ -0,0 +1,113 @@
+'''Process-wide Gemini client for the quiz pipeline.
+
+Responsibilities:
+- Create the google-genai client lazily, once per process, and reuse it for
+  every quiz so its HTTP connection pool (keep-alive, TLS sessions) is shared.
+  Only the sync API (`client.models`) is used; long transcripts fan out over
+  a thread pool in `services`, which the sync pool is safe to share with.
+- Apply a configurable request timeout.
+- Provide a deterministic local fake backend for tests and offline development.
+
+Settings:
+- GEMINI_BACKEND: 'google' (default) or 'fake'.
+- GEMINI_API_KEY: API key for the google backend.
+- GEMINI_MODEL: Model name passed to generate_content.
+- GEMINI_TIMEOUT_SEC: Per-request timeout in seconds.
+'''
+
+import hashlib, json, re, threading
+from types import SimpleNamespace
+
+from django.conf import settings
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+def gemini_model_name() -> str:
+    '''Return the configured Gemini model name.'''
+
+    return getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
+
+def _client_config() -> tuple:
+    '''Return the settings that define the current client (used to detect changes).'''
+
+    return (
+        getattr(settings, 'GEMINI_BACKEND', 'google'),
+        getattr(settings, 'GEMINI_API_KEY', ''),
+        getattr(settings, 'GEMINI_TIMEOUT_SEC', 120),
+    )
+
+def _build_client(backend: str, api_key: str, timeout_sec):
+    '''Instantiate a client for the given backend.'''
+
+    if backend == 'fake':
+        return FakeGeminiClient()
+    if not api_key:
+        raise ValueError('GEMINI_API_KEY is not configured.')
+    from google import genai
+    from google.genai import types
+    http_options = types.HttpOptions(timeout=int(timeout_sec * 1000)) if timeout_sec else None
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+def get_gemini_client():
+    '''Return the shared Gemini client, creating it on first use.
+
+    The client is rebuilt only when the backend, API key or timeout settings
+    change (e.g. in tests using override_settings).
+
+    Raises:
+        ValueError: If the google backend is selected and GEMINI_API_KEY is missing.
+    '''
+
+    global _client, _client_key
+    key = _client_config()
+    client = _client
+    if client is not None and _client_key == key:
+        return client
+    with _client_lock:
+        if _client is None or _client_key != key:
+            _client = _build_client(*key)
+            _client_key = key
+        return _client
+
+def reset_gemini_client():
+    '''Drop the shared client (the next call creates a new one).'''
+
+    global _client, _client_key
+    with _client_lock:
+        _client, _client_key = None, None
+
+class FakeGeminiClient:
+    '''Deterministic offline stand-in for `genai.Client`.
+
+    Mirrors `client.models.generate_content(...)`. The reply is a valid quiz JSON
+    with as many questions as the prompt asks for, so the whole pipeline can
+    run without network access.
+    '''
+
+    def __init__(self):
+        self.calls = []
+        self.models = SimpleNamespace(generate_content=self._generate)
+
+    def _generate(self, model: str, contents, config=None):
+        '''Return a response object with a `.text` quiz JSON.'''
+
+        prompt = contents if isinstance(contents, str) else str(contents)
+        self.calls.append({'model': model, 'contents': prompt, 'config': config})
+        m = re.search(r"exactly (\d+) questions", prompt)
+        n = int(m.group(1)) if m else 10
+        # Distinct prompts (e.g. transcript sections) yield distinct questions.
+        tag = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:6]
+        quiz = {
+            'title': 'Generated Quiz',
+            'description': 'A quiz generated by the local fake Gemini backend.',
+            'questions': [
+                {
+                    'question_title': f"Question {i + 1} ({tag})?",
+                    'question_options': [f"Option {i + 1}{c}" for c in 'ABCD'],
+                    'answer': f"Option {i + 1}A",
+                } for i in range(n)
+            ],
+        }
+        return SimpleNamespace(text=json.dumps(quiz))
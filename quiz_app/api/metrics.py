@@ -0,0 +1,221 @@
+'''In-process metrics for the quiz pipeline, rendered in Prometheus text format.
+
+Responsibilities:
+- Thread-safe counters and histograms with labels.
+- `timed_stage(name)` decorator/context manager recording the duration and
+  success/failure of each pipeline stage.
+- Render all metrics (plus cache/registry counters of the other pipeline
+  modules) for the staff-only GET /api/metrics/ endpoint.
+- Serve the same text from a standalone HTTP exporter (`start_metrics_server`)
+  for processes without a web server, i.e. `process_quiz_jobs` workers.
+
+Metrics are per process. With asynchronous jobs (QUIZ_ASYNC_JOBS) the pipeline
+stages run in the job workers, so their counters are only visible on each
+worker's exporter (`process_quiz_jobs --metrics-port`); /api/metrics/ then
+mostly reflects the web process (response cache, synchronous requests).
+Scrape every process and aggregate at the collector.
+'''
+
+import bisect, contextlib, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+SIZE_BUCKETS = (100, 1000, 5000, 10000, 25000, 50000, 100000, 250000, 500000)
+
+def _label_str(labels: tuple) -> str:
+    '''Format a sorted (name, value) tuple as a Prometheus label set.'''
+
+    if not labels:
+        return ''
+    escape = lambda v: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    inner = ','.join(f'{k}="{escape(v)}"' for k, v in labels)
+    return '{' + inner + '}'
+
+class Counter:
+    '''Monotonic counter with optional labels.'''
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help = name, help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        '''Add `amount` to the series identified by `labels`.'''
+
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        '''Return the current value of one series.'''
+
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self) -> list:
+        '''Return (suffix, labels, value) tuples for rendering.'''
+
+        with self._lock:
+            return [('', key, v) for key, v in sorted(self._values.items())]
+
+class Histogram:
+    '''Cumulative histogram with fixed buckets and optional labels.'''
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets=DURATION_BUCKETS):
+        self.name, self.help = name, help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        '''Record one observation.'''
+
+        key = tuple(sorted(labels.items()))
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[idx] += 1
+            self._series[key] = (counts, total + value)
+
+    def count(self, **labels) -> int:
+        '''Return the number of observations of one series.'''
+
+        with self._lock:
+            counts, _ = self._series.get(tuple(sorted(labels.items())), ([0], 0.0))
+            return sum(counts)
+
+    def samples(self) -> list:
+        '''Return (suffix, labels, value) tuples for rendering.'''
+
+        out = []
+        with self._lock:
+            series = sorted((k, (list(c), t)) for k, (c, t) in self._series.items())
+        for key, (counts, total) in series:
+            running = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                running += n
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                out.append(('_bucket', key + (('le', le),), running))
+            out.append(('_sum', key, total))
+            out.append(('_count', key, running))
+        return out
+
+stage_seconds = Histogram('quiz_stage_duration_seconds', 'Duration of quiz pipeline stages.')
+stage_total = Counter('quiz_stage_total', 'Pipeline stage executions by outcome.')
+audio_seconds = Counter('quiz_audio_seconds_total', 'Seconds of audio transcribed.')
+transcript_chars = Histogram('quiz_transcript_characters', 'Length of transcripts passed to the LLM.', SIZE_BUCKETS)
+llm_responses = Counter('quiz_llm_responses_total', 'Generated quizzes by LLM output mode and final outcome (ok, repaired, parse_error, invalid).')
+model_selections = Counter('quiz_whisper_model_selected_total', 'Transcriptions by Whisper model chosen by the selection policy.')
+language_sources = Counter('quiz_transcription_language_total', 'Transcriptions by language source (request, metadata, channel, detected).')
+response_cache_lookups = Counter('quiz_response_cache_total', 'Quiz API response cache lookups by endpoint and result (hit, miss).')
+jobs_finished = Counter('quiz_jobs_total', 'Quiz generation jobs finished by this process, by status (succeeded, failed).')
+
+METRICS = [
+    stage_seconds, stage_total, audio_seconds, transcript_chars, llm_responses, model_selections, language_sources,
+    response_cache_lookups, jobs_finished,
+]
+
+class _StageTimer(contextlib.ContextDecorator):
+    '''Times a block/function and records outcome under a stage label.'''
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def _recreate_cm(self):
+        # A fresh timer per decorated call keeps concurrent calls independent.
+        return _StageTimer(self.stage)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stage_seconds.observe(time.perf_counter() - self._start, stage=self.stage)
+        stage_total.inc(stage=self.stage, outcome='failure' if exc_type else 'success')
+        return False
+
+def timed_stage(stage: str):
+    '''Decorator/context manager recording duration and outcome of a stage.
+
+    Usage:
+        @timed_stage('download_audio')
+        def download_audio(...): ...
+    '''
+
+    return _StageTimer(stage)
+
+def _collected() -> list:
+    '''Return gauges/counters kept by the other pipeline modules.'''
+
+    from .quiz_cache import quiz_cache_stats
+    from .single_flight import single_flight_stats
+    from .transcript_cache import cache_stats
+    from .whisper_models import registry
+
+    transcript = cache_stats()
+    models = registry.stats()
+    flights = single_flight_stats()
+    quizzes = quiz_cache_stats()
+    return [
+        ('quiz_transcript_cache_hits_total', 'counter', 'Transcript cache hits.', transcript['hits']),
+        ('quiz_transcript_cache_misses_total', 'counter', 'Transcript cache misses.', transcript['misses']),
+        ('quiz_result_cache_hits_total', 'counter', 'Quiz result cache hits.', quizzes['hits']),
+        ('quiz_result_cache_misses_total', 'counter', 'Quiz result cache misses.', quizzes['misses']),
+        ('quiz_whisper_model_loads_total', 'counter', 'Whisper model loads.', models['loads']),
+        ('quiz_whisper_model_hits_total', 'counter', 'Warm Whisper model hits.', models['hits']),
+        ('quiz_whisper_models_loaded', 'gauge', 'Whisper models currently in memory.', len(models['loaded'])),
+        ('quiz_single_flight_leaders_total', 'counter', 'Requests that fetched a transcript themselves.', flights['leaders']),
+        ('quiz_single_flight_waited_total', 'counter', 'Requests that waited for another request.', flights['waited']),
+    ]
+
+def render_prometheus() -> str:
+    '''Render all metrics in the Prometheus text exposition format (0.0.4).'''
+
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for suffix, labels, value in metric.samples():
+            lines.append(f"{metric.name}{suffix}{_label_str(labels)} {value}")
+    for name, kind, help_text, value in _collected():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+    return '\n'.join(lines) + '\n'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    '''Answers every GET with the rendered metrics of this process.'''
+
+    def do_GET(self):
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the worker's stderr.
+        pass
+
+def start_metrics_server(port: int, addr: str = '') -> ThreadingHTTPServer:
+    '''Serve this process's metrics over HTTP from a daemon thread.
+
+    Args:
+        port: TCP port to listen on (0 picks a free one, see `server_port`).
+        addr: Interface to bind; all interfaces by default.
+
+    Returns:
+        The running server; call `shutdown()` and `server_close()` to stop it.
+    '''
+
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-exporter', daemon=True).start()
+    return server
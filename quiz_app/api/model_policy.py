@@ -0,0 +1,92 @@
+'''Duration- and load-aware choice of the Whisper model size.
+
+Responsibilities:
+- Parse the tier policy WHISPER_MODEL_POLICY, e.g. '900:small,3600:base,*:tiny'
+  (videos up to 900 s use 'small', up to 3600 s 'base', longer ones 'tiny').
+  Tiers are listed from the most accurate to the fastest model.
+- Step down one tier per WHISPER_QUEUE_DOWNGRADE_DEPTH pending quiz jobs, so
+  a long queue is drained faster.
+- Without a policy, WHISPER_MODEL is always used.
+- A malformed policy is a server misconfiguration: it raises
+  ImproperlyConfigured (HTTP 500, never a client 400) and is reported at
+  startup by the `quiz_app.E001` system check (see `quiz_app.checks`).
+
+Settings:
+- WHISPER_MODEL_POLICY: Comma separated '<max seconds>:<model>' tiers; '*'
+  marks the catch-all tier. Empty disables the policy.
+- WHISPER_QUEUE_DOWNGRADE_DEPTH: Pending jobs per downgrade step (0 = ignore
+  the queue).
+'''
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+@dataclass(frozen=True)
+class ModelChoice:
+    '''The selected model and the inputs that led to it.'''
+
+    model_name: str
+    duration_sec: float | None
+    queue_depth: int
+
+def parse_policy(value: str) -> list:
+    '''Parse '<max seconds>:<model>,...' into [(max_seconds or None, model), ...].
+
+    Raises:
+        ImproperlyConfigured: If a tier is malformed or has a non-numeric limit.
+    '''
+
+    tiers = []
+    for part in filter(None, (p.strip() for p in (value or '').split(','))):
+        limit, sep, model = part.partition(':')
+        if not sep or not model.strip():
+            raise ImproperlyConfigured(f"Invalid WHISPER_MODEL_POLICY tier '{part}'.")
+        try:
+            tiers.append((None if limit.strip() == '*' else float(limit), model.strip()))
+        except ValueError:
+            raise ImproperlyConfigured(f"Invalid WHISPER_MODEL_POLICY limit in tier '{part}'.")
+    return tiers
+
+def _policy() -> list:
+    '''Return the configured tiers, or a single catch-all WHISPER_MODEL tier.'''
+
+    tiers = parse_policy(getattr(settings, 'WHISPER_MODEL_POLICY', ''))
+    return tiers or [(None, getattr(settings, 'WHISPER_MODEL', 'small'))]
+
+def candidate_models() -> list:
+    '''Return every model the policy may choose, most accurate first.'''
+
+    return list(dict.fromkeys(model for _, model in _policy()))
+
+def queue_depth() -> int:
+    '''Return the number of quiz jobs waiting for a worker.'''
+
+    from ..models import QuizJob
+    return QuizJob.objects.filter(status=QuizJob.PENDING).count()
+
+def choose_model(duration_sec: float | None, depth: int | None = None) -> ModelChoice:
+    '''Pick the Whisper model for a video.
+
+    The first tier whose limit covers `duration_sec` is chosen (unknown
+    durations use the first tier); each WHISPER_QUEUE_DOWNGRADE_DEPTH pending
+    jobs move the choice one tier towards the fastest model.
+
+    Args:
+        duration_sec: Video duration from the yt-dlp metadata.
+        depth: Current queue depth; looked up when None.
+    '''
+
+    tiers = _policy()
+    if depth is None:
+        depth = queue_depth() if len(tiers) > 1 else 0
+    index = len(tiers) - 1
+    for i, (limit, _) in enumerate(tiers):
+        if duration_sec is None or limit is None or duration_sec <= limit:
+            index = i
+            break
+    step = getattr(settings, 'WHISPER_QUEUE_DOWNGRADE_DEPTH', 0)
+    if step:
+        index = min(len(tiers) - 1, index + depth // step)
+    return ModelChoice(tiers[index][1], duration_sec, depth)
@@ -0,0 +1,97 @@
+'''Keyset (cursor) pagination for quiz lists.
+
+Responsibilities:
+- Page through a user's quizzes newest first on (created_at, id), so every
+  page costs one indexed range query however large the library is (no OFFSET,
+  stable while quizzes are added or deleted).
+- Stay opt-in: without 'limit' or 'cursor' query parameters the list is
+  returned unpaginated, as before.
+
+Query parameters:
+- limit: Page size (default QUIZ_PAGE_SIZE, capped at QUIZ_PAGE_SIZE_MAX).
+- cursor: Opaque token from the 'next' link of the previous page.
+
+Settings:
+- QUIZ_PAGE_SIZE: Default page size.
+- QUIZ_PAGE_SIZE_MAX: Largest accepted 'limit'.
+'''
+
+import base64, json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+def encode_cursor(obj) -> str:
+    '''Return the cursor pointing just after `obj`.'''
+
+    raw = json.dumps([obj.created_at.isoformat(), obj.pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token: str) -> tuple:
+    '''Return (created_at, id) from a cursor token.
+
+    Raises:
+        NotFound: If the token is malformed.
+    '''
+
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, pk = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError):
+        raise NotFound('Invalid cursor.')
+
+class QuizCursorPagination(BasePagination):
+    '''Opt-in keyset pagination ordered by (-created_at, -id).'''
+
+    limit_query_param = 'limit'
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.limit_query_param not in params and self.cursor_query_param not in params:
+            return None
+        self.request = request
+        limit = self.get_limit(request)
+        token = params.get(self.cursor_query_param)
+        if token:
+            created_at, pk = decode_cursor(token)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        # One extra row tells whether a next page exists without a COUNT query.
+        page = list(queryset.order_by(*self.ordering)[:limit + 1])
+        self.next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+        return page[:limit]
+
+    def get_limit(self, request) -> int:
+        '''Return the requested page size, validated and capped.
+
+        Raises:
+            ValidationError: If 'limit' is not a positive integer.
+        '''
+
+        default = getattr(settings, 'QUIZ_PAGE_SIZE', 20)
+        value = request.query_params.get(self.limit_query_param) or default
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            limit = 0
+        if limit < 1:
+            raise ValidationError({'limit': 'Must be a positive integer.'})
+        return min(limit, getattr(settings, 'QUIZ_PAGE_SIZE_MAX', 100))
+
+    def get_next_link(self) -> str | None:
+        '''Return the absolute URL of the next page, or None on the last page.'''
+
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({'next': self.get_next_link(), 'results': data})
@@ -0,0 +1,107 @@
+'''Persistent cache of validated LLM quiz results.
+
+Responsibilities:
+- Derive a cache key from (transcript digest, num_questions, LLM model name,
+  prompt template hash).
+- Return stored quiz dicts without another LLM round trip or re-validation.
+- Evict entries by age (TTL) and by count (least recently used first).
+- Keep per-process hit/miss counters.
+
+Settings:
+- QUIZ_RESULT_CACHE_TTL_SEC: Maximum age of a cached quiz (None = no TTL).
+- QUIZ_RESULT_CACHE_MAX_ENTRIES: Maximum number of cached quizzes (None = unbounded).
+'''
+
+import copy, hashlib, threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import GeneratedQuiz
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+def _count(key: str):
+    '''Increment a process-local cache counter.'''
+
+    with _stats_lock:
+        _stats[key] += 1
+
+def _ttl() -> timedelta | None:
+    '''Return the configured TTL, or None if entries never expire.'''
+
+    ttl = getattr(settings, 'QUIZ_RESULT_CACHE_TTL_SEC', None)
+    return timedelta(seconds=ttl) if ttl else None
+
+def transcript_digest(transcript: str) -> str:
+    '''Return the SHA-256 hex digest of a transcript.'''
+
+    return hashlib.sha256(transcript.encode('utf-8')).hexdigest()
+
+def quiz_cache_key(digest: str, num_questions: int, model_name: str, prompt_version: str) -> str:
+    '''Combine all inputs that influence the LLM result into one key.'''
+
+    raw = f"{digest}|{num_questions}|{model_name}|{prompt_version}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def get_cached_quiz(key: str) -> dict | None:
+    '''Return a copy of the cached quiz dict for `key`, or None on a miss.'''
+
+    qs = GeneratedQuiz.objects.filter(cache_key=key)
+    ttl = _ttl()
+    if ttl:
+        qs = qs.filter(created_at__gte=timezone.now() - ttl)
+    entry = qs.only('id', 'payload').first()
+    if entry is None:
+        _count('misses')
+        return None
+    GeneratedQuiz.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    _count('hits')
+    return copy.deepcopy(entry.payload)
+
+def store_quiz(key: str, digest: str, num_questions: int, model_name: str, prompt_version: str, quiz: dict) -> None:
+    '''Persist a validated quiz dict and apply eviction.'''
+
+    try:
+        GeneratedQuiz.objects.update_or_create(cache_key=key, defaults={
+            'transcript_digest': digest,
+            'num_questions': num_questions,
+            'model_name': model_name,
+            'prompt_version': prompt_version,
+            'payload': quiz,
+            'created_at': timezone.now(),
+        })
+    except IntegrityError:
+        # A concurrent request stored the same result first.
+        pass
+    evict_quizzes()
+
+def evict_quizzes() -> int:
+    '''Delete expired entries and trim the table to the configured size.
+
+    Returns:
+        The number of deleted cache entries.
+    '''
+
+    deleted = 0
+    ttl = _ttl()
+    if ttl:
+        deleted += GeneratedQuiz.objects.filter(created_at__lt=timezone.now() - ttl).delete()[0]
+    max_entries = getattr(settings, 'QUIZ_RESULT_CACHE_MAX_ENTRIES', None)
+    if max_entries:
+        stale = list(GeneratedQuiz.objects.order_by('-last_used_at', '-id').values_list('pk', flat=True)[max_entries:])
+        if stale:
+            deleted += GeneratedQuiz.objects.filter(pk__in=stale).delete()[0]
+    return deleted
+
+def quiz_cache_stats() -> dict:
+    '''Return process-local hit/miss counters and the hit rate.'''
+
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
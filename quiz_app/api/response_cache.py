@@ -0,0 +1,105 @@
+'''Per-user cache of rendered quiz API responses.
+
+Responsibilities:
+- Store the rendered JSON of GET /api/quizzes/ and GET /api/quizzes/<id>/
+  together with its ETag/Last-Modified, keyed by user, endpoint, quiz and
+  query string. A hit is answered (200 or 304) without touching the database.
+- Invalidate by version: every user has a version number that is part of all
+  their keys; bumping it drops all cached responses of that user at once.
+  Versions are bumped by the quiz views, by `create_quiz_from_youtube` and by
+  model signals (admin edits, see quiz_app/signals.py).
+
+Uses the Django cache framework (CACHES). Invalidations must reach every web
+process, including those of writes made by the `process_quiz_jobs` worker or
+by another web process, so the cache needs a shared backend such as Redis;
+with the default per-process local-memory backend it is off by default.
+
+Settings:
+- QUIZ_RESPONSE_CACHE_TTL_SEC: Lifetime of cached responses (0 disables the
+  cache; default 300 with a shared CACHE_BACKEND, else 0).
+- QUIZ_RESPONSE_CACHE_ALIAS: Cache alias in CACHES (default 'default').
+'''
+
+import hashlib, time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import response_cache_lookups
+
+PREFIX = 'quiz-resp'
+
+def _ttl() -> int:
+    '''Return the configured lifetime in seconds (0 = disabled).'''
+
+    return getattr(settings, 'QUIZ_RESPONSE_CACHE_TTL_SEC', 0) or 0
+
+def _cache():
+    '''Return the configured cache backend.'''
+
+    return caches[getattr(settings, 'QUIZ_RESPONSE_CACHE_ALIAS', 'default')]
+
+def _version_key(user_id) -> str:
+    return f"{PREFIX}:v:{user_id}"
+
+def user_version(user_id) -> int:
+    '''Return the current cache version of a user, creating it if needed.'''
+
+    cache, key = _cache(), _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock, not from 1: a version evicted from the cache
+        # must never come back with a value older entries were stored under.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+def invalidate_user(user_id) -> None:
+    '''Drop every cached response of a user (O(1), entries expire on their own).'''
+
+    if not _ttl() or user_id is None:
+        return
+    cache, key = _cache(), _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+def cacheable(request) -> bool:
+    '''Return True if the request may be answered from / stored in the cache.'''
+
+    renderer = getattr(request, 'accepted_renderer', None)
+    return bool(_ttl()) and request.method == 'GET' and getattr(renderer, 'format', None) == 'json'
+
+def response_key(request, endpoint: str, quiz_id=None) -> str | None:
+    '''Return the cache key of this request's representation, or None if not cacheable.
+
+    Take the key before reading the database: a write that bumps the version
+    meanwhile then makes the stored entry unreachable instead of stale.
+
+    Args:
+        request: The DRF request (authenticated).
+        endpoint: 'list' or 'detail'.
+        quiz_id: Quiz id for 'detail'.
+    '''
+
+    if not cacheable(request):
+        return None
+    query = '&'.join(sorted(request.query_params.urlencode().split('&')))
+    digest = hashlib.sha1(query.encode()).hexdigest()[:16]
+    user_id = request.user.pk
+    return f"{PREFIX}:{user_id}:{user_version(user_id)}:{endpoint}:{quiz_id or '-'}:{digest}"
+
+def get_response(key: str | None, endpoint: str):
+    '''Return the cached (body, validators) under `key`, or None.'''
+
+    if key is None:
+        return None
+    entry = _cache().get(key)
+    response_cache_lookups.inc(endpoint=endpoint, result='miss' if entry is None else 'hit')
+    return entry
+
+def store_response(key: str, body: bytes, validators) -> None:
+    '''Cache a rendered JSON body with its validators under `key`.'''
+
+    _cache().set(key, (body, validators), timeout=_ttl())
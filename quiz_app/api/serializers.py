@@ -3,19 +3,24 @@
 Provides:
 - QuestionSerializer: read-only representation of a question model.
 - QuizSerializer: quiz with nested questions (used for GET responses).
+- QuizSummarySerializer: quiz metadata with a question count (list ?view=summary).
 - QuizUpdateSerializer: strict full update (PUT) of quiz metadata.
 - QuizPartialUpdateSerializer: partial update (PATCH) of quiz metadata.
+- QuizJobSerializer: status of an asynchronous quiz-generation job.
 
 Notes:
+- The read serializers honor sparse fieldsets (context['fieldsets'], see
+  fieldsets.py) and only emit the requested fields.
 - Question options are stored as a JSON list on the model and serialized as-is.
 - Video URLs are normalized to the canonical YouTube form
   'https://www.youtube.com/watch?v=<id>' via validation.
 '''
 
 from rest_framework import serializers
-from ..models import Quiz, Question
+from ..models import Quiz, Question, QuizJob
+from .fieldsets import FieldsetMixin
 
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(FieldsetMixin, serializers.ModelSerializer):
     '''Serialize a single quiz question.
 
     Fields:
@@ -26,19 +31,36 @@ class QuestionSerializer(serializers.ModelSerializer):
         created_at / updated_at: Timestamps.
     '''
 
+    fieldset = 'questions'
+
     class Meta:
         model = Question
         fields = ['id', 'question_title', 'question_options', 'answer', 'created_at', 'updated_at']
 
-class QuizSerializer(serializers.ModelSerializer):
+class QuizSerializer(FieldsetMixin, serializers.ModelSerializer):
     '''Serialize a quiz including its nested questions (read-only for questions).'''
 
+    fieldset = 'quiz'
     questions = QuestionSerializer(many=True)
 
     class Meta:
         model = Quiz
         fields = ['id', 'title', 'description', 'created_at', 'updated_at', 'video_url', 'questions']
 
+class QuizSummarySerializer(FieldsetMixin, serializers.ModelSerializer):
+    '''Serialize quiz metadata without questions.
+
+    `question_count` is read from the `question_count` annotation of the
+    queryset, so no question rows are loaded.
+    '''
+
+    fieldset = 'quiz'
+    question_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = ['id', 'title', 'description', 'created_at', 'updated_at', 'video_url', 'question_count']
+
 class QuizUpdateSerializer(serializers.ModelSerializer):
     '''Serializer for full replacement (PUT) of quiz metadata.
 
@@ -94,4 +116,21 @@ class QuizPartialUpdateSerializer(serializers.ModelSerializer):
             vid = extract_youtube_id(value)
         except ValueError:
             raise serializers.ValidationError('Invalid YouTube URL.')
-        return YOUTUBE_CANONICAL.format(vid=vid)
\ No newline at end of file
+        return YOUTUBE_CANONICAL.format(vid=vid)
+
+class QuizJobSerializer(serializers.ModelSerializer):
+    '''Serialize the state of an asynchronous quiz-generation job.
+
+    Fields:
+        id: PK (the job id returned by POST /api/createQuiz/).
+        status: pending | running | succeeded | failed.
+        stage / progress: Current pipeline stage and percentage (0-100).
+        quiz_id: Id of the created quiz once the job succeeded, else null.
+        error: Failure message for failed jobs.
+    '''
+
+    quiz_id = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = QuizJob
+        fields = ['id', 'status', 'stage', 'progress', 'quiz_id', 'error', 'created_at', 'updated_at']
\ No newline at end of file
@@ -2,11 +2,33 @@
 
 Responsibilities:
 - Normalize and validate YouTube URLs.
+- Reuse cached transcripts (keyed by video id + transcription engine/model)
+  when available.
+- Let only one request per video (across processes) fetch a missing transcript.
+- Extract video metadata once (short-TTL cache) and reuse it for the
+  availability/duration check, caption lookup and audio download.
 - Check video availability and (optionally) max duration.
-- Download audio with yt-dlp.
-- Ensure FFmpeg is available and transcribe audio with Whisper.
-- Build a strict LLM prompt and call Gemini to generate a quiz.
-- Validate the returned quiz JSON and persist Quiz/Question models.
+- Use existing YouTube subtitles/automatic captions as transcript when present.
+- Stream audio through FFmpeg into memory, or download it with yt-dlp
+  (only when no usable caption track exists).
+- Ensure FFmpeg is available and transcribe audio with the configured engine
+  (Whisper by default, see `engines`).
+- Pass a known language (request, yt-dlp metadata, cached per channel) to the
+  engine so it skips language detection; remember detected languages.
+- Choose the Whisper model size from the video duration and queue depth
+  (see `model_policy`) and record the choice with the transcript.
+- Compress the transcript locally (fillers, repeated segments, optional
+  extractive TF-IDF selection) before it is put into the prompt.
+- Build a strict LLM prompt and call Gemini to generate a quiz, unless a
+  validated result for the same transcript/prompt/model is cached.
+- Request schema-constrained JSON (structured output) derived from the quiz
+  shape, validate the returned quiz and persist Quiz/Question models.
+- Split transcripts over a token budget into sections and generate questions
+  per section concurrently on a thread pool (map-reduce, at most
+  QUIZ_SECTION_CONCURRENCY requests in flight) instead of one huge prompt.
+- Keep valid questions of a near-miss reply and re-request only the rejected
+  ones (bounded by QUIZ_REPAIR_ATTEMPTS).
+- Record per-stage timings and counters (see `metrics`, GET /api/metrics/).
 
 Error handling contract:
 - Expected, user-facing problems (invalid URL, unavailable video, missing FFmpeg,
@@ -15,16 +37,33 @@ Error handling contract:
 - Unexpected failures bubble up as generic exceptions (HTTP 500 in the view).
 
 Dependencies:
-- yt-dlp, FFmpeg (binary on PATH), whisper (OpenAI Whisper), google-genai (Gemini).
+- yt-dlp, FFmpeg (binary on PATH), whisper (OpenAI Whisper) or optionally
+  faster-whisper, google-genai (Gemini).
+- yt-dlp, whisper/torch, NumPy and google-genai are imported lazily inside the
+  functions that need them, so web processes that never run the pipeline
+  (login, quiz listing) do not pay their import time and memory.
 '''
 
-import json, os, re, tempfile, contextlib, pathlib, shutil
-import yt_dlp
-import whisper
+import json, math, os, re, tempfile, contextlib, pathlib, shutil, html, hashlib
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
 
 from django.conf import settings
-from google import genai
-from yt_dlp.utils import DownloadError, ExtractorError
+
+from .audio_stream import is_streamable, stream_audio
+from .compression import compress_transcript
+from .engines import TranscriptionResult, get_engine
+from .languages import remember_language, resolve_language
+from .llm import gemini_model_name, get_gemini_client
+from .model_policy import candidate_models, choose_model
+from .metrics import audio_seconds, llm_responses, model_selections, timed_stage, transcript_chars
+from .quiz_cache import get_cached_quiz, quiz_cache_key, store_quiz, transcript_digest
+from .response_cache import invalidate_user
+from .single_flight import single_flight
+from .snapshots import rebuild_snapshot
+from .tokens import count_tokens, split_transcript
+from .transcript_cache import get_cached_transcript, store_transcript
+from .video_info import video_info_cache
 
 YOUTUBE_CANONICAL = 'https://www.youtube.com/watch?v={vid}'
 
@@ -57,6 +96,37 @@ def extract_youtube_id(url: str) -> str:
 
     raise ValueError('Could not extract YouTube video id.')
 
+AUDIO_FORMAT = 'bestaudio/best'
+
+def fetch_video_info(url: str) -> dict:
+    '''Extract yt-dlp metadata for a video, served from the short-TTL cache.
+
+    The extraction uses the audio format selection, so the same info dict can
+    be handed to `download_audio` without another extractor round trip.
+
+    Args:
+        url: Any YouTube URL containing a valid video ID.
+
+    Returns:
+        The yt-dlp info dict (metadata) for the video.
+
+    Raises:
+        ValueError: If the URL is unsupported or the video is unavailable/invalid.
+    '''
+
+    import yt_dlp
+    from yt_dlp.utils import DownloadError, ExtractorError
+
+    vid = extract_youtube_id(url)
+    def load():
+        try:
+            with yt_dlp.YoutubeDL({'quiet': True, 'noplaylist': True, 'format': AUDIO_FORMAT}) as ydl:
+                return ydl.extract_info(YOUTUBE_CANONICAL.format(vid=vid), download=False)
+        except (DownloadError, ExtractorError):
+            raise ValueError('YouTube video unavailable or invalid.')
+    return video_info_cache.get_or_load(vid, load)
+
+@timed_stage('ensure_video_available')
 def ensure_video_available(url: str, max_duration_sec: int | None = None):
     '''Check if a YouTube video is available and optionally enforce a max duration.
 
@@ -65,26 +135,129 @@ def ensure_video_available(url: str, max_duration_sec: int | None = None):
         max_duration_sec: Optional maximum allowed duration in seconds.
 
     Returns:
-        The yt-dlp info dict (metadata) for the video.
+        The yt-dlp info dict (metadata) for the video; pass it on to
+        `download_audio` to avoid a second extraction.
 
     Raises:
         ValueError: If the video is unavailable/invalid or exceeds the duration limit.
     '''
 
+    info = fetch_video_info(url)
+    if max_duration_sec and info.get('duration') and info['duration'] > max_duration_sec:
+        raise ValueError('Video too long.')
+    return info
+
+CAPTIONS_SOURCE = 'youtube-captions'
+CAPTION_FORMATS = ('vtt', 'srv3', 'srv1', 'srv2')
+
+def select_caption_track(info: dict, languages=None) -> dict | None:
+    '''Pick the best subtitle track from a yt-dlp info dict.
+
+    Manual subtitles win over automatic captions. Within each group the
+    configured languages are tried first, then the video's own language
+    (for automatic captions also the original-language ASR track `<lang>-orig`).
+    Without language metadata the video's language is taken from its
+    `<lang>-orig` track. Tracks in any other language are never used (a
+    translation would make a quiz in the wrong language); the caller then
+    falls back to transcribing the audio. Only formats we can parse (VTT/SRV)
+    are considered.
+
+    Args:
+        info: The yt-dlp info dict returned by `ensure_video_available`.
+        languages: Optional list of preferred language codes.
+
+    Returns:
+        The track dict (with 'url' and 'ext') or None if no usable track exists.
+    '''
+
+    automatic = info.get('automatic_captions') or {}
+    video_lang = (info.get('language') or '').split('-')[0]
+    if not video_lang:
+        video_lang = next((lang[:-len('-orig')] for lang in automatic if lang.endswith('-orig')), '')
+    preferred = list(languages or [])
+    if video_lang:
+        preferred += [f"{video_lang}-orig", video_lang]
+    for group in ('subtitles', 'automatic_captions'):
+        tracks = info.get(group) or {}
+        candidates = [lang for lang in preferred if lang in tracks]
+        for lang in candidates:
+            by_ext = {t.get('ext'): t for t in tracks[lang] if t.get('url')}
+            for ext in CAPTION_FORMATS:
+                if ext in by_ext:
+                    return by_ext[ext]
+    return None
+
+def parse_vtt(text: str) -> str:
+    '''Convert a WebVTT subtitle file into plain transcript text.
+
+    Drops the header, cue ids, timing lines and inline tags, and collapses the
+    rolling duplicate lines that YouTube's automatic captions contain.
+    '''
+
+    lines = []
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line == 'WEBVTT' or '-->' in line or line.isdigit():
+            continue
+        if line.startswith(('NOTE', 'Kind:', 'Language:', 'STYLE', 'REGION')):
+            continue
+        line = html.unescape(re.sub(r"<[^>]+>", '', line)).strip()
+        if line and (not lines or lines[-1] != line):
+            lines.append(line)
+    return ' '.join(lines)
+
+def parse_srv(text: str) -> str:
+    '''Convert a YouTube SRV1/SRV2/SRV3 (timed text XML) track into plain text.'''
+
+    try:
+        root = ElementTree.fromstring(text)
+    except ElementTree.ParseError:
+        raise ValueError('Invalid caption track.')
+    parts = []
+    for el in root.iter():
+        if el.tag in ('text', 'p'):
+            chunk = html.unescape(''.join(el.itertext())).strip()
+            if chunk and (not parts or parts[-1] != chunk):
+                parts.append(chunk)
+    return re.sub(r"\s+", ' ', ' '.join(parts)).strip()
+
+@timed_stage('fetch_caption_transcript')
+def fetch_caption_transcript(info: dict) -> str | None:
+    '''Download and parse the best caption track of a video, if any.
+
+    Args:
+        info: The yt-dlp info dict returned by `ensure_video_available`.
+
+    Returns:
+        The caption text, or None if the video has no usable track (missing,
+        unparsable, or shorter than QUIZ_CAPTION_MIN_CHARS).
+    '''
+
+    track = select_caption_track(info, getattr(settings, 'QUIZ_CAPTION_LANGS', None))
+    if track is None:
+        return None
+    import yt_dlp
+    from yt_dlp.utils import DownloadError
+
     try:
-        with yt_dlp.YoutubeDL({'quiet': True, 'noplaylist': True}) as ydl:
-            info = ydl.extract_info(url, download=False)
-        if max_duration_sec and info.get('duration') and info['duration'] > max_duration_sec:
-            raise ValueError('Video too long.')
-        return info
-    except (DownloadError, ExtractorError):
-        raise ValueError('YouTube video unavailable or invalid.')
-
-def download_audio(url: str) -> str:
+        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            raw = ydl.urlopen(track['url']).read().decode('utf-8', errors='replace')
+        text = parse_vtt(raw) if track.get('ext') == 'vtt' else parse_srv(raw)
+    except (DownloadError, ValueError, OSError):
+        return None
+    if len(text) < getattr(settings, 'QUIZ_CAPTION_MIN_CHARS', 200):
+        return None
+    return text
+
+@timed_stage('download_audio')
+def download_audio(url: str, info: dict | None = None) -> str:
     '''Download best-available audio stream for a YouTube video.
 
     Args:
         url: Any YouTube URL containing a valid video ID (normalized internally).
+        info: Optional info dict from `ensure_video_available`/`fetch_video_info`.
+            When omitted it is taken from the metadata cache (extracting only
+            on a miss).
 
     Returns:
         Absolute file path to the downloaded audio file.
@@ -93,18 +266,23 @@ def download_audio(url: str) -> str:
         ValueError: If the download fails or no file is produced.
     '''
 
+    import yt_dlp
+    from yt_dlp.utils import DownloadError, ExtractorError
+
+    vid = extract_youtube_id(url)
+    if info is None:
+        info = fetch_video_info(url)
     try:
-        vid = extract_youtube_id(url)
         outtmpl = str((getattr(settings, 'QUIZ_TMP_DIR', pathlib.Path(tempfile.gettempdir())) / f"{vid}.%(ext)s").resolve())
         ydl_opts = {
-            'format': "bestaudio/best",
+            'format': AUDIO_FORMAT,
             'outtmpl': outtmpl,
             'quiet': True,
             'noplaylist': True,
         }
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(YOUTUBE_CANONICAL.format(vid=vid), download=True)
-            path = ydl.prepare_filename(info)
+            result = ydl.process_ie_result(ydl.sanitize_info(info, remove_private_keys=True), download=True)
+            path = ydl.prepare_filename(result)
         if not path or not os.path.exists(path):
             raise ValueError('Audio download failed.')
         return path
@@ -122,30 +300,51 @@ def _require_ffmpeg():
         raise ValueError('FFmpeg not found. Please install FFmpeg and add it to PATH.')
     return ff
 
-def transcribe_audio(audio_path: str) -> str:
-    '''Transcribe an audio file to text using Whisper.
+@timed_stage('transcribe_audio')
+def transcribe_audio(audio, language: str | None = None, engine=None) -> TranscriptionResult:
+    '''Transcribe an audio file (or in-memory PCM samples) to text.
+
+    The engine is selected by TRANSCRIPTION_ENGINE (see `engines`); its model
+    is taken from a process-wide registry, so only the first call per worker
+    process pays for loading the weights. If WHISPER_CHUNK_SEC is set (off by
+    default, each worker holds its own model), longer audio is split at quiet
+    points and transcribed in parallel by WHISPER_WORKERS processes (see
+    `chunking`). Without a known language it is detected once
+    on the first 30 s and passed to every chunk, so chunks cannot disagree.
 
     Args:
-        audio_path: Path to the downloaded audio file.
+        audio: Path to the downloaded audio file, or mono 16 kHz float32
+            samples as returned by `audio_stream.stream_audio`.
+        language: Spoken language code, or None to let the engine detect it.
+        engine: Engine to use instead of the configured one (e.g. with a
+            model picked by `model_policy`).
 
     Returns:
-        The transcribed text (stripped).
+        A TranscriptionResult with the stripped text and its language.
 
     Raises:
         ValueError: If FFmpeg is missing or transcription fails.
     '''
 
-    _require_ffmpeg()
-    model_name = getattr(settings, 'WHISPER_MODEL', 'small')
+    engine = engine or get_engine()
+    if isinstance(audio, str):
+        _require_ffmpeg()
+    chunk_sec = getattr(settings, 'WHISPER_CHUNK_SEC', 0)
     try:
-        import whisper
-        model = whisper.load_model(model_name)
-        result = model.transcribe(audio_path)
-        return result.get('text', '').strip()
+        if chunk_sec and isinstance(audio, str):
+            audio = engine.load_audio(audio)
+        from .chunking import SAMPLE_RATE, transcribe_chunked
+        if chunk_sec and len(audio) > chunk_sec * SAMPLE_RATE:
+            language = language or engine.detect_language(audio)
+            text = transcribe_chunked(audio, engine, chunk_sec, getattr(settings, 'WHISPER_WORKERS', 1), language=language)
+            return TranscriptionResult(text, language)
+        return engine.transcribe(audio, language=language)
     except FileNotFoundError as e:
         if 'ffmpeg' in str(e).lower():
             raise ValueError('FFmpeg is not installed or not on PATH.')
         raise
+    except ValueError:
+        raise
     except Exception as e:
         raise ValueError(f"Transcription failed: {e}")
 
@@ -179,9 +378,284 @@ Transcript:
 \"\"\"{transcript}\"\"\"
 """.strip()
 
+QUIZ_KEYS = ('title', 'description', 'questions')
+QUESTION_KEYS = ('question_title', 'question_options', 'answer')
+OPTIONS_PER_QUESTION = 4
+
+def _question_schema() -> dict:
+    '''Return the Gemini schema of a single quiz question.'''
+
+    string = {'type': 'STRING'}
+    return {
+        'type': 'OBJECT',
+        'properties': {
+            'question_title': string,
+            'question_options': {'type': 'ARRAY', 'items': string,
+                                 'min_items': OPTIONS_PER_QUESTION, 'max_items': OPTIONS_PER_QUESTION},
+            'answer': string,
+        },
+        'required': list(QUESTION_KEYS),
+        'property_ordering': list(QUESTION_KEYS),
+    }
+
+def _questions_schema(count: int) -> dict:
+    '''Return the Gemini schema of a list of exactly `count` questions.'''
+
+    return {'type': 'ARRAY', 'items': _question_schema(), 'min_items': count, 'max_items': count}
+
+def quiz_response_schema(num_questions: int = 10) -> dict:
+    '''Return the Gemini response schema for the quiz shape.
+
+    Mirrors the structure enforced by `validate_quiz_dict` (same keys, exactly
+    `num_questions` questions, exactly OPTIONS_PER_QUESTION options), so the
+    model is constrained to emit JSON that parses in one step.
+    '''
+
+    string = {'type': 'STRING'}
+    return {
+        'type': 'OBJECT',
+        'properties': {'title': string, 'description': string, 'questions': _questions_schema(num_questions)},
+        'required': list(QUIZ_KEYS),
+        'property_ordering': list(QUIZ_KEYS),
+    }
+
+def repair_response_schema(count: int) -> dict:
+    '''Return the Gemini response schema for `count` replacement questions.'''
+
+    return {'type': 'OBJECT', 'properties': {'questions': _questions_schema(count)}, 'required': ['questions']}
+
+def build_repair_prompt(transcript: str, kept: list, count: int) -> str:
+    '''Construct a prompt asking only for replacements of rejected questions.
+
+    The already accepted questions are listed so the model does not repeat them.
+    '''
+
+    existing = "\n".join(f"- {q['question_title']}" for q in kept) or '- (none)'
+    return f"""
+Based on the following transcript, write exactly {count} questions for a quiz in valid JSON format.
+
+Return this exact structure:
+
+{{
+  "questions": [
+    {{
+      "question_title": "The question goes here.",
+      "question_options": ["Option A", "Option B", "Option C", "Option D"],
+      "answer": "The correct answer from the above options"
+    }}
+  ]
+}}
+
+Requirements:
+- Each question must have exactly 4 distinct answer options.
+- Only one correct answer per question, and it must be present in "question_options".
+- Do not repeat any of these existing questions:
+{existing}
+- The output must be valid JSON and parsable as-is. Do NOT include markdown fences or explanations.
+
+Transcript:
+\"\"\"{transcript}\"\"\"
+""".strip()
+
+def _response_text(resp) -> str:
+    '''Return the text part of a generate_content response.'''
+
+    return getattr(resp, 'text', None) or getattr(resp, 'candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
+
+def _extract_json(text: str) -> str:
+    '''Recover a JSON object from free-form LLM text (markdown fences, prose).'''
+
+    json_str = text.strip()
+
+    if "```" in json_str:
+        json_str = json_str.split("```")[1]
+
+        json_str = "\n".join([l for l in json_str.splitlines() if l.strip().lower() != 'json'])
+
+    if not json_str.strip().startswith('{'):
+        s = json_str.find('{')
+        e = json_str.rfind('}')
+        json_str = json_str[s:e+1]
+    return json_str
+
+class QuizParseError(ValueError):
+    '''The LLM reply is not valid JSON.'''
+
+def parse_quiz_response(text: str, structured: bool = True) -> dict:
+    '''Parse the LLM reply into a dict.
+
+    Structured (schema-constrained) replies are plain JSON and are parsed with
+    a single `json.loads`; free-form replies first go through fence stripping
+    and brace search.
+
+    Raises:
+        QuizParseError: If the reply is not valid JSON.
+    '''
+
+    try:
+        data = json.loads(text if structured else _extract_json(text))
+    except json.JSONDecodeError:
+        raise QuizParseError('Gemini returned invalid JSON.')
+    return data
+
+def _generation_config(schema: dict, structured: bool):
+    '''Return the GenerateContentConfig constraining replies to `schema` (None for legacy mode).'''
+
+    if not structured:
+        return None
+    from google.genai import types
+    return types.GenerateContentConfig(response_mime_type='application/json',
+                                       response_schema=types.Schema.model_validate(schema))
+
+def _generate_json(client, prompt: str, schema: dict, structured: bool):
+    '''Send one prompt to Gemini and return the parsed JSON reply.
+
+    Raises:
+        ValueError: If the call fails or the reply is not valid JSON.
+    '''
+
+    config = _generation_config(schema, structured)
+    try:
+        resp = client.models.generate_content(model=gemini_model_name(), contents=prompt, config=config)
+    except Exception as e:
+        raise ValueError(f"Gemini request failed: {e}")
+    return parse_quiz_response(_response_text(resp), structured=structured)
+
+def _repairable(d) -> bool:
+    '''Return True if a reply has the quiz frame and only its questions need work.'''
+
+    return isinstance(d, dict) and all(k in d for k in QUIZ_KEYS) and isinstance(d['questions'], list)
+
+def repair_quiz(client, transcript: str, quiz: dict, num_questions: int, structured: bool) -> dict:
+    '''Keep the valid questions of `quiz` and ask Gemini only for replacements.
+
+    Up to QUIZ_REPAIR_ATTEMPTS follow-up requests are made, each for the number
+    of questions still missing. Replacements that are invalid themselves or
+    repeat an accepted question title are discarded.
+
+    Returns:
+        The repaired quiz dict (validated).
+
+    Raises:
+        ValueError: If the quiz is still incomplete after all attempts.
+    '''
+
+    kept, titles = [], set()
+    for q in quiz['questions']:
+        if question_error(q) is None and q['question_title'] not in titles and len(kept) < num_questions:
+            kept.append(q)
+            titles.add(q['question_title'])
+
+    for _ in range(getattr(settings, 'QUIZ_REPAIR_ATTEMPTS', 2)):
+        missing = num_questions - len(kept)
+        if missing <= 0:
+            break
+        try:
+            data = _generate_json(client, build_repair_prompt(transcript, kept, missing),
+                                  repair_response_schema(missing), structured)
+        except ValueError:
+            continue
+        replacements = data.get('questions') if isinstance(data, dict) else None
+        for q in replacements if isinstance(replacements, list) else []:
+            if question_error(q) is None and q['question_title'] not in titles and len(kept) < num_questions:
+                kept.append(q)
+                titles.add(q['question_title'])
+
+    repaired = {**quiz, 'questions': kept}
+    validate_quiz_dict(repaired, num_questions=num_questions)
+    return repaired
+
+def _generate_sections(client, sections: list, per_section: int, structured: bool) -> list:
+    '''Request `per_section` questions for every section concurrently.
+
+    The sync client runs on a pool of at most QUIZ_SECTION_CONCURRENCY threads.
+    The shared client's async HTTP pool is bound to the event loop that opened
+    its connections, so driving it from a new `asyncio.run()` per quiz fails
+    from the second quiz on; its sync pool is safe to share between threads.
+
+    Returns:
+        One parsed reply per section, or the exception it failed with.
+    '''
+
+    config = _generation_config(quiz_response_schema(per_section), structured)
+
+    def generate(section):
+        try:
+            resp = client.models.generate_content(
+                model=gemini_model_name(), contents=build_quiz_prompt(section, per_section), config=config)
+        except Exception as e:
+            raise ValueError(f"Gemini request failed: {e}")
+        return parse_quiz_response(_response_text(resp), structured=structured)
+
+    workers = min(len(sections), max(1, getattr(settings, 'QUIZ_SECTION_CONCURRENCY', 4)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate, section) for section in sections]
+    replies = []
+    for future in futures:
+        try:
+            replies.append(future.result())
+        except Exception as e:
+            replies.append(e)
+    return replies
+
+def generate_quiz_from_sections(client, sections: list, num_questions: int, structured: bool) -> dict:
+    '''Map-reduce quiz generation for transcripts over the token budget.
+
+    Map: each section gets its own prompt asking for ceil(num_questions /
+    sections) + 1 candidate questions; all requests run concurrently, so the
+    latency is roughly that of one section. Reduce: valid, non-duplicate
+    candidates are picked round-robin across sections (spreading questions
+    over the whole video) and returned in transcript order. Title and
+    description come from the first usable section reply.
+
+    Raises:
+        ValueError: If no section produced a usable reply or too few valid
+            questions were generated.
+    '''
+
+    per_section = math.ceil(num_questions / len(sections)) + 1
+    replies = _generate_sections(client, sections, per_section, structured)
+    frames = [r for r in replies if _repairable(r)]
+    if not frames:
+        error = next((r for r in replies if isinstance(r, ValueError)), None)
+        raise error or ValueError('Quiz JSON must contain title, description, questions.')
+
+    pools = [[q for q in r['questions'] if question_error(q) is None] for r in frames]
+    picked, titles = [], set()
+    for rank in range(max(len(p) for p in pools)):
+        for section, pool in enumerate(pools):
+            if len(picked) < num_questions and rank < len(pool) and pool[rank]['question_title'] not in titles:
+                picked.append((section, rank))
+                titles.add(pool[rank]['question_title'])
+
+    quiz = {
+        'title': frames[0]['title'],
+        'description': frames[0]['description'],
+        'questions': [pools[section][rank] for section, rank in sorted(picked)],
+    }
+    validate_quiz_dict(quiz, num_questions=num_questions)
+    return quiz
+
+@timed_stage('generate_quiz_with_gemini')
 def generate_quiz_with_gemini(transcript: str, num_questions: int = 10) -> dict:
     '''Call Gemini to generate a quiz JSON and parse/validate the result.
 
+    Uses the process-wide client from `llm.get_gemini_client`, so connections
+    are reused across quizzes. With GEMINI_STRUCTURED_OUTPUT (default) the
+    request carries `quiz_response_schema`, so Gemini returns bare JSON in the
+    expected shape; otherwise the legacy free-form parsing is used.
+
+    Transcripts over QUIZ_TRANSCRIPT_TOKEN_BUDGET tokens are split into
+    sections and handled by `generate_quiz_from_sections` instead of being
+    inlined into one huge prompt.
+
+    If only some questions are rejected (duplicate options, answer not among
+    the options, wrong count), the valid ones are kept and `repair_quiz`
+    requests replacements instead of failing the whole job. The outcome of
+    every generated quiz (ok/repaired/invalid/parse_error) is counted once per
+    mode in `quiz_llm_responses_total`; failed repair attempts and sections do
+    not count on their own.
+
     Args:
         transcript: The transcribed text.
         num_questions: Number of questions to request and enforce.
@@ -193,58 +667,142 @@ def generate_quiz_with_gemini(transcript: str, num_questions: int = 10) -> dict:
         ValueError: If GEMINI_API_KEY is missing, the call fails, or the JSON is invalid.
     '''
 
-    api_key = getattr(settings, 'GEMINI_API_KEY', '')
-    if not api_key:
-        raise ValueError('GEMINI_API_KEY is not configured.')
-    client = genai.Client(api_key=api_key)
+    client = get_gemini_client()
+    structured = getattr(settings, 'GEMINI_STRUCTURED_OUTPUT', True)
+    mode = 'structured' if structured else 'legacy'
+    budget = getattr(settings, 'QUIZ_TRANSCRIPT_TOKEN_BUDGET', None)
+    if budget and count_tokens(transcript) > budget:
+        try:
+            data = generate_quiz_from_sections(client, split_transcript(transcript, budget), num_questions, structured)
+        except ValueError:
+            llm_responses.inc(mode=mode, outcome='invalid')
+            raise
+        llm_responses.inc(mode=mode, outcome='ok')
+        return data
+
     try:
-        resp = client.models.generate_content(model='gemini-2.5-flash', contents=build_quiz_prompt(transcript, num_questions))
-    except Exception as e:
-        raise ValueError(f"Gemini request failed: {e}")
-    
-    text = getattr(resp, 'text', None) or getattr(resp, 'candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
-    
-    json_str = text.strip()
-    
-    if "```" in json_str:
-        json_str = json_str.split("```")[1]
-        
-        json_str = "\n".join([l for l in json_str.splitlines() if l.strip().lower() != 'json'])
-    
-    if not json_str.strip().startswith('{'):
-        s = json_str.find('{')
-        e = json_str.rfind('}')
-        json_str = json_str[s:e+1]
-    data = json.loads(json_str)
-    validate_quiz_dict(data, num_questions=num_questions)
+        data = _generate_json(client, build_quiz_prompt(transcript, num_questions),
+                              quiz_response_schema(num_questions), structured)
+    except QuizParseError:
+        llm_responses.inc(mode=mode, outcome='parse_error')
+        raise
+    try:
+        validate_quiz_dict(data, num_questions=num_questions)
+    except ValueError:
+        if not _repairable(data):
+            llm_responses.inc(mode=mode, outcome='invalid')
+            raise
+        try:
+            data = repair_quiz(client, transcript, data, num_questions, structured)
+        except ValueError:
+            llm_responses.inc(mode=mode, outcome='invalid')
+            raise
+        llm_responses.inc(mode=mode, outcome='repaired')
+        return data
+    llm_responses.inc(mode=mode, outcome='ok')
     return data
 
+def prompt_version() -> str:
+    '''Return a short hash of the prompt template used by `build_quiz_prompt`.
+
+    Any edit to the template changes the hash and thereby invalidates cached
+    LLM results produced with the old wording.
+    '''
+
+    template = build_quiz_prompt('\x00transcript\x00', '\x00num_questions\x00')
+    return hashlib.sha256(template.encode('utf-8')).hexdigest()[:16]
+
+def get_or_generate_quiz(transcript: str, num_questions: int = 10) -> dict:
+    '''Return a validated quiz dict from the result cache or from Gemini.
+
+    Cached results were validated before they were stored, so a hit skips
+    both the LLM round trip and `validate_quiz_dict`.
+    '''
+
+    digest = transcript_digest(transcript)
+    model_name, version = gemini_model_name(), prompt_version()
+    key = quiz_cache_key(digest, num_questions, model_name, version)
+    quiz_dict = get_cached_quiz(key)
+    if quiz_dict is None:
+        quiz_dict = generate_quiz_with_gemini(transcript, num_questions=num_questions)
+        store_quiz(key, digest, num_questions, model_name, version, quiz_dict)
+    return quiz_dict
+
+def question_error(q) -> str | None:
+    '''Return why a single question is invalid, or None if it is valid.'''
+
+    if not isinstance(q, dict) or not all(k in q for k in QUESTION_KEYS):
+        return 'Each question must have question_title, question_options, answer.'
+    opts = q['question_options']
+    if not isinstance(opts, list) or len(opts) != OPTIONS_PER_QUESTION or len(set(opts)) != OPTIONS_PER_QUESTION:
+        return 'Each question must have exactly 4 distinct options.'
+    if q['answer'] not in opts:
+        return 'Answer must be one of question_options.'
+    return None
+
 def validate_quiz_dict(d: dict, num_questions: int = 10):
     '''Validate the shape and constraints of the generated quiz JSON.'''
 
     if not isinstance(d, dict):
         raise ValueError('Quiz must be a JSON object.')
-    if "title" not in d or 'description' not in d or 'questions' not in d:
+    if not all(k in d for k in QUIZ_KEYS):
         raise ValueError('Quiz JSON must contain title, description, questions.')
     qs = d['questions']
     if not isinstance(qs, list) or len(qs) != num_questions:
         raise ValueError(f"Quiz must contain exactly {num_questions} questions.")
     for q in qs:
-        if not all(k in q for k in ('question_title', 'question_options', 'answer')):
-            raise ValueError('Each question must have question_title, question_options, answer.')
-        opts = q['question_options']
-        if not isinstance(opts, list) or len(opts) != 4 or len(set(opts)) != 4:
-            raise ValueError('Each question must have exactly 4 distinct options.')
-        if q['answer'] not in opts:
-            raise ValueError('Answer must be one of question_options.')
-
-def create_quiz_from_youtube(url: str, owner, num_questions: int = 10):
+        error = question_error(q)
+        if error:
+            raise ValueError(error)
+
+def _transcribe_video(canonical_url: str, info: dict, report, engine=None, language: str | None = None) -> TranscriptionResult:
+    '''Get the audio of a video and transcribe it with `engine` (default: configured engine).
+
+    With QUIZ_STREAM_AUDIO enabled and a streamable format, the audio is piped
+    through FFmpeg into memory; otherwise (or if streaming fails) it is
+    downloaded to QUIZ_TMP_DIR and removed after transcription.
+    '''
+
+    if info.get('duration'):
+        audio_seconds.inc(info['duration'])
+    if getattr(settings, 'QUIZ_STREAM_AUDIO', True) and is_streamable(info):
+        try:
+            with timed_stage('stream_audio'):
+                audio = stream_audio(info, ffmpeg=_require_ffmpeg())
+        except ValueError:
+            audio = None
+        if audio is not None:
+            report('transcribing', 35)
+            return transcribe_audio(audio, language=language, engine=engine)
+
+    audio_path = download_audio(canonical_url, info=info)
+    try:
+        report('transcribing', 35)
+        return transcribe_audio(audio_path, language=language, engine=engine)
+    finally:
+        with contextlib.suppress(Exception):
+            pathlib.Path(audio_path).unlink(missing_ok=True)
+
+def create_quiz_from_youtube(url: str, owner, num_questions: int = 10, progress=None, language: str | None = None):
     '''End-to-end pipeline: validate → download → transcribe → LLM → persist.
 
+    A transcript stored for the same video and engine/model (or from its
+    captions) is reused, which skips the availability check, the download and
+    the transcription. Otherwise the video's caption track is used when
+    QUIZ_USE_CAPTIONS is enabled, and transcription only runs as a fallback.
+    Concurrent requests for the same video are collapsed: one leader fetches
+    the transcript while the others wait on a per-video lock file and then
+    read it from the cache.
+
     Args:
         url: Any YouTube URL containing a valid video ID.
         owner: The Django User who will own the quiz.
         num_questions: Number of questions to generate and enforce.
+        progress: Optional callable `progress(stage, percent)` invoked when the
+            pipeline enters a new stage (used by background jobs).
+        language: Spoken language chosen by the user; otherwise the yt-dlp
+            metadata or the cached channel language is used, and only then
+            does the engine detect it (see `languages`).
 
     Returns:
         The created Quiz instance (with related Questions saved).
@@ -254,17 +812,44 @@ def create_quiz_from_youtube(url: str, owner, num_questions: int = 10):
         FFmpeg missing, LLM errors, invalid JSON, etc.).
     '''
 
-    canonical_url = YOUTUBE_CANONICAL.format(vid=extract_youtube_id(url))
-    ensure_video_available(canonical_url, max_duration_sec=getattr(settings, 'QUIZ_MAX_DURATION_SEC', None))    
-    audio_path = download_audio(canonical_url)
-    try:
-        transcript = transcribe_audio(audio_path)
-    finally:
-        with contextlib.suppress(Exception):
-            pathlib.Path(audio_path).unlink(missing_ok=True)
-
-    quiz_dict = generate_quiz_with_gemini(transcript, num_questions=num_questions)
-
+    report = progress or (lambda stage, percent: None)
+    report('validating', 5)
+    vid = extract_youtube_id(url)
+    canonical_url = YOUTUBE_CANONICAL.format(vid=vid)
+    # Any model the selection policy may choose is an acceptable cached source.
+    engine_sources = tuple(get_engine(model_name=m).source for m in candidate_models())
+    use_captions = getattr(settings, 'QUIZ_USE_CAPTIONS', True)
+    sources = engine_sources + (CAPTIONS_SOURCE,) if use_captions else engine_sources
+    transcript = get_cached_transcript(vid, *sources)
+    if transcript is None:
+        report('waiting', 10)
+        with single_flight(vid):
+            # Another request for the same video may have finished while we waited.
+            transcript = get_cached_transcript(vid, *sources, record=False)
+            if transcript is None:
+                info = ensure_video_available(canonical_url, max_duration_sec=getattr(settings, 'QUIZ_MAX_DURATION_SEC', None))
+                source, details = CAPTIONS_SOURCE, {'duration_sec': info.get('duration')}
+                transcript = fetch_caption_transcript(info) if use_captions else None
+                if transcript is None:
+                    choice = choose_model(info.get('duration'))
+                    model_selections.inc(model=choice.model_name)
+                    engine = get_engine(model_name=choice.model_name)
+                    source = engine.source
+                    details.update(transcription_model=choice.model_name, queue_depth=choice.queue_depth)
+                    language = resolve_language(info, preferred=language)
+                    report('downloading', 15)
+                    result = _transcribe_video(canonical_url, info, report, engine=engine, language=language)
+                    transcript = result.text
+                    remember_language(info, result.language)
+                store_transcript(vid, source, transcript, **details)
+
+    with timed_stage('compress_transcript'):
+        transcript = compress_transcript(transcript)
+    transcript_chars.observe(len(transcript))
+    report('generating', 70)
+    quiz_dict = get_or_generate_quiz(transcript, num_questions=num_questions)
+
+    report('saving', 95)
     from ..models import Quiz, Question
     quiz = Quiz.objects.create(
         owner=owner,
@@ -281,4 +866,7 @@ def create_quiz_from_youtube(url: str, owner, num_questions: int = 10):
         ) for q in quiz_dict['questions']
     ]
     Question.objects.bulk_create(questions)
+    # bulk_create sends no signals: refresh the snapshot and the owner's cached responses here.
+    quiz.rendered_json = rebuild_snapshot(quiz.pk).rendered_json
+    invalidate_user(owner.pk)
     return quiz
\ No newline at end of file
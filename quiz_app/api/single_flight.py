@@ -0,0 +1,68 @@
+'''Cross-process single-flight locks for expensive per-video work.
+
+When many users submit the same video at once, only the first request (the
+leader) should run yt-dlp and Whisper; the others (followers) wait for the
+leader to finish and then read its transcript from the transcript cache.
+
+A lock file per video id in QUIZ_TMP_DIR/locks coordinates web workers and
+job workers on the same host (via `filelock`).
+
+Settings:
+- QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC: How long a follower waits for the leader
+  before doing the work itself (None = wait indefinitely).
+'''
+
+import contextlib, pathlib, tempfile, threading
+
+from django.conf import settings
+from filelock import FileLock, Timeout
+
+_stats_lock = threading.Lock()
+_stats = {'leaders': 0, 'waited': 0, 'timeouts': 0}
+
+def _count(key: str):
+    '''Increment a process-local single-flight counter.'''
+
+    with _stats_lock:
+        _stats[key] += 1
+
+def _lock_path(key: str) -> pathlib.Path:
+    '''Return the lock file path for `key`, creating the lock directory.'''
+
+    base = pathlib.Path(getattr(settings, 'QUIZ_TMP_DIR', tempfile.gettempdir())) / 'locks'
+    base.mkdir(parents=True, exist_ok=True)
+    return base / f"{key}.lock"
+
+@contextlib.contextmanager
+def single_flight(key: str):
+    '''Hold the in-flight lock for `key` while the body runs.
+
+    Yields True if the lock is held. If another process holds it, the caller
+    blocks until it is released (then re-checks its cache inside the body).
+    After QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC the body runs without the lock and
+    False is yielded, so a stuck leader never blocks requests forever.
+    '''
+
+    timeout = getattr(settings, 'QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC', None)
+    lock = FileLock(str(_lock_path(key)), timeout=-1 if timeout is None else timeout)
+    try:
+        lock.acquire(blocking=False)
+        _count('leaders')
+    except Timeout:
+        _count('waited')
+        try:
+            lock.acquire()
+        except Timeout:
+            _count('timeouts')
+            yield False
+            return
+    try:
+        yield True
+    finally:
+        lock.release()
+
+def single_flight_stats() -> dict:
+    '''Return process-local counters (leaders, followers that waited, timeouts).'''
+
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,91 @@
+'''Precomputed JSON snapshots of quizzes (Quiz.rendered_json).
+
+Responsibilities:
+- Render a quiz with its questions exactly as QuizSerializer does and store
+  the JSON text on the quiz row, so full reads stream that text instead of
+  instantiating serializer fields and decoding question options per request.
+- Rebuild the snapshot whenever the quiz or its questions change: the quiz
+  pipeline calls `rebuild_snapshot` after its bulk insert, the API views and
+  the admin are covered by the model signals (quiz_app/signals.py).
+- Rebuild missing snapshots lazily on read (e.g. quizzes created before the
+  column existed); `manage.py check_quiz_snapshots --fix` backfills them all.
+'''
+
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from ..models import Quiz
+from .serializers import QuizSerializer
+
+def render_quiz(quiz: Quiz) -> str:
+    '''Return the full JSON representation of a quiz (questions prefetched or loaded).'''
+
+    return JSONRenderer().render(QuizSerializer(quiz).data).decode()
+
+def rebuild_snapshot(quiz_id) -> Quiz | None:
+    '''Re-render and store the snapshot of a quiz.
+
+    Uses a queryset update, so neither `updated_at` nor the model signals fire.
+
+    Returns:
+        The quiz (with `rendered_json` set), or None if it no longer exists.
+    '''
+
+    quiz = Quiz.objects.prefetch_related('questions').filter(pk=quiz_id).first()
+    if quiz is None:
+        return None
+    quiz.rendered_json = render_quiz(quiz)
+    Quiz.objects.filter(pk=quiz.pk).update(rendered_json=quiz.rendered_json)
+    return quiz
+
+def snapshot_of(quiz: Quiz) -> str:
+    '''Return the stored snapshot of a quiz, rebuilding it if it is missing.'''
+
+    if quiz.rendered_json:
+        return quiz.rendered_json
+    rebuilt = rebuild_snapshot(quiz.pk)
+    return rebuilt.rendered_json if rebuilt else render_quiz(quiz)
+
+class SnapshotResponse(Response):
+    '''DRF response whose body is already rendered JSON and is sent as is.
+
+    `data` is parsed from the body only when something inspects it (e.g. the
+    test client); serving the response never decodes it.
+
+    Args:
+        body: Rendered JSON text or bytes.
+    '''
+
+    def __init__(self, body, **kwargs):
+        self.body = body.encode() if isinstance(body, str) else body
+        super().__init__(**kwargs)
+
+    @property
+    def data(self):
+        return json.loads(self.body)
+
+    @data.setter
+    def data(self, value):
+        # Response.__init__ assigns data=None; the body is the source of truth.
+        pass
+
+    @property
+    def rendered_content(self) -> bytes:
+        self['Content-Type'] = 'application/json'
+        return self.body
+
+def snapshot_list_response(quizzes, next_link: str | None = None, paginated: bool = False) -> SnapshotResponse:
+    '''Join the snapshots of `quizzes` into a list (or page) response.
+
+    Args:
+        quizzes: Quiz rows with `rendered_json` loaded.
+        next_link: URL of the next page (paginated responses only).
+        paginated: Wrap the list as {'next': ..., 'results': [...]}.
+    '''
+
+    body = '[' + ','.join(snapshot_of(quiz) for quiz in quizzes) + ']'
+    if paginated:
+        body = '{"next":' + json.dumps(next_link) + ',"results":' + body + '}'
+    return SnapshotResponse(body)
@@ -0,0 +1,94 @@
+'''Token counting and budgeted splitting of long transcripts.
+
+Responsibilities:
+- Count transcript tokens with tiktoken (imported lazily).
+- Split a transcript into sections of at most a token budget, on sentence
+  boundaries where possible, for map-reduce quiz generation.
+
+Settings:
+- QUIZ_TOKEN_ENCODING: tiktoken encoding name (default 'cl100k_base').
+
+tiktoken's BPE files are downloaded on first use; when the encoding cannot be
+loaded (e.g. offline hosts) an estimate of ~4 characters per token is used.
+Gemini tokenizes differently, so budgets are approximate either way.
+'''
+
+import functools, math, re
+
+from django.conf import settings
+
+CHARS_PER_TOKEN = 4
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+@functools.lru_cache(maxsize=4)
+def _encoding(name: str):
+    '''Return the tiktoken encoding `name`, or None if it cannot be loaded.'''
+
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None
+
+def count_tokens(text: str) -> int:
+    '''Return the (approximate) number of tokens in `text`.'''
+
+    enc = _encoding(getattr(settings, 'QUIZ_TOKEN_ENCODING', 'cl100k_base'))
+    if enc is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(enc.encode(text, disallowed_special=()))
+
+def split_sentences(text: str) -> list:
+    '''Split `text` after sentence-ending punctuation (., !, ?).'''
+
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+def _pieces(text: str, budget: int) -> list:
+    '''Split `text` into sentences; sentences over `budget` are split by words.'''
+
+    out = []
+    for sentence in split_sentences(text):
+        if count_tokens(sentence) <= budget:
+            out.append(sentence)
+            continue
+        # Unpunctuated text (e.g. automatic captions) arrives as one long
+        # "sentence"; count per word so splitting stays linear.
+        current, used = [], 0
+        for word in sentence.split():
+            n = count_tokens(' ' + word)
+            if current and used + n > budget:
+                out.append(' '.join(current))
+                current, used = [], 0
+            current.append(word)
+            used += n
+        if current:
+            out.append(' '.join(current))
+    return out
+
+def split_transcript(text: str, budget: int) -> list:
+    '''Split `text` into consecutive sections of at most `budget` tokens.
+
+    Sentences are packed greedily; a transcript within the budget is returned
+    as a single section.
+
+    Args:
+        text: The transcript.
+        budget: Maximum tokens per section (must be positive).
+
+    Returns:
+        A list of section strings (empty for an empty transcript).
+    '''
+
+    if budget <= 0:
+        raise ValueError('Token budget must be positive.')
+    sections, current, used = [], [], 0
+    for piece in _pieces(text, budget):
+        n = count_tokens(piece)
+        if current and used + n > budget:
+            sections.append(' '.join(current))
+            current, used = [], 0
+        current.append(piece)
+        used += n
+    if current:
+        sections.append(' '.join(current))
+    return sections
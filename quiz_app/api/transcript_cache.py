@@ -0,0 +1,107 @@
+'''Persistent transcript cache for the quiz pipeline.
+
+Responsibilities:
+- Look up a stored transcript by (YouTube video id, Whisper model name or
+  caption source).
+- Store fresh transcripts and evict old ones by age (TTL) and by count
+  (least recently used first).
+- Keep per-process hit/miss counters for monitoring the hit rate.
+
+Settings:
+- TRANSCRIPT_CACHE_TTL_SEC: Maximum age of a stored transcript (None = no TTL).
+- TRANSCRIPT_CACHE_MAX_ENTRIES: Maximum number of stored transcripts (None = unbounded).
+'''
+
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Transcript
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+def _count(key: str):
+    '''Increment a process-local cache counter.'''
+
+    with _stats_lock:
+        _stats[key] += 1
+
+def _ttl() -> timedelta | None:
+    '''Return the configured transcript TTL, or None if entries never expire.'''
+
+    ttl = getattr(settings, 'TRANSCRIPT_CACHE_TTL_SEC', None)
+    return timedelta(seconds=ttl) if ttl else None
+
+def get_cached_transcript(video_id: str, *model_names: str, record: bool = True) -> str | None:
+    '''Return the stored transcript for a video, or None on a miss.
+
+    Expired entries are treated as misses and removed.
+
+    Args:
+        video_id: The YouTube video id.
+        model_names: One or more transcript sources (Whisper model names or the
+            captions source), in order of preference.
+        record: Whether the lookup counts towards the hit/miss statistics
+            (False for re-checks of the same request).
+    '''
+
+    qs = Transcript.objects.filter(video_id=video_id, model_name__in=model_names)
+    ttl = _ttl()
+    if ttl:
+        qs.filter(created_at__lt=timezone.now() - ttl).delete()
+    entries = {e.model_name: e for e in qs.only('id', 'model_name', 'text')}
+    entry = next((entries[name] for name in model_names if name in entries), None)
+    if entry is None:
+        if record:
+            _count('misses')
+        return None
+    Transcript.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    if record:
+        _count('hits')
+    return entry.text
+
+def store_transcript(video_id: str, model_name: str, text: str, **details) -> None:
+    '''Persist a transcript (replacing an existing one) and apply eviction.
+
+    Args:
+        details: Optional Transcript fields describing how it was produced
+            (transcription_model, duration_sec, queue_depth).
+    '''
+
+    try:
+        Transcript.objects.update_or_create(video_id=video_id, model_name=model_name, defaults={'text': text, **details})
+    except IntegrityError:
+        # A concurrent request stored the same transcript first.
+        pass
+    evict_transcripts()
+
+def evict_transcripts() -> int:
+    '''Delete expired entries and trim the table to the configured size.
+
+    Returns:
+        The number of deleted transcripts.
+    '''
+
+    deleted = 0
+    ttl = _ttl()
+    if ttl:
+        deleted += Transcript.objects.filter(created_at__lt=timezone.now() - ttl).delete()[0]
+    max_entries = getattr(settings, 'TRANSCRIPT_CACHE_MAX_ENTRIES', None)
+    if max_entries:
+        stale = list(Transcript.objects.order_by('-last_used_at', '-id').values_list('pk', flat=True)[max_entries:])
+        if stale:
+            deleted += Transcript.objects.filter(pk__in=stale).delete()[0]
+    return deleted
+
+def cache_stats() -> dict:
+    '''Return process-local hit/miss counters and the hit rate.'''
+
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
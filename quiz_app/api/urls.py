@@ -1,8 +1,11 @@
 '''URL routes for the quiz API.
 
 Exposes:
-- POST /api/createQuiz/          -> CreateQuizView (runs yt-dlp → Whisper → Gemini)
-- GET  /api/quizzes/             -> QuizzesListView (list own quizzes with questions)
+- POST /api/createQuiz/          -> CreateQuizView (queues yt-dlp → Whisper → Gemini)
+- GET  /api/jobs/<id>/           -> QuizJobDetailView (status of a queued quiz job)
+- GET  /api/metrics/             -> MetricsView (staff only, Prometheus text format)
+- GET  /api/quizzes/             -> QuizzesListView (list own quizzes with questions;
+                                    ?limit=/?cursor= pages, ?view=summary omits questions)
 - GET  /api/quizzes/<id>/        -> QuizDetailView (retrieve a single quiz)
 - PUT  /api/quizzes/<id>/        -> QuizDetailView (full update of metadata)
 - PATCH /api/quizzes/<id>/       -> QuizDetailView (partial update of metadata)
@@ -13,10 +16,12 @@ These paths are typically included under the project-level '/api/' prefix, e.g.:
 '''
 
 from django.urls import path
-from .views import CreateQuizView, QuizzesListView, QuizDetailView
+from .views import CreateQuizView, QuizzesListView, QuizDetailView, QuizJobDetailView, MetricsView
 
 urlpatterns = [
     path('createQuiz/', CreateQuizView.as_view(), name='api-create-quiz'),
     path('quizzes/', QuizzesListView.as_view(),  name='api-quizzes'),
     path('quizzes/<int:id>/', QuizDetailView.as_view(),  name='api-quiz-detail'),
+    path('jobs/<int:id>/', QuizJobDetailView.as_view(), name='api-job-detail'),
+    path('metrics/', MetricsView.as_view(), name='api-metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,85 @@
+'''Short-lived, process-wide cache of yt-dlp video metadata.
+
+Responsibilities:
+- Keep the info dict of recently extracted videos keyed by YouTube video id,
+  so the availability check, caption lookup and audio download share one
+  extractor round trip, and repeated requests for the same video skip it.
+- Collapse concurrent extractions of the same video inside a process into a
+  single call (per-key lock).
+
+Entries expire after QUIZ_METADATA_TTL_SEC; keep this well below the
+lifetime of YouTube stream URLs (a few hours).
+'''
+
+import threading, time
+
+from django.conf import settings
+
+class VideoInfoCache:
+    '''Thread-safe TTL cache of info dicts with per-key single-flight loading.
+
+    Args:
+        max_entries: Upper bound on cached videos (oldest entries are dropped).
+    '''
+
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _ttl(self) -> float:
+        '''Return the configured TTL in seconds (0 disables caching).'''
+
+        return getattr(settings, 'QUIZ_METADATA_TTL_SEC', 300) or 0
+
+    def _fresh(self, key):
+        '''Return the cached value for `key` if it has not expired yet.'''
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def get_or_load(self, key, loader):
+        '''Return the cached info for `key`, calling `loader()` on a miss.
+
+        Concurrent callers for the same key wait for the first loader instead
+        of extracting the same video again. Loader exceptions are not cached.
+        '''
+
+        ttl = self._ttl()
+        if not ttl:
+            return loader()
+        info = self._fresh(key)
+        if info is not None:
+            return info
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            info = self._fresh(key)
+            if info is not None:
+                return info
+            info = loader()
+            now = time.monotonic()
+            with self._lock:
+                self._entries[key] = (now + ttl, info)
+                expired = [k for k, (exp, _) in self._entries.items() if exp <= now]
+                for k in expired:
+                    self._entries.pop(k, None)
+                    self._locks.pop(k, None)
+                while len(self._entries) > self._max_entries:
+                    oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                    self._entries.pop(oldest)
+                    self._locks.pop(oldest, None)
+            return info
+
+    def clear(self):
+        '''Drop all cached entries.'''
+
+        with self._lock:
+            self._entries.clear()
+            self._locks.clear()
+
+video_info_cache = VideoInfoCache()
@@ -1,33 +1,79 @@
 '''Views for the quiz API.
 
 Exposes:
-- POST /api/createQuiz/          -> CreateQuizView (runs yt-dlp → Whisper → Gemini)
-- GET  /api/quizzes/             -> QuizzesListView (list own quizzes with questions)
+- POST /api/createQuiz/          -> CreateQuizView (queues yt-dlp → Whisper → Gemini)
+- GET  /api/jobs/<id>/           -> QuizJobDetailView (status of a queued quiz job)
+- GET  /api/metrics/             -> MetricsView (staff only, Prometheus text format)
+- GET  /api/quizzes/             -> QuizzesListView (list own quizzes with questions;
+                                    ?limit=/?cursor= pages, ?view=summary omits questions)
 - GET  /api/quizzes/<id>/        -> QuizDetailView (retrieve a single quiz)
+  (both GET endpoints accept ?fields= and ?fields[questions]= sparse fieldsets)
 - PUT  /api/quizzes/<id>/        -> QuizDetailView (full update of metadata)
 - PATCH /api/quizzes/<id>/       -> QuizDetailView (partial update of metadata)
 - DELETE /api/quizzes/<id>/      -> QuizDetailView (delete quiz)
 
 Notes:
 - All endpoints require authentication via cookie-based JWT (or Authorization header).
+- Quiz reads send an ETag (the detail also Last-Modified) and answer 304 to a
+  matching If-None-Match / If-Modified-Since; PUT/PATCH honor If-Match / If-Unmodified-Since (412).
+- Quiz reads are served from a per-user response cache when it is enabled
+  (response_cache.py, needs a shared cache backend); writes invalidate it.
+- Full JSON quiz representations are streamed from the precomputed
+  Quiz.rendered_json snapshots (snapshots.py) instead of being serialized.
 - The service layer raises ValueError for expected client errors (mapped to 400),
   everything else bubbles up as 500 (with debug detail in DEBUG mode).
 '''
 
 from django.conf import settings
+from django.http import HttpResponse
+from django.urls import reverse
 
 from rest_framework import status
-from rest_framework.exceptions import NotFound, PermissionDenied
-from rest_framework.generics import ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.generics import ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ..models import Quiz
-from .serializers import QuizSerializer, QuizUpdateSerializer, QuizPartialUpdateSerializer
+from ..models import Quiz, QuizJob
+from .conditional import conditional_response, library_validators, quiz_state, quiz_validators, set_validators
+from .fieldsets import QUIZ_FIELDS, SUMMARY_FIELDS, apply_fieldsets, parse_fieldsets
+from .jobs import enqueue_quiz_job
+from .languages import normalize_language
+from .metrics import CONTENT_TYPE, render_prometheus
+from .pagination import QuizCursorPagination
+from .response_cache import get_response, invalidate_user, response_key, store_response
+from .snapshots import SnapshotResponse, snapshot_list_response, snapshot_of
+from .serializers import (
+    QuizSerializer, QuizSummarySerializer, QuizUpdateSerializer, QuizPartialUpdateSerializer, QuizJobSerializer,
+)
 from .services import create_quiz_from_youtube
 
+def uses_snapshots(request: Request, fieldsets: dict, view_mode: str = 'full') -> bool:
+    '''Return True if the response is the full JSON representation (served from snapshots).'''
+
+    return (
+        view_mode == 'full'
+        and not any(fieldsets.values())
+        and getattr(getattr(request, 'accepted_renderer', None), 'format', None) == 'json'
+    )
+
+def _cached_response(request: Request, body: bytes, validators) -> HttpResponse:
+    '''Answer from a cached body: 304 if the client's copy is current, else 200.'''
+
+    conditional = conditional_response(request, validators)
+    if conditional is not None:
+        return conditional
+    return set_validators(HttpResponse(body, content_type='application/json'), validators)
+
+def _send_and_cache(key: str | None, response: Response, validators) -> Response:
+    '''Add validators to a fresh 200 response and cache its body under `key` once rendered.'''
+
+    if key is not None and response.status_code == status.HTTP_200_OK:
+        response.add_post_render_callback(lambda rendered: store_response(key, rendered.content, validators))
+    return set_validators(response, validators)
+
 class CreateQuizView(APIView):
     '''Create a new quiz from a YouTube URL (full pipeline).
 
@@ -36,9 +82,13 @@ class CreateQuizView(APIView):
 
     Request body (JSON):
         - url: str (required) — any valid YouTube URL (watch/embed/short).
+        - language: str (optional) — spoken language code (e.g. 'de'); skips
+          language detection during transcription.
 
     Responses:
-        201: Returns the created quiz with nested questions.
+        202: (QUIZ_ASYNC_JOBS, default) The pipeline was queued; returns the job
+             id and its status URL (poll GET /api/jobs/<id>/).
+        201: (QUIZ_ASYNC_JOBS=False) Returns the created quiz with nested questions.
         400: For expected failures (invalid URL, unavailable video, missing FFmpeg,
              missing GEMINI_API_KEY, invalid LLM JSON, etc.).
         500: Unexpected server errors (shows exception text in DEBUG mode).
@@ -50,8 +100,15 @@ class CreateQuizView(APIView):
         url = request.data.get('url', '').strip()
         if not url:
             return Response({'detail': "Missing 'url'."}, status=status.HTTP_400_BAD_REQUEST)
+        language = request.data.get('language') or None
+        if language is not None:
+            language = normalize_language(language)
+            if language is None:
+                return Response({'detail': 'Invalid language code.'}, status=status.HTTP_400_BAD_REQUEST)
+        if getattr(settings, 'QUIZ_ASYNC_JOBS', True):
+            return self._enqueue(request, url, language)
         try:
-            quiz = create_quiz_from_youtube(url, owner=request.user, num_questions=10)
+            quiz = create_quiz_from_youtube(url, owner=request.user, num_questions=10, language=language)
         except ValueError as e:
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
@@ -59,34 +116,113 @@ class CreateQuizView(APIView):
                 return Response({'detail': f"Internal server error: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             return Response({'detail': 'Internal server error.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         return Response(QuizSerializer(quiz).data, status=status.HTTP_201_CREATED)
+
+    def _enqueue(self, request: Request, url: str, language: str | None = None) -> Response:
+        '''Queue the pipeline for a background worker and answer 202 Accepted.'''
+
+        try:
+            job = enqueue_quiz_job(url, owner=request.user, num_questions=10, language=language)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        data = QuizJobSerializer(job).data
+        data['status_url'] = request.build_absolute_uri(reverse('api-job-detail', kwargs={'id': job.id}))
+        return Response(data, status=status.HTTP_202_ACCEPTED)
     
 class QuizzesListView(ListAPIView):
-    '''List all quizzes owned by the authenticated user.
+    '''List all quizzes owned by the authenticated user, newest first.
 
     Endpoint:
         GET /api/quizzes/
 
+    Query parameters:
+        - limit / cursor (optional): Keyset pagination; the response becomes
+          {'next': <url or null>, 'results': [...]}. Without them the whole
+          list is returned.
+        - view (optional): 'full' (default, nested questions) or 'summary'
+          (no questions, a database-computed 'question_count' instead).
+        - fields / fields[questions] (optional): Comma separated fields to
+          return for quizzes / their questions; others are not fetched.
+
     Responses:
-        200: A list of quizzes with nested questions.
+        200: A list (or page) of quizzes, with an ETag (no Last-Modified:
+             deletions would not move it).
+        304: If-None-Match matches the current library.
+        400: Invalid 'view', 'limit' or field names.
         401: If unauthenticated.
+        404: Invalid 'cursor'.
     '''
 
-    serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = QuizCursorPagination
+    VIEWS = ('full', 'summary')
 
-    def get_queryset(self):
-        return (
-            Quiz.objects
-            .filter(owner=self.request.user)
-            .prefetch_related('questions')
-            .order_by('-created_at')
+    def get_view_mode(self) -> str:
+        '''Return the requested representation ('full' or 'summary').'''
+
+        mode = self.request.query_params.get('view') or 'full'
+        if mode not in self.VIEWS:
+            raise ValidationError({'view': f"Must be one of: {', '.join(self.VIEWS)}."})
+        return mode
+
+    def get_fieldsets(self) -> dict:
+        '''Return the parsed ?fields= / ?fields[questions]= of this request.'''
+
+        if not hasattr(self, '_fieldsets'):
+            quiz_fields = SUMMARY_FIELDS if self.get_view_mode() == 'summary' else QUIZ_FIELDS
+            self._fieldsets = parse_fieldsets(self.request.query_params, quiz_fields)
+        return self._fieldsets
+
+    def get_serializer_class(self):
+        if self.get_view_mode() == 'summary':
+            return QuizSummarySerializer
+        return QuizSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldsets'] = self.get_fieldsets()
+        return context
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        '''Answer from the response cache, or 304 from one aggregate query when unchanged.'''
+
+        key = response_key(request, 'list')
+        cached = get_response(key, 'list')
+        if cached is not None:
+            return _cached_response(request, *cached)
+        validators = library_validators(request, request.user)
+        conditional = conditional_response(request, validators)
+        if conditional is not None:
+            return conditional
+        if uses_snapshots(request, self.get_fieldsets(), self.get_view_mode()):
+            response = self.list_snapshots(request)
+        else:
+            response = super().list(request, *args, **kwargs)
+        return _send_and_cache(key, response, validators)
+
+    def list_snapshots(self, request: Request) -> Response:
+        '''Join the stored JSON snapshots of the (paged) quizzes without serializing.'''
+
+        queryset = (
+            Quiz.objects.filter(owner=request.user)
+            .only('id', 'created_at', 'rendered_json')
+            .order_by(*QuizCursorPagination.ordering)
         )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return snapshot_list_response(queryset)
+        return snapshot_list_response(page, self.paginator.get_next_link(), paginated=True)
+
+    def get_queryset(self):
+        queryset = Quiz.objects.filter(owner=self.request.user)
+        queryset = apply_fieldsets(queryset, self.get_fieldsets(), summary=self.get_view_mode() == 'summary')
+        return queryset.order_by(*QuizCursorPagination.ordering)
     
 class QuizDetailView(RetrieveUpdateDestroyAPIView):
     '''Retrieve, update, or delete a single quiz by id.
 
     Endpoints:
-        GET    /api/quizzes/<id>/   -> retrieve quiz with questions
+        GET    /api/quizzes/<id>/   -> retrieve quiz with questions (honors
+                                       ?fields= and ?fields[questions]=)
         PUT    /api/quizzes/<id>/   -> full update of metadata (title/description/video_url)
         PATCH  /api/quizzes/<id>/   -> partial update of metadata
         DELETE /api/quizzes/<id>/   -> delete quiz (204 No Content)
@@ -94,6 +230,11 @@ class QuizDetailView(RetrieveUpdateDestroyAPIView):
     Permission rules:
         - 404 if the quiz does not exist.
         - 403 if the quiz exists but the current user is not the owner.
+
+    Conditional requests:
+        - GET sends ETag/Last-Modified; a matching If-None-Match or
+          If-Modified-Since answers 304 after a single aggregate query.
+        - PUT/PATCH with a stale If-Match or If-Unmodified-Since answer 412.
     '''
     permission_classes = [IsAuthenticated]
 
@@ -104,40 +245,140 @@ class QuizDetailView(RetrieveUpdateDestroyAPIView):
             return QuizPartialUpdateSerializer
         return QuizSerializer
 
+    def get_fieldsets(self) -> dict:
+        '''Return the sparse fieldsets of a GET request (all fields otherwise).'''
+
+        if self.request.method != 'GET':
+            return {}
+        if not hasattr(self, '_fieldsets'):
+            self._fieldsets = parse_fieldsets(self.request.query_params)
+        return self._fieldsets
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldsets'] = self.get_fieldsets()
+        return context
+
     def get_object(self) -> Quiz:
         quiz_id = self.kwargs.get('id') or self.kwargs.get('pk')
         try:
-            obj = (Quiz.objects.prefetch_related('questions').get(pk=quiz_id))
+            obj = apply_fieldsets(Quiz.objects.all(), self.get_fieldsets()).get(pk=quiz_id)
         except Quiz.DoesNotExist:
             raise NotFound('Quiz not found.')
         if obj.owner_id != self.request.user.id:
             raise PermissionDenied('You do not have permission to access this quiz.')
         return obj
+
+    def get_validators(self):
+        '''Return the quiz's current validators (one aggregate query).
+
+        Raises:
+            NotFound: If the quiz does not exist.
+            PermissionDenied: If the current user is not the owner.
+        '''
+
+        state = quiz_state(self.kwargs.get('id') or self.kwargs.get('pk'))
+        if state is None:
+            raise NotFound('Quiz not found.')
+        if state['owner_id'] != self.request.user.id:
+            raise PermissionDenied('You do not have permission to access this quiz.')
+        return quiz_validators(self.request, state)
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        '''Retrieve the quiz, or 304 if the client's copy is current.'''
+
+        quiz_id = self.kwargs.get('id') or self.kwargs.get('pk')
+        key = response_key(request, 'detail', quiz_id)
+        cached = get_response(key, 'detail')
+        if cached is not None:
+            return _cached_response(request, *cached)
+        validators = self.get_validators()
+        conditional = conditional_response(request, validators)
+        if conditional is not None:
+            return conditional
+        if uses_snapshots(request, self.get_fieldsets()):
+            quiz = Quiz.objects.only('id', 'rendered_json').filter(pk=quiz_id).first()
+            if quiz is None:
+                raise NotFound('Quiz not found.')
+            response = SnapshotResponse(snapshot_of(quiz))
+        else:
+            response = super().get(request, *args, **kwargs)
+        return _send_and_cache(key, response, validators)
     
     def put(self, request: Request, *args, **kwargs) -> Response:
         '''Full update (replace) of quiz metadata.'''
 
-        instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data, partial=False)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-
-        return Response(QuizSerializer(instance).data, status=status.HTTP_200_OK)
+        return self._update(request, partial=False)
     
     def patch(self, request: Request, *args, **kwargs) -> Response:
         '''Partial update of quiz metadata.'''
 
+        return self._update(request, partial=True)
+
+    def _update(self, request: Request, partial: bool) -> Response:
+        '''Check the preconditions, save and answer with the quiz and its new ETag.'''
+
+        conditional = conditional_response(request, self.get_validators())
+        if conditional is not None:
+            return conditional
         instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_user(instance.owner_id)
 
-        return Response(QuizSerializer(instance).data, status=status.HTTP_200_OK)
+        response = Response(QuizSerializer(instance).data, status=status.HTTP_200_OK)
+        return set_validators(response, self.get_validators())
     
     def delete(self, request: Request, *args, **kwargs) -> Response:
         '''Delete the quiz and return 204 No Content.'''
         
         instance = self.get_object()
         instance.delete()
+        invalidate_user(instance.owner_id)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class QuizJobDetailView(RetrieveAPIView):
+    '''Report the status of an asynchronous quiz-generation job.
+
+    Endpoint:
+        GET /api/jobs/<id>/
+
+    Responses:
+        200: Job status, stage, progress and (once succeeded) the quiz id.
+        403: If the job belongs to another user.
+        404: If the job does not exist.
+    '''
+
+    serializer_class = QuizJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self) -> QuizJob:
+        try:
+            job = QuizJob.objects.get(pk=self.kwargs.get('id'))
+        except QuizJob.DoesNotExist:
+            raise NotFound('Job not found.')
+        if job.owner_id != self.request.user.id:
+            raise PermissionDenied('You do not have permission to access this job.')
+        return job
+
+class MetricsView(APIView):
+    '''Expose in-process pipeline metrics for Prometheus.
+
+    Only covers this web process: with asynchronous jobs the pipeline stages
+    are reported by the job workers' own exporters (`process_quiz_jobs
+    --metrics-port`).
+
+    Endpoint:
+        GET /api/metrics/
+
+    Responses:
+        200: Metrics in the Prometheus text exposition format.
+        401/403: If unauthenticated or not a staff user.
+    '''
+
+    permission_classes = [IsAdminUser]
 
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    def get(self, request: Request) -> HttpResponse:
+        return HttpResponse(render_prometheus(), content_type=CONTENT_TYPE)
\ No newline at end of file
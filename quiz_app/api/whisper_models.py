@@ -0,0 +1,153 @@
+'''Process-wide registry of loaded Whisper models.
+
+Responsibilities:
+- Load each Whisper model at most once per worker process and share it across
+  requests (thread-safe, one lock per model name so different models can load
+  in parallel).
+- Serialize inference per model (`lease`): openai-whisper installs KV-cache
+  hooks on the shared decoder modules for every decode, so two threads running
+  the same model at once corrupt each other's caches.
+- Optionally quantize a model's Linear layers to int8 on load (CPU).
+- Allow explicit eviction of one or all models to release memory.
+- Count loads and warm hits so production can verify that requests are served
+  by an already loaded model.
+
+Usage:
+    from .whisper_models import registry
+    model = registry.get('small')            # fp32
+    model = registry.get(('small', 'int8'))  # dynamic int8 quantization (CPU)
+    with registry.lease('small') as model:   # exclusive use for inference
+        model.transcribe(audio)
+'''
+
+import contextlib, gc, threading, warnings
+
+INT8 = 'int8'
+
+def quantize_whisper(model):
+    '''Apply dynamic int8 quantization to the Linear layers of a CPU Whisper model.
+
+    Weights of all Linear layers (attention projections and MLPs, the bulk of
+    the parameters) are stored as int8 and activations are quantized on the
+    fly; convolutions, embeddings and layer norms stay fp32. The model is
+    converted in place, so the fp32 Linear weights are released instead of
+    being held alongside the int8 copy.
+    '''
+
+    import torch
+    from whisper.model import Linear
+
+    for module in model.modules():
+        # whisper's Linear subclass only casts weights to the input dtype;
+        # quantize_dynamic swaps exact nn.Linear instances only.
+        if type(module) is Linear:
+            module.__class__ = torch.nn.Linear
+    with warnings.catch_warnings():
+        # torch >= 2.8 flags the eager quantization API as deprecated.
+        warnings.simplefilter('ignore', DeprecationWarning)
+        warnings.simplefilter('ignore', UserWarning)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+def _load_whisper(key):
+    '''Default loader: deserialize the Whisper weights for `key`.
+
+    `key` is a model name (fp32 weights) or a (name, 'int8') tuple for the
+    dynamically quantized CPU variant.
+    '''
+
+    import whisper
+    if isinstance(key, tuple):
+        name, precision = key
+        if precision != INT8:
+            raise ValueError(f"Unsupported Whisper precision '{precision}'.")
+        return quantize_whisper(whisper.load_model(name, device='cpu'))
+    return whisper.load_model(key)
+
+class ModelRegistry:
+    '''Thread-safe cache of loaded models keyed by name.
+
+    Args:
+        loader: Callable taking a model key and returning the loaded model.
+    '''
+
+    def __init__(self, loader=_load_whisper):
+        self._loader = loader
+        self._models = {}
+        self._locks = {}
+        self._inference_locks = {}
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._hits = 0
+
+    def _key_lock(self, key) -> threading.Lock:
+        '''Return the per-key lock, creating it on first use.'''
+
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key):
+        '''Return the model for `key`, loading it on first access.
+
+        Concurrent callers asking for the same cold model wait for a single
+        load instead of deserializing the weights several times.
+        '''
+
+        model = self._models.get(key)
+        if model is not None:
+            with self._lock:
+                self._hits += 1
+            return model
+
+        with self._key_lock(key):
+            model = self._models.get(key)
+            if model is not None:
+                with self._lock:
+                    self._hits += 1
+                return model
+            model = self._loader(key)
+            with self._lock:
+                self._models[key] = model
+                self._loads += 1
+            return model
+
+    @contextlib.contextmanager
+    def lease(self, key):
+        '''Yield the model for `key` for exclusive use by the calling thread.
+
+        Other threads leasing the same key wait until the block exits; different
+        models still run in parallel. Use it around every forward pass of a
+        model that keeps per-call state on its modules (Whisper decoding).
+        '''
+
+        model = self.get(key)
+        with self._lock:
+            lock = self._inference_locks.setdefault(key, threading.Lock())
+        with lock:
+            yield model
+
+    def evict(self, key=None) -> int:
+        '''Drop one model (or all when `key` is None) and return how many were removed.'''
+
+        with self._lock:
+            if key is None:
+                removed = len(self._models)
+                self._models.clear()
+            else:
+                removed = 1 if self._models.pop(key, None) is not None else 0
+        if removed:
+            gc.collect()
+        return removed
+
+    def loaded(self) -> list:
+        '''Return the keys of the currently loaded models.'''
+
+        with self._lock:
+            return list(self._models)
+
+    def stats(self) -> dict:
+        '''Return load/hit counters and the currently loaded keys.'''
+
+        with self._lock:
+            return {'loads': self._loads, 'hits': self._hits, 'loaded': list(self._models)}
+
+registry = ModelRegistry()
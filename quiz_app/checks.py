@@ -0,0 +1,26 @@
+'''Django system checks for the quiz_app settings.
+
+Checks:
+- quiz_app.E001: WHISPER_MODEL_POLICY cannot be parsed. Reported by
+  `manage.py check` and at server/worker startup, instead of failing the
+  first quiz request.
+
+Registered in QuizAppConfig.ready().
+'''
+
+from django.conf import settings
+from django.core.checks import Error, register
+from django.core.exceptions import ImproperlyConfigured
+
+from .api.model_policy import parse_policy
+
+@register()
+def check_model_policy(app_configs=None, **kwargs) -> list:
+    '''Report a malformed WHISPER_MODEL_POLICY.'''
+
+    try:
+        parse_policy(getattr(settings, 'WHISPER_MODEL_POLICY', ''))
+    except ImproperlyConfigured as e:
+        return [Error(str(e), hint="Use comma separated '<max seconds>:<model>' tiers, e.g. '900:small,*:base'.",
+                      id='quiz_app.E001')]
+    return []
@@ -0,0 +1,65 @@
+'''Benchmark transcript compression: prompt tokens and LLM latency per ratio.
+
+Usage:
+    python manage.py benchmark_compression --video-id dQw4w9WgXcQ
+    python manage.py benchmark_compression --file transcript.txt --ratio 1 0.7 0.5 --llm
+
+The transcript comes from the transcript cache (--video-id) or a text file.
+For each ratio the command prints the prompt size before/after compression
+and the compression time; with --llm it also calls Gemini once per ratio
+(bypassing the quiz result cache) and reports its latency.
+'''
+
+import pathlib, time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_app.api.compression import compress_transcript
+from quiz_app.api.services import build_quiz_prompt, generate_quiz_with_gemini
+from quiz_app.api.tokens import count_tokens
+from quiz_app.models import Transcript
+
+class Command(BaseCommand):
+    '''Compare prompt tokens and LLM latency for several compression ratios.'''
+
+    help = 'Benchmark local transcript compression before prompting.'
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--video-id', help='Use the cached transcript of this YouTube video.')
+        source.add_argument('--file', help='Read the transcript from a text file.')
+        parser.add_argument('--ratio', type=float, nargs='+', default=[1.0, 0.7, 0.5, 0.3],
+                            help='Compression ratios to compare (0 = uncompressed baseline).')
+        parser.add_argument('--num-questions', type=int, default=10)
+        parser.add_argument('--llm', action='store_true', help='Also measure Gemini latency per ratio.')
+
+    def _transcript(self, options) -> str:
+        if options['file']:
+            return pathlib.Path(options['file']).read_text(encoding='utf-8')
+        entry = Transcript.objects.filter(video_id=options['video_id']).order_by('-last_used_at').first()
+        if entry is None:
+            raise CommandError(f"No cached transcript for video {options['video_id']}.")
+        return entry.text
+
+    def handle(self, *args, **options):
+        transcript = self._transcript(options)
+        n = options['num_questions']
+        baseline = count_tokens(build_quiz_prompt(transcript, n))
+        self.stdout.write(f"Baseline prompt: {baseline} tokens, {len(transcript.split())} words")
+
+        for ratio in [0.0] + [r for r in options['ratio'] if r]:
+            start = time.perf_counter()
+            text = compress_transcript(transcript, ratio=ratio)
+            compress_ms = (time.perf_counter() - start) * 1000
+            tokens = count_tokens(build_quiz_prompt(text, n))
+            line = (f"ratio={ratio:<4} prompt_tokens={tokens:<7} "
+                    f"reduction={100 * (1 - tokens / baseline):5.1f}% compress_ms={compress_ms:7.1f}")
+            if options['llm']:
+                start = time.perf_counter()
+                try:
+                    generate_quiz_with_gemini(text, num_questions=n)
+                    outcome = 'ok'
+                except ValueError as e:
+                    outcome = f"error ({e})"
+                line += f" llm_sec={time.perf_counter() - start:6.2f} {outcome}"
+            self.stdout.write(line)
@@ -0,0 +1,108 @@
+'''Benchmark fp32 vs dynamic int8 Whisper on a fixed audio fixture.
+
+Usage:
+    python manage.py benchmark_quantization lecture.mp3 --seconds 60
+    python manage.py benchmark_quantization talk.mp3 --model base --seconds 120 --language en
+
+Any audio file FFmpeg can decode works; use the same file and --seconds for
+runs that are compared with each other.
+
+Every variant runs in a fresh (spawned) process, so the reported memory
+belongs to that variant alone. Printed per variant: model load time,
+transcription time, words per second, the resident memory once the model is
+loaded (what a worker keeps), the peak RSS reached while loading (fp32 weights
+are deserialized before quantization), the overall peak RSS and the
+word-level similarity of the transcript to the fp32 reference.
+
+Memory figures are read from /proc and getrusage and assume Linux.
+'''
+
+import difflib, multiprocessing, os, resource, time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_app.api.engines import SAMPLE_RATE, WhisperEngine
+from quiz_app.api.whisper_models import INT8
+
+VARIANTS = (None, INT8)
+
+def _rss_mb() -> float:
+    '''Return the current resident set size of this process in MiB.'''
+
+    with open('/proc/self/statm') as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def _peak_rss_mb() -> float:
+    '''Return the peak resident set size of this process in MiB.'''
+
+    # ru_maxrss is reported in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _measure(model_name: str, quantize, audio, language) -> dict:
+    '''Load one variant, transcribe `audio` and report timings and memory.'''
+
+    engine = WhisperEngine(model_name, quantize=quantize)
+    start = time.perf_counter()
+    from quiz_app.api.whisper_models import registry
+    registry.get(engine.registry_key)
+    load_sec = time.perf_counter() - start
+    rss_after_load_mb, load_peak_rss_mb = _rss_mb(), _peak_rss_mb()
+
+    start = time.perf_counter()
+    text = engine.transcribe(audio, language=language).text
+    transcribe_sec = time.perf_counter() - start
+    return {
+        'load_sec': load_sec,
+        'transcribe_sec': transcribe_sec,
+        'text': text,
+        'rss_after_load_mb': rss_after_load_mb,
+        'load_peak_rss_mb': load_peak_rss_mb,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+def _run_isolated(fn, *args):
+    '''Run `fn(*args)` in a fresh spawned process and return its result.'''
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(fn, *args).result()
+
+class Command(BaseCommand):
+    '''Compare fp32 and dynamically int8-quantized Whisper on CPU.'''
+
+    help = 'Benchmark Whisper fp32 against dynamic int8 quantization.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('audio', help='Path to a fixed audio fixture (decoded with FFmpeg).')
+        parser.add_argument('--model', default=None, help='Whisper model (default: WHISPER_MODEL).')
+        parser.add_argument('--seconds', type=float, default=None, help='Only use the first N seconds.')
+        parser.add_argument('--language', default=None, help='Language code (default: detect).')
+
+    def handle(self, *args, **options):
+        model_name = options['model'] or getattr(settings, 'WHISPER_MODEL', 'small')
+        try:
+            audio = WhisperEngine(model_name).load_audio(options['audio'])
+        except (OSError, RuntimeError) as e:
+            raise CommandError(str(e))
+        if options['seconds']:
+            audio = audio[:int(options['seconds'] * SAMPLE_RATE)]
+        seconds = len(audio) / SAMPLE_RATE
+        self.stdout.write(f"Audio: {seconds:.1f} s, model: {model_name}")
+
+        reference = None
+        for quantize in VARIANTS:
+            result = _run_isolated(_measure, model_name, quantize, audio, options['language'])
+            words = result['text'].split()
+            if reference is None:
+                reference = words
+            similarity = difflib.SequenceMatcher(None, reference, words, autojunk=False).ratio()
+            wps = len(words) / result['transcribe_sec'] if result['transcribe_sec'] else 0.0
+            self.stdout.write(
+                f"{quantize or 'fp32':<5} load_sec={result['load_sec']:6.2f} "
+                f"transcribe_sec={result['transcribe_sec']:7.2f} words_per_sec={wps:6.2f} "
+                f"rss_after_load_mb={result['rss_after_load_mb']:8.1f} "
+                f"load_peak_rss_mb={result['load_peak_rss_mb']:8.1f} "
+                f"peak_rss_mb={result['peak_rss_mb']:8.1f} similarity={similarity:.3f}"
+            )
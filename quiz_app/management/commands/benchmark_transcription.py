@@ -0,0 +1,59 @@
+'''Benchmark transcription engines against each other on the same audio.
+
+Usage:
+    python manage.py benchmark_transcription talk.mp3
+    python manage.py benchmark_transcription talk.mp3 --engine whisper faster-whisper --model small
+
+The audio is decoded once (by the first engine) and every engine transcribes
+the same samples. Per engine the command prints the model load time (a short
+warm-up clip), transcription time, real-time factor, word count, language and
+the word-level similarity to the first engine's transcript.
+'''
+
+import difflib, time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_app.api.engines import ENGINES, SAMPLE_RATE, get_engine
+
+WARMUP_SEC = 5
+
+class Command(BaseCommand):
+    '''Compare speed and output of the configured transcription engines.'''
+
+    help = 'Benchmark transcription engines on one audio file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('audio', help='Path to an audio/video file (decoded with FFmpeg).')
+        parser.add_argument('--engine', nargs='+', choices=sorted(ENGINES), default=['whisper'])
+        parser.add_argument('--model', default=None, help='Model name (default: WHISPER_MODEL).')
+        parser.add_argument('--language', default=None, help='Language code (default: detect).')
+
+    def handle(self, *args, **options):
+        try:
+            engines = [get_engine(name, options['model']) for name in options['engine']]
+            audio = engines[0].load_audio(options['audio'])
+        except (OSError, RuntimeError, ValueError) as e:
+            raise CommandError(str(e))
+        seconds = len(audio) / SAMPLE_RATE
+        self.stdout.write(f"Audio: {seconds:.1f} s")
+
+        reference = None
+        for engine in engines:
+            start = time.perf_counter()
+            engine.transcribe(audio[:WARMUP_SEC * SAMPLE_RATE], language=options['language'])
+            load_sec = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = engine.transcribe(audio, language=options['language'])
+            elapsed = time.perf_counter() - start
+
+            words = result.text.split()
+            if reference is None:
+                reference = words
+            similarity = difflib.SequenceMatcher(None, reference, words, autojunk=False).ratio()
+            self.stdout.write(
+                f"{engine.source:<32} load_sec={load_sec:6.2f} transcribe_sec={elapsed:7.2f} "
+                f"rtf={elapsed / seconds if seconds else 0:5.3f} words={len(words):<6} "
+                f"language={result.language} similarity={similarity:.3f}"
+            )
@@ -0,0 +1,43 @@
+'''Verify the precomputed quiz JSON snapshots against the live rows.
+
+Usage:
+    python manage.py check_quiz_snapshots          # report stale/missing snapshots
+    python manage.py check_quiz_snapshots --fix    # and rebuild them
+
+Every quiz is rendered from its current quiz and question rows and compared
+with Quiz.rendered_json. Without --fix the command fails (non-zero exit) if
+any snapshot is stale or missing, so it can run in CI or a cron check.
+'''
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_app.api.snapshots import render_quiz
+from quiz_app.models import Quiz
+
+class Command(BaseCommand):
+    '''Compare Quiz.rendered_json with a fresh rendering of every quiz.'''
+
+    help = 'Check (and optionally rebuild) the denormalized quiz JSON snapshots.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Rebuild stale or missing snapshots.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Quizzes loaded per query.')
+
+    def handle(self, *args, **options):
+        quizzes = Quiz.objects.prefetch_related('questions').order_by('pk')
+        checked, stale = 0, []
+        for quiz in quizzes.iterator(chunk_size=options['batch_size']):
+            checked += 1
+            rendered = render_quiz(quiz)
+            if rendered == quiz.rendered_json:
+                continue
+            stale.append(quiz.pk)
+            state = 'missing' if not quiz.rendered_json else 'stale'
+            self.stdout.write(f"Quiz #{quiz.pk}: snapshot {state}")
+            if options['fix']:
+                Quiz.objects.filter(pk=quiz.pk).update(rendered_json=rendered)
+
+        summary = f"Checked {checked} quiz(zes), {len(stale)} stale or missing."
+        if stale and not options['fix']:
+            raise CommandError(f"{summary} Run with --fix to rebuild them.")
+        self.stdout.write(summary + (' Rebuilt.' if stale else ''))
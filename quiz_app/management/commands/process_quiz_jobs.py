@@ -0,0 +1,66 @@
+'''Worker entry point for asynchronous quiz generation.
+
+Usage:
+    python manage.py process_quiz_jobs            # poll forever
+    python manage.py process_quiz_jobs --once     # drain the queue and exit
+    python manage.py process_quiz_jobs --metrics-port 9101
+
+Run as many worker processes as the host has transcription capacity; the
+web workers only enqueue jobs and stay free for HTTP traffic.
+
+The pipeline metrics of a worker (stage durations, cache hits, LLM outcomes,
+finished jobs) live in its own memory; with --metrics-port it serves them in
+the Prometheus text format for scraping.
+'''
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_app.api.jobs import run_pending_jobs
+from quiz_app.api.metrics import start_metrics_server
+
+class Command(BaseCommand):
+    '''Claim pending QuizJob rows and run the quiz pipeline for each.'''
+
+    help = 'Process queued quiz-generation jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process the current queue and exit.')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--max-jobs', type=int, default=None, help='Exit after processing this many jobs.')
+        parser.add_argument('--metrics-port', type=int, default=None,
+                            help='Serve this worker\'s Prometheus metrics on this port.')
+        parser.add_argument('--metrics-addr', default='', help='Interface for --metrics-port (default: all).')
+
+    def handle(self, *args, **options):
+        server = None
+        if options['metrics_port'] is not None:
+            try:
+                server = start_metrics_server(options['metrics_port'], options['metrics_addr'])
+            except OSError as e:
+                raise CommandError(f"Cannot serve metrics on port {options['metrics_port']}: {e}")
+            self.stdout.write(f"Serving metrics on port {server.server_port}.")
+        try:
+            self._process(options)
+        finally:
+            if server:
+                server.shutdown()
+                server.server_close()
+
+    def _process(self, options):
+        '''Run jobs until the queue/limit is exhausted (or forever).'''
+
+        remaining = options['max_jobs']
+        while True:
+            done = run_pending_jobs(max_jobs=remaining)
+            if done:
+                self.stdout.write(f"Processed {done} job(s).")
+            if remaining is not None:
+                remaining -= done
+                if remaining <= 0:
+                    break
+            if options['once']:
+                break
+            if not done:
+                time.sleep(options['poll_interval'])
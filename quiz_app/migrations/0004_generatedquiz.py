@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-16 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0003_quizjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedQuiz',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=64, unique=True)),
+                ('transcript_digest', models.CharField(max_length=64)),
+                ('num_questions', models.PositiveSmallIntegerField()),
+                ('model_name', models.CharField(max_length=64)),
+                ('prompt_version', models.CharField(max_length=16)),
+                ('payload', models.JSONField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='quiz_app_ge_last_us_7473ff_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-16 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0004_generatedquiz'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='duration_sec',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='queue_depth',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='transcription_model',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-16 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0005_transcript_model_selection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChannelLanguage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel_id', models.CharField(max_length=64, unique=True)),
+                ('language', models.CharField(max_length=16)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='language',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-16 12:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0006_channel_language'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='quiz_owner_created_idx'),
+        ),
+    ]
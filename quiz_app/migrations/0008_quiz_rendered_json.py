@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-16 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0007_quiz_owner_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='rendered_json',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
@@ -3,11 +3,16 @@
 Models:
 - Quiz: A quiz owned by a user and linked to a YouTube video.
 - Question: A single multiple-choice question belonging to a quiz.
+- Transcript: A cached video transcript keyed by YouTube id and Whisper model.
+- QuizJob: An asynchronous quiz-generation request with stage/progress.
+- GeneratedQuiz: A cached validated LLM result keyed by transcript and prompt.
 
 Notes:
 - Questions are accessible from a quiz via the reverse relation 'questions'
   (see related_name on the ForeignKey).
 - Basic integrity checks for Question are implemented in `clean()`.
+- Quiz.rendered_json is a denormalized snapshot of the full API representation,
+  maintained by quiz_app.api.snapshots (never edit it by hand).
 '''
 
 from django.db import models
@@ -22,9 +27,13 @@ class Quiz(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     video_url = models.URLField()
+    rendered_json = models.TextField(blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['owner', '-created_at', '-id'], name='quiz_owner_created_idx')]
+
     def __str__(self) -> str:
         '''Readable representation used in admin and logs.'''
 
@@ -51,4 +60,119 @@ class Question(models.Model):
         if not isinstance(self.question_options, list) or len(self.question_options) != 4:
             raise ValueError('question_options must be a list of exactly 4 items.')
         if self.answer not in self.question_options:
-            raise ValueError('answer must be one of question_options.')
\ No newline at end of file
+            raise ValueError('answer must be one of question_options.')
+
+class Transcript(models.Model):
+    '''A cached transcript of a YouTube video for one transcript source.
+
+    Keyed by (video_id, model_name) so a video transcribed once can be reused
+    by every later quiz request for the same video. `model_name` is the
+    transcript source (engine/model key) or 'youtube-captions' for transcripts
+    taken from caption tracks. `transcription_model`, `duration_sec` and
+    `queue_depth` record which model the selection policy chose and why.
+    '''
+
+    video_id = models.CharField(max_length=11)
+    model_name = models.CharField(max_length=64)
+    text = models.TextField()
+    transcription_model = models.CharField(max_length=64, blank=True)
+    duration_sec = models.FloatField(null=True, blank=True)
+    queue_depth = models.PositiveIntegerField(null=True, blank=True)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['video_id', 'model_name'], name='unique_transcript_per_model'),
+        ]
+        indexes = [models.Index(fields=['last_used_at'])]
+
+    def __str__(self) -> str:
+        '''Readable representation used in admin and logs.'''
+
+        return f"{self.video_id} [{self.model_name}]"
+
+class ChannelLanguage(models.Model):
+    '''Spoken language last seen for a YouTube channel.
+
+    Lets the pipeline pass the language to the transcription engine for later
+    videos of the same channel instead of running language detection.
+    '''
+
+    channel_id = models.CharField(max_length=64, unique=True)
+    language = models.CharField(max_length=16)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        '''Readable representation used in admin and logs.'''
+
+        return f"{self.channel_id} [{self.language}]"
+
+class QuizJob(models.Model):
+    '''A queued quiz-generation request processed by a background worker.
+
+    The API creates a job and returns immediately; the `process_quiz_jobs`
+    management command runs the pipeline and reports stage/progress here.
+    '''
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_jobs')
+    url = models.URLField()
+    num_questions = models.PositiveSmallIntegerField(default=10)
+    language = models.CharField(max_length=16, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    stage = models.CharField(max_length=32, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0)
+    quiz = models.ForeignKey(Quiz, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self) -> str:
+        '''Readable representation used in admin and logs.'''
+
+        return f"Job #{self.id} ({self.status})"
+
+class GeneratedQuiz(models.Model):
+    '''A cached, already validated LLM quiz result.
+
+    Keyed by a digest of (transcript, number of questions, LLM model name,
+    prompt template hash), so the same transcript is not sent to the LLM twice
+    while the prompt and model stay unchanged.
+    '''
+
+    cache_key = models.CharField(max_length=64, unique=True)
+    transcript_digest = models.CharField(max_length=64)
+    num_questions = models.PositiveSmallIntegerField()
+    model_name = models.CharField(max_length=64)
+    prompt_version = models.CharField(max_length=16)
+    payload = models.JSONField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['last_used_at'])]
+
+    def __str__(self) -> str:
+        '''Readable representation used in admin and logs.'''
+
+        return f"{self.transcript_digest[:12]} x{self.num_questions} [{self.model_name}]"
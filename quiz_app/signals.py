@@ -0,0 +1,43 @@
+'''Model signal receivers for the quiz_app.
+
+Receivers:
+- Quiz/Question saved or deleted -> rebuild the quiz's JSON snapshot
+  (Quiz.rendered_json) and invalidate the owner's cached quiz API responses.
+  This covers the API views, the admin and any other ORM write; the quiz
+  pipeline does both explicitly, as bulk writes send no signals.
+
+Connected in QuizAppConfig.ready().
+'''
+
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .api.response_cache import invalidate_user
+from .api.snapshots import rebuild_snapshot
+from .models import Question, Quiz
+
+@receiver(post_save, sender=Quiz, dispatch_uid='quiz_app.quiz_saved')
+def quiz_saved(sender, instance: Quiz, raw: bool = False, **kwargs):
+    '''Rebuild the snapshot and invalidate cached responses of the quiz owner.'''
+
+    if not raw:
+        rebuild_snapshot(instance.pk)
+    invalidate_user(instance.owner_id)
+
+@receiver(post_delete, sender=Quiz, dispatch_uid='quiz_app.quiz_deleted')
+def quiz_deleted(sender, instance: Quiz, **kwargs):
+    '''Invalidate cached responses of the quiz owner.'''
+
+    invalidate_user(instance.owner_id)
+
+@receiver([post_save, post_delete], sender=Question, dispatch_uid='quiz_app.question_changed')
+def question_changed(sender, instance: Question, raw: bool = False, origin=None, **kwargs):
+    '''Rebuild the snapshot of the question's quiz and invalidate its owner's responses.'''
+
+    if raw or (isinstance(origin, models.Model) and not isinstance(origin, Question)):
+        # Fixture loading, or a cascade delete of the quiz (or its owner).
+        return
+    quiz = rebuild_snapshot(instance.quiz_id)
+    if quiz is not None:
+        invalidate_user(quiz.owner_id)
@@ -0,0 +1,94 @@
+'''Tests for in-memory audio streaming.
+
+Covers:
+- Only single-file HTTP(S) formats are considered streamable.
+- Downloaded bytes are piped through the decoder into a float32 array, using
+  ranged requests.
+- The pipeline falls back to a file download when streaming fails.
+
+Notes:
+- A tiny pass-through script stands in for FFmpeg (stdin -> stdout), so the
+  pipe handling is exercised without FFmpeg installed.
+- yt_dlp.YoutubeDL is replaced by a fake whose urlopen serves int16 PCM bytes.
+'''
+
+import io, os, stat, sys, tempfile
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import audio_stream, services
+
+PCM = (np.arange(-1000, 1000, dtype=np.int16) * 16).tobytes()
+
+class FakeResponse(io.BytesIO):
+    '''urlopen() response with an HTTP status.'''
+
+    status = 206
+
+class FakeYoutubeDL:
+    '''Serves PCM bytes honoring the Range header.'''
+
+    requests = []
+
+    def __init__(self, opts):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def urlopen(self, req):
+        start, end = map(int, req.headers['Range'].split('=')[1].split('-'))
+        FakeYoutubeDL.requests.append((start, end))
+        return FakeResponse(PCM[start:end + 1])
+
+class AudioStreamTests(SimpleTestCase):
+    '''Tests for quiz_app.api.audio_stream.'''
+
+    def setUp(self):
+        '''Create a pass-through executable standing in for FFmpeg.'''
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.ffmpeg = os.path.join(tmp.name, 'fake-ffmpeg')
+        with open(self.ffmpeg, 'w') as f:
+            f.write(f"#!{sys.executable}\nimport sys, shutil\nshutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)\n")
+        os.chmod(self.ffmpeg, os.stat(self.ffmpeg).st_mode | stat.S_IEXEC)
+        FakeYoutubeDL.requests = []
+
+    def test_is_streamable(self):
+        '''Fragmented protocols and merged formats are not streamable.'''
+
+        self.assertTrue(audio_stream.is_streamable({'url': 'u', 'protocol': 'https'}))
+        self.assertFalse(audio_stream.is_streamable({'url': 'u', 'protocol': 'http_dash_segments'}))
+        self.assertFalse(audio_stream.is_streamable({'url': 'u', 'requested_formats': [{}, {}]}))
+        self.assertFalse(audio_stream.is_streamable({}))
+
+    @patch('yt_dlp.YoutubeDL', FakeYoutubeDL)
+    @patch.object(audio_stream, 'RANGE_CHUNK', 1000)
+    def test_stream_decodes_into_array(self):
+        '''Bytes flow through the decoder and come back as scaled float32.'''
+
+        audio = audio_stream.stream_audio({'url': 'https://x', 'protocol': 'https'}, ffmpeg=self.ffmpeg)
+        expected = np.frombuffer(PCM, np.int16).astype(np.float32) / 32768.0
+        np.testing.assert_array_equal(audio, expected)
+        self.assertEqual(FakeYoutubeDL.requests[:2], [(0, 999), (1000, 1999)])
+        self.assertEqual(len(FakeYoutubeDL.requests), 5)
+
+    @override_settings(QUIZ_STREAM_AUDIO=True)
+    @patch('quiz_app.api.services.transcribe_audio', return_value='text')
+    @patch('quiz_app.api.services.download_audio', return_value='/nonexistent/a.webm')
+    @patch('quiz_app.api.services.stream_audio', side_effect=ValueError('boom'))
+    @patch('quiz_app.api.services._require_ffmpeg', return_value='ffmpeg')
+    def test_falls_back_to_download(self, mock_ffmpeg, mock_stream, mock_download, mock_transcribe):
+        '''A failed stream downloads the file and transcribes it instead.'''
+
+        text = services._transcribe_video('https://www.youtube.com/watch?v=AAAAAAAAAAA',
+                                          {'url': 'https://x', 'protocol': 'https'}, lambda *a: None)
+        self.assertEqual(text, 'text')
+        mock_download.assert_called_once()
+        mock_transcribe.assert_called_once_with('/nonexistent/a.webm', language=None, engine=None)
@@ -0,0 +1,115 @@
+'''Tests for the caption-first transcript path.
+
+Covers:
+- VTT and SRV parsing into plain text (tags, timings, rolling duplicates).
+- Track selection: manual subtitles before automatic captions, original
+  language ASR track, parsable formats only; manual tracks in another
+  language than the video's are ignored.
+- create_quiz_from_youtube uses captions and skips audio download/Whisper.
+
+Notes:
+- yt-dlp and Gemini calls are patched in 'quiz_app.api.services'.
+- Single-flight lock files go to a temporary QUIZ_TMP_DIR, not the repository's tmp/.
+'''
+
+import pathlib, tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from quiz_app.api.services import (
+    CAPTIONS_SOURCE, create_quiz_from_youtube, parse_srv, parse_vtt, select_caption_track,
+)
+from quiz_app.models import Transcript
+
+VTT = '''WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+hello<00:00:00.500><c> world</c>
+
+00:00:02.000 --> 00:00:04.000
+hello world
+this &amp; that
+'''
+
+SRV3 = '<timedtext format="3"><body><p t="0" d="1000"><s>Hello</s><s> there</s></p><p t="1000">General &amp; Kenobi</p></body></timedtext>'
+
+QUIZ_DICT = {
+    'title': 'T', 'description': 'D',
+    'questions': [{'question_title': 'Q1', 'question_options': ['A', 'B', 'C', 'D'], 'answer': 'A'}],
+}
+
+class CaptionTests(TestCase):
+    '''Tests for caption parsing/selection and the pipeline fast path.'''
+
+    def setUp(self):
+        '''Point QUIZ_TMP_DIR to a private directory.'''
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(QUIZ_TMP_DIR=pathlib.Path(tmp.name))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_parse_vtt(self):
+        '''Timings and tags are removed, rolling duplicates collapsed.'''
+
+        self.assertEqual(parse_vtt(VTT), 'hello world this & that')
+
+    def test_parse_srv(self):
+        '''SRV3 paragraphs become plain text.'''
+
+        self.assertEqual(parse_srv(SRV3), 'Hello there General & Kenobi')
+
+    def test_select_prefers_manual_then_orig_asr(self):
+        '''Manual subtitles win; otherwise the original-language ASR track.'''
+
+        info = {
+            'language': 'de',
+            'subtitles': {'de': [{'ext': 'json3', 'url': 'j'}, {'ext': 'vtt', 'url': 'manual'}]},
+            'automatic_captions': {'de-orig': [{'ext': 'vtt', 'url': 'auto'}], 'fr': [{'ext': 'vtt', 'url': 'fr'}]},
+        }
+        self.assertEqual(select_caption_track(info)['url'], 'manual')
+        info['subtitles'] = {}
+        self.assertEqual(select_caption_track(info)['url'], 'auto')
+        info['automatic_captions'] = {'de-orig': [{'ext': 'json3', 'url': 'j'}]}
+        self.assertIsNone(select_caption_track(info))
+
+    def test_select_ignores_other_language_manual_track(self):
+        '''A manual track in a different language is no transcript of the video.'''
+
+        info = {
+            'language': 'de',
+            'subtitles': {'en': [{'ext': 'vtt', 'url': 'manual-en'}]},
+            'automatic_captions': {'de-orig': [{'ext': 'vtt', 'url': 'auto-de'}]},
+        }
+        self.assertEqual(select_caption_track(info)['url'], 'auto-de')
+        del info['automatic_captions']
+        self.assertIsNone(select_caption_track(info))
+        # Without language metadata the original-language ASR track tells the language.
+        info = {'subtitles': {'en': [{'ext': 'vtt', 'url': 'manual-en'}], 'de': [{'ext': 'vtt', 'url': 'manual-de'}]},
+                'automatic_captions': {'de-orig': [{'ext': 'vtt', 'url': 'auto-de'}]}}
+        self.assertEqual(select_caption_track(info)['url'], 'manual-de')
+        del info['subtitles']['de']
+        self.assertEqual(select_caption_track(info)['url'], 'auto-de')
+        self.assertIsNone(select_caption_track({'subtitles': info['subtitles']}))
+
+    @override_settings(QUIZ_USE_CAPTIONS=True, WHISPER_MODEL='small')
+    @patch('quiz_app.api.services.generate_quiz_with_gemini', return_value=QUIZ_DICT)
+    @patch('quiz_app.api.services.transcribe_audio')
+    @patch('quiz_app.api.services.download_audio')
+    @patch('quiz_app.api.services.fetch_caption_transcript', return_value='caption transcript')
+    @patch('quiz_app.api.services.ensure_video_available', return_value={})
+    def test_pipeline_prefers_captions(self, mock_available, mock_captions, mock_download, mock_transcribe, mock_gemini):
+        '''With a usable caption track no audio is downloaded or transcribed.'''
+
+        user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        create_quiz_from_youtube('https://youtu.be/AAAAAAAAAAA', owner=user, num_questions=1)
+
+        mock_download.assert_not_called()
+        mock_transcribe.assert_not_called()
+        self.assertEqual(mock_gemini.call_args.args[0], 'caption transcript')
+        self.assertTrue(Transcript.objects.filter(video_id='AAAAAAAAAAA', model_name=CAPTIONS_SOURCE).exists())
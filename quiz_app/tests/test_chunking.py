@@ -0,0 +1,63 @@
+'''Unit tests for chunked transcription.
+
+Covers:
+- Cut points land in the silent gaps near each chunk boundary.
+- Short audio is not split.
+- Chunk transcripts are stitched back in order.
+
+Notes:
+- Synthetic NumPy audio is used; the model registry is replaced by a fake that
+  reports the chunk length instead of running Whisper.
+'''
+
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from quiz_app.api import chunking, whisper_models
+from quiz_app.api.engines import WhisperEngine
+from quiz_app.api.whisper_models import ModelRegistry
+
+SR = chunking.SAMPLE_RATE
+
+def tone_with_gaps(seconds: int, gaps: list) -> np.ndarray:
+    '''Return a loud signal with silent 1 s gaps starting at the given seconds.'''
+
+    audio = (0.5 * np.sin(np.arange(seconds * SR) * 0.05)).astype(np.float32)
+    for g in gaps:
+        audio[g * SR:(g + 1) * SR] = 0.0
+    return audio
+
+class ChunkingTests(SimpleTestCase):
+    '''Tests for quiz_app.api.chunking.'''
+
+    def test_cuts_fall_into_silence(self):
+        '''Each cut is inside the silent gap closest to the target boundary.'''
+
+        audio = tone_with_gaps(40, gaps=[8, 22])
+        cuts = chunking.find_split_points(audio, chunk_sec=10, search_sec=3)
+        self.assertEqual(len(cuts), 3)
+        self.assertTrue(8 * SR <= cuts[0] < 9 * SR)
+        self.assertTrue(22 * SR <= cuts[1] < 23 * SR)
+
+    def test_short_audio_not_split(self):
+        '''Audio shorter than one chunk yields a single piece.'''
+
+        audio = tone_with_gaps(5, gaps=[])
+        self.assertEqual(chunking.find_split_points(audio, chunk_sec=10), [])
+        self.assertEqual(len(chunking.split_on_silence(audio, chunk_sec=10)), 1)
+
+    def test_transcripts_stitched_in_order(self):
+        '''Sequential mode joins chunk texts in their original order.'''
+
+        class FakeModel:
+            def transcribe(self, chunk, language=None):
+                return {'text': f" {round(len(chunk) / SR)}s "}
+
+        fake = ModelRegistry(loader=lambda name: FakeModel())
+        audio = tone_with_gaps(30, gaps=[9, 19])
+        with patch.object(whisper_models, 'registry', fake):
+            text = chunking.transcribe_chunked(audio, WhisperEngine('small'), chunk_sec=10, workers=1)
+        self.assertEqual(text, '10s 10s 10s')
+        self.assertEqual(fake.stats()['loads'], 1)
@@ -0,0 +1,87 @@
+'''Tests for local extractive transcript compression.
+
+Covers:
+- Fillers and repeated sentences (hallucination loops) are removed at ratio 1.
+- Lower ratios keep the most central sentences within the word target, in
+  their original order.
+- Ratio 0 disables the stage; unpunctuated text is windowed.
+- The benchmark command reports the prompt reduction per ratio.
+- create_quiz_from_youtube passes the compressed transcript to the LLM.
+'''
+
+import pathlib, tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import services
+from quiz_app.api.compression import compress_transcript, sentence_scores
+
+TRANSCRIPT = (
+    'Uh, welcome back to the channel. Cells are the basic unit of life. '
+    'Thank you for watching. Thank you for watching! Thank you for watching. '
+    'Every cell has a membrane. The nucleus of the cell stores DNA. '
+    'Mitosis divides the nucleus of the cell. I had pizza yesterday.'
+)
+
+class CompressionTests(SimpleTestCase):
+    '''Tests for quiz_app.api.compression.'''
+
+    def test_ratio_one_removes_fillers_and_repeats(self):
+        '''Only noise is removed; all distinct sentences stay.'''
+
+        out = compress_transcript(TRANSCRIPT, ratio=1.0)
+        self.assertEqual(out.count('Thank you for watching'), 1)
+        self.assertNotIn('Uh,', out)
+        self.assertIn('I had pizza yesterday.', out)
+
+    def test_lower_ratio_keeps_central_sentences_in_order(self):
+        '''Off-topic sentences are dropped first and order is preserved.'''
+
+        out = compress_transcript(TRANSCRIPT, ratio=0.5)
+        self.assertLessEqual(len(out.split()), 0.5 * len(TRANSCRIPT.split()))
+        self.assertNotIn('pizza', out)
+        self.assertIn('The nucleus of the cell stores DNA.', out)
+        self.assertLess(out.index('nucleus of the cell stores'), out.index('Mitosis'))
+
+    def test_scores_prefer_topical_sentences(self):
+        '''Sentences sharing the dominant terms score higher.'''
+
+        scores = sentence_scores(['The cell nucleus.', 'The cell membrane.', 'Pizza is tasty.'])
+        self.assertLess(scores[2], min(scores[0], scores[1]))
+
+    def test_ratio_zero_disables(self):
+        '''A ratio of 0 returns the transcript unchanged.'''
+
+        self.assertEqual(compress_transcript(TRANSCRIPT, ratio=0), TRANSCRIPT)
+
+    def test_unpunctuated_text_is_windowed(self):
+        '''Caption text without sentence ends can still be reduced.'''
+
+        text = ' '.join(f"word{i % 50}" for i in range(600))
+        self.assertLessEqual(len(compress_transcript(text, ratio=0.5).split()), 300)
+
+    def test_benchmark_command(self):
+        '''The benchmark prints one line per ratio plus the baseline.'''
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp, 'transcript.txt')
+            path.write_text(TRANSCRIPT * 20, encoding='utf-8')
+            out = StringIO()
+            call_command('benchmark_compression', '--file', str(path), '--ratio', '1', '0.5', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('Baseline prompt:'))
+        self.assertEqual(len(lines), 4)
+        self.assertIn('reduction=', lines[-1])
+
+    @override_settings(QUIZ_COMPRESSION_RATIO=1.0)
+    @patch('quiz_app.api.services.get_or_generate_quiz', side_effect=ValueError('stop'))
+    @patch('quiz_app.api.services.get_cached_transcript', return_value=TRANSCRIPT)
+    def test_pipeline_uses_compressed_transcript(self, mock_cache, mock_generate):
+        '''The LLM receives the compressed transcript.'''
+
+        with self.assertRaisesMessage(ValueError, 'stop'):
+            services.create_quiz_from_youtube('https://youtu.be/AAAAAAAAAAA', owner=None)
+        self.assertEqual(mock_generate.call_args.args[0].count('Thank you for watching'), 1)
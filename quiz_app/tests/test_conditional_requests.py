@@ -0,0 +1,149 @@
+'''API tests for ETag / Last-Modified conditional requests on quizzes.
+
+Covers:
+- GET list/detail send an ETag; the detail also Last-Modified.
+- The list ignores If-Modified-Since, so deleting an older quiz is never
+  answered with 304 (regression).
+- If-None-Match answers 304 after a single query; If-Modified-Since likewise.
+- Changes to the quiz or its questions (including deletes) change the ETag.
+- Different representations (?fields=, ?view=) get different ETags.
+- PUT/PATCH with a stale If-Match answer 412, a current one succeeds and
+  returns the new ETag.
+
+Notes:
+- The response cache is disabled here so the validator queries are exercised
+  (cached responses are covered in test_response_cache).
+- Uses GET/PATCH/PUT /api/quizzes/<id>/ and GET /api/quizzes/.
+'''
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.models import Question, Quiz
+
+@override_settings(QUIZ_RESPONSE_CACHE_TTL_SEC=0)
+class ConditionalRequestTests(APITestCase):
+    '''Tests for ETag/Last-Modified validators and preconditions.'''
+
+    def setUp(self):
+        '''Create a quiz with two questions for u1.'''
+
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        self.quiz = Quiz.objects.create(owner=self.user, title='QZ', description='d',
+                                        video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+        self.questions = [
+            Question.objects.create(quiz=self.quiz, question_title=f'Q{i}',
+                                    question_options=['A', 'B', 'C', 'D'], answer='A')
+            for i in range(2)
+        ]
+        self.list_url = reverse('api-quizzes')
+        self.detail_url = reverse('api-quiz-detail', kwargs={'id': self.quiz.id})
+        self.client.force_authenticate(self.user)
+
+    def test_detail_304(self):
+        '''A matching If-None-Match answers 304 with one aggregate query.'''
+
+        resp = self.client.get(self.detail_url)
+        etag = resp['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('Last-Modified', resp)
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp['ETag'], etag)
+
+    def test_if_modified_since(self):
+        '''If-Modified-Since equal to Last-Modified answers 304.'''
+
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        resp = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_question_changes_change_etag(self):
+        '''Editing or deleting a question invalidates the ETag.'''
+
+        etag = self.client.get(self.detail_url)['ETag']
+        self.questions[0].question_title = 'changed'
+        self.questions[0].save()
+        resp = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        etag = resp['ETag']
+        self.questions[1].delete()
+        resp = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data['questions']), 1)
+
+    def test_representations_differ(self):
+        '''Sparse and summary representations have their own ETags.'''
+
+        full = self.client.get(self.detail_url)['ETag']
+        sparse = self.client.get(self.detail_url, {'fields': 'id'})['ETag']
+        self.assertNotEqual(full, sparse)
+        listed = self.client.get(self.list_url)['ETag']
+        summary = self.client.get(self.list_url, {'view': 'summary'})['ETag']
+        self.assertNotEqual(listed, summary)
+
+    def test_list_304_and_invalidation(self):
+        '''The library ETag changes when a quiz is added.'''
+
+        etag = self.client.get(self.list_url)['ETag']
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        Quiz.objects.create(owner=self.user, title='QZ2', description='d',
+                            video_url='https://www.youtube.com/watch?v=BBBBBBBBBBB')
+        resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data), 2)
+
+    def test_if_match_on_patch(self):
+        '''A stale If-Match answers 412 and leaves the quiz unchanged.'''
+
+        etag = self.client.get(self.detail_url)['ETag']
+        resp = self.client.patch(self.detail_url, {'title': 'First'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        new_etag = resp['ETag']
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(self.client.get(self.detail_url)['ETag'], new_etag)
+
+        resp = self.client.patch(self.detail_url, {'title': 'Second'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.title, 'First')
+
+    def test_if_match_on_put(self):
+        '''PUT honors If-Match as well.'''
+
+        payload = {'title': 'T', 'description': 'D', 'video_url': 'https://youtu.be/AAAAAAAAAAA'}
+        resp = self.client.put(self.detail_url, payload, format='json', HTTP_IF_MATCH='"stale"')
+        self.assertEqual(resp.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        etag = self.client.get(self.detail_url)['ETag']
+        resp = self.client.put(self.detail_url, payload, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_not_owner_gets_403(self):
+        '''Validators are not leaked to other users.'''
+
+        other = User.objects.create_user(username='u2', password='Abc123', email='u2@x.com')
+        self.client.force_authenticate(other)
+        resp = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_has_no_last_modified(self):
+        '''Deleting an older quiz is visible to If-Modified-Since clients.'''
+
+        newer = Quiz.objects.create(owner=self.user, title='Newer', description='d',
+                                    video_url='https://www.youtube.com/watch?v=BBBBBBBBBBB')
+        resp = self.client.get(self.list_url)
+        self.assertNotIn('Last-Modified', resp)
+        # Newest timestamp in the library; unchanged by the delete below.
+        since = http_date(newer.updated_at.timestamp())
+        self.client.delete(self.detail_url)
+        resp = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in resp.data], [newer.id])
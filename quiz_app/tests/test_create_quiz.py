@@ -1,8 +1,9 @@
 '''API tests for creating a quiz from a YouTube URL.
 
 Covers:
-- Happy path: POST /api/createQuiz/ returns 201 and the serialized quiz,
-  with nested questions. The expensive pipeline is mocked.
+- Happy path (QUIZ_ASYNC_JOBS=False): POST /api/createQuiz/ returns 201 and the
+  serialized quiz, with nested questions. The expensive pipeline is mocked.
+- Async mode (default): returns 202 with a pending job id and status URL.
 - Validation: Missing 'url' in request body -> 400 Bad Request.
 
 Notes:
@@ -12,11 +13,12 @@ Notes:
 '''
 
 from django.contrib.auth.models import User
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from unittest.mock import patch
-from quiz_app.models import Quiz, Question
+from quiz_app.models import Quiz, Question, QuizJob
 
 class CreateQuizTests(APITestCase):
     '''Tests for POST /api/createQuiz/.'''
@@ -28,6 +30,7 @@ class CreateQuizTests(APITestCase):
         self.client.force_authenticate(self.user)
         self.url = reverse('api-create-quiz')
 
+    @override_settings(QUIZ_ASYNC_JOBS=False)
     @patch('quiz_app.api.views.create_quiz_from_youtube')
     def test_create_quiz_success(self, mock_create):
         '''Successful creation returns 201 and includes nested questions.'''
@@ -44,6 +47,27 @@ class CreateQuizTests(APITestCase):
         self.assertEqual(resp.data['video_url'], 'https://www.youtube.com/watch?v=AAAAAAAAAAA')
         self.assertEqual(len(resp.data['questions']), 1)
 
+    @override_settings(QUIZ_ASYNC_JOBS=True)
+    @patch('quiz_app.api.views.create_quiz_from_youtube')
+    def test_create_quiz_async_returns_job(self, mock_create):
+        '''Async mode queues a job and answers 202 without running the pipeline.'''
+
+        resp = self.client.post(self.url, {'url': 'https://youtu.be/AAAAAAAAAAA'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        mock_create.assert_not_called()
+        job = QuizJob.objects.get(pk=resp.data['id'])
+        self.assertEqual(job.status, QuizJob.PENDING)
+        self.assertEqual(job.url, 'https://www.youtube.com/watch?v=AAAAAAAAAAA')
+        self.assertTrue(resp.data['status_url'].endswith(reverse('api-job-detail', kwargs={'id': job.id})))
+
+    @override_settings(QUIZ_ASYNC_JOBS=True)
+    def test_create_quiz_async_invalid_url(self):
+        '''Unsupported URLs are rejected before a job is queued.'''
+
+        resp = self.client.post(self.url, {'url': 'https://example.com/video'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(QuizJob.objects.exists())
+
     def test_create_quiz_missing_url(self):
         '''Missing 'url' in payload should yield 400 Bad Request.'''
 
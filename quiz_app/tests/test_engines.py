@@ -0,0 +1,93 @@
+'''Tests for the pluggable transcription engines.
+
+Covers:
+- get_engine picks the engine from TRANSCRIPTION_ENGINE; unknown names fail.
+- TranscriptionEngine is abstract: engines without load_audio/transcribe
+  cannot be instantiated.
+- transcribe_audio delegates to the configured engine (fake engine) and
+  passes the language through.
+- Whisper transcripts keep the plain model name as cache source; other
+  engines are namespaced.
+- A missing faster-whisper package surfaces as a clear ValueError.
+- The benchmark command compares engines on the same audio.
+
+Notes:
+- Only the fake engine runs real code paths; whisper models are not loaded.
+'''
+
+import pathlib, tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import numpy as np
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import engines, services
+
+class EngineTests(SimpleTestCase):
+    '''Tests for quiz_app.api.engines.'''
+
+    @override_settings(TRANSCRIPTION_ENGINE='fake', WHISPER_MODEL='tiny')
+    def test_engine_selected_by_setting(self):
+        '''The setting decides which engine is used.'''
+
+        engine = engines.get_engine()
+        self.assertIsInstance(engine, engines.FakeEngine)
+        self.assertEqual(engine.source, 'fake:tiny')
+
+    def test_unknown_engine(self):
+        '''Unknown engine names are rejected.'''
+
+        with self.assertRaisesMessage(ValueError, "Unknown transcription engine 'nope'."):
+            engines.get_engine('nope')
+
+    def test_engine_interface_is_abstract(self):
+        '''Incomplete engines fail at construction, not at the first transcription.'''
+
+        class Incomplete(engines.TranscriptionEngine):
+            name = 'incomplete'
+
+            def load_audio(self, path: str):
+                return np.zeros(1, dtype=np.float32)
+
+        with self.assertRaises(TypeError):
+            engines.TranscriptionEngine('small')
+        with self.assertRaisesRegex(TypeError, 'transcribe'):
+            Incomplete('small')
+
+    def test_cache_sources(self):
+        '''Whisper keeps the legacy cache key; faster-whisper includes its compute type.'''
+
+        self.assertEqual(engines.WhisperEngine('small').source, 'small')
+        self.assertEqual(engines.FasterWhisperEngine('small').source, 'faster-whisper:small:int8')
+
+    @override_settings(TRANSCRIPTION_ENGINE='fake', WHISPER_CHUNK_SEC=0)
+    def test_transcribe_audio_uses_engine(self):
+        '''transcribe_audio returns the engine's text for in-memory audio.'''
+
+        audio = np.zeros(engines.SAMPLE_RATE * 3, dtype=np.float32)
+        with patch.object(engines.FakeEngine, 'transcribe', wraps=engines.FakeEngine('x').transcribe) as spy:
+            result = services.transcribe_audio(audio, language='de')
+        self.assertEqual(result, engines.TranscriptionResult('Fake transcript of 3.0 seconds of audio.', 'de'))
+        self.assertEqual(spy.call_args.kwargs['language'], 'de')
+
+    def test_missing_faster_whisper(self):
+        '''Without the package the engine explains what to install.'''
+
+        with patch.dict('sys.modules', {'faster_whisper': None}):
+            with self.assertRaisesMessage(ValueError, 'faster-whisper is not installed'):
+                engines.FasterWhisperEngine('tiny', compute_type='int8-test').transcribe(np.zeros(10))
+
+    def test_benchmark_command(self):
+        '''The benchmark prints one result line per engine.'''
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp, 'audio.raw')
+            path.write_bytes(b'\0' * engines.SAMPLE_RATE * 2)
+            out = StringIO()
+            call_command('benchmark_transcription', str(path), '--engine', 'fake', '--model', 'tiny', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], 'Audio: 2.0 s')
+        self.assertIn('fake:tiny', lines[1])
+        self.assertIn('similarity=1.000', lines[1])
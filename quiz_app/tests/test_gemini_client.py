@@ -0,0 +1,58 @@
+'''Tests for the shared Gemini client.
+
+Covers:
+- The client is created once per process and reused across calls.
+- Changing the backend/key settings builds a new client.
+- A missing GEMINI_API_KEY raises ValueError for the google backend.
+- generate_quiz_with_gemini runs end to end against the fake backend.
+'''
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import llm
+from quiz_app.api.services import generate_quiz_with_gemini
+
+class GeminiClientTests(SimpleTestCase):
+    '''Tests for quiz_app.api.llm.'''
+
+    def setUp(self):
+        '''Start every test without a cached client.'''
+
+        llm.reset_gemini_client()
+        self.addCleanup(llm.reset_gemini_client)
+
+    @override_settings(GEMINI_BACKEND='google', GEMINI_API_KEY='key', GEMINI_TIMEOUT_SEC=30)
+    def test_client_is_reused(self):
+        '''Only one genai.Client is constructed for repeated calls.'''
+
+        with patch('google.genai.Client') as mock_client:
+            first = llm.get_gemini_client()
+            second = llm.get_gemini_client()
+        self.assertIs(first, second)
+        mock_client.assert_called_once()
+        self.assertEqual(mock_client.call_args.kwargs['http_options'].timeout, 30000)
+
+    def test_settings_change_rebuilds_client(self):
+        '''A different backend yields a different client.'''
+
+        with override_settings(GEMINI_BACKEND='fake'):
+            fake = llm.get_gemini_client()
+        with override_settings(GEMINI_BACKEND='google', GEMINI_API_KEY='key'), patch('google.genai.Client'):
+            self.assertIsNot(llm.get_gemini_client(), fake)
+
+    @override_settings(GEMINI_BACKEND='google', GEMINI_API_KEY='')
+    def test_missing_key(self):
+        '''The google backend needs an API key.'''
+
+        with self.assertRaisesMessage(ValueError, 'GEMINI_API_KEY is not configured.'):
+            llm.get_gemini_client()
+
+    @override_settings(GEMINI_BACKEND='fake')
+    def test_fake_backend_generates_valid_quiz(self):
+        '''The fake backend returns a quiz that passes validation.'''
+
+        quiz = generate_quiz_with_gemini('some transcript', num_questions=3)
+        self.assertEqual(len(quiz['questions']), 3)
+        self.assertEqual(len(llm.get_gemini_client().calls), 1)
@@ -0,0 +1,48 @@
+'''Import-time budget for web worker startup.
+
+Covers:
+- Importing the WSGI application and URLconf does not import the heavy
+  pipeline dependencies (torch, whisper, yt_dlp, numpy, google.genai, tiktoken).
+- The total import time stays below QUIZ_IMPORT_BUDGET_MS (default 1500 ms).
+
+Notes:
+- Runs a fresh interpreter with `-X importtime` and sums the per-module "self"
+  times it reports, so the measurement is not skewed by modules the test run
+  has already imported.
+'''
+
+import os, subprocess, sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+HEAVY_MODULES = ('torch', 'whisper', 'yt_dlp', 'numpy', 'google.genai', 'tiktoken')
+
+def measure_imports(code: str) -> tuple[float, set]:
+    '''Run `code` with -X importtime and return (total ms, imported module names).'''
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='quizly_core.settings', DEBUG='true')
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    total_us, names = 0, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        names.add(name.strip())
+    return total_us / 1000, names
+
+class ImportTimeTests(SimpleTestCase):
+    '''Startup budget for quizly_core.wsgi.'''
+
+    def test_wsgi_startup_budget(self):
+        '''Web startup skips heavy dependencies and stays within budget.'''
+
+        total_ms, names = measure_imports('import quizly_core.wsgi, quizly_core.urls')
+        heavy = sorted(n for n in names if any(n == m or n.startswith(m + '.') for m in HEAVY_MODULES))
+        self.assertEqual(heavy, [], 'Heavy modules imported at web startup.')
+        budget = float(os.environ.get('QUIZ_IMPORT_BUDGET_MS', 1500))
+        self.assertLess(total_ms, budget, f"Startup imports took {total_ms:.0f} ms (budget {budget:.0f} ms).")
@@ -0,0 +1,154 @@
+'''Tests for passing a known language to the transcription engine.
+
+Covers:
+- Code normalization ('de-DE' -> 'de') and rejection of invalid codes.
+- Resolution order: request language, yt-dlp metadata, cached channel language.
+- Detected languages are remembered per channel and reused for its next video.
+- Chunked transcription detects the language once and passes it to every chunk.
+- Whisper falls back to detection for codes it does not support.
+- POST /api/createQuiz/ validates the optional language and stores it on the job.
+
+Notes:
+- The fake transcription engine and patched downloads are used throughout.
+- Single-flight lock files go to a temporary QUIZ_TMP_DIR, not the repository's tmp/.
+'''
+
+import pathlib, tempfile
+from unittest.mock import patch
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api import engines, services, whisper_models
+from quiz_app.api.engines import FakeEngine, TranscriptionResult
+from quiz_app.api.languages import normalize_language, remember_language, resolve_language
+from quiz_app.api.whisper_models import ModelRegistry
+from quiz_app.models import ChannelLanguage, QuizJob, Transcript
+
+QUIZ_DICT = {
+    'title': 'T', 'description': 'D',
+    'questions': [{'question_title': 'Q1', 'question_options': ['A', 'B', 'C', 'D'], 'answer': 'A'}],
+}
+
+class LanguageResolutionTests(TestCase):
+    '''Tests for quiz_app.api.languages.'''
+
+    def test_normalize(self):
+        '''Region subtags are dropped; non-codes are rejected.'''
+
+        self.assertEqual(normalize_language('de-DE'), 'de')
+        self.assertEqual(normalize_language('EN_us'), 'en')
+        self.assertEqual(normalize_language('haw'), 'haw')
+        self.assertIsNone(normalize_language('german!'))
+        self.assertIsNone(normalize_language(None))
+
+    def test_resolution_order(self):
+        '''Request beats metadata, metadata beats the channel cache.'''
+
+        ChannelLanguage.objects.create(channel_id='UC1', language='fr')
+        info = {'channel_id': 'UC1', 'language': 'de'}
+        self.assertEqual(resolve_language(info, preferred='it'), 'it')
+        self.assertEqual(resolve_language(info), 'de')
+        self.assertEqual(resolve_language({'channel_id': 'UC1'}), 'fr')
+        self.assertEqual(ChannelLanguage.objects.get(channel_id='UC1').hits, 1)
+        self.assertIsNone(resolve_language({'channel_id': 'UC2'}))
+
+    def test_remember_language(self):
+        '''The last language of a channel is stored (and updated).'''
+
+        remember_language({'channel_id': 'UC1'}, 'en')
+        remember_language({'channel_id': 'UC1'}, 'de')
+        remember_language({}, 'de')
+        self.assertEqual(list(ChannelLanguage.objects.values_list('channel_id', 'language')), [('UC1', 'de')])
+
+@override_settings(TRANSCRIPTION_ENGINE='fake', WHISPER_MODEL_POLICY='', QUIZ_USE_CAPTIONS=False, QUIZ_COMPRESSION_RATIO=0)
+class PipelineLanguageTests(TestCase):
+    '''Tests for the language passed inside create_quiz_from_youtube.'''
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(QUIZ_TMP_DIR=pathlib.Path(tmp.name))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    @patch('quiz_app.api.services.get_or_generate_quiz', return_value=QUIZ_DICT)
+    @patch('quiz_app.api.services._transcribe_video', return_value=TranscriptionResult('text', 'fr'))
+    @patch('quiz_app.api.services.ensure_video_available', return_value={'channel_id': 'UC9', 'duration': 60})
+    def test_detected_language_reused_for_channel(self, mock_available, mock_transcribe, mock_generate):
+        '''The first video detects, the next video of the channel passes the language.'''
+
+        create_quiz = services.create_quiz_from_youtube
+        create_quiz('https://youtu.be/AAAAAAAAAAA', owner=self.user, num_questions=1)
+        self.assertIsNone(mock_transcribe.call_args.kwargs['language'])
+        self.assertEqual(ChannelLanguage.objects.get(channel_id='UC9').language, 'fr')
+
+        create_quiz('https://youtu.be/BBBBBBBBBBB', owner=self.user, num_questions=1)
+        self.assertEqual(mock_transcribe.call_args.kwargs['language'], 'fr')
+
+        create_quiz('https://youtu.be/CCCCCCCCCCC', owner=self.user, num_questions=1, language='de')
+        self.assertEqual(mock_transcribe.call_args.kwargs['language'], 'de')
+        self.assertEqual(Transcript.objects.count(), 3)
+
+class EngineLanguageTests(SimpleTestCase):
+    '''Tests for language handling in transcribe_audio and WhisperEngine.'''
+
+    @override_settings(TRANSCRIPTION_ENGINE='fake', WHISPER_CHUNK_SEC=10, WHISPER_WORKERS=1)
+    def test_chunks_share_one_detection(self):
+        '''Long audio is detected once and every chunk gets that language.'''
+
+        audio = np.zeros(engines.SAMPLE_RATE * 35, dtype=np.float32)
+        languages = []
+        original = FakeEngine.transcribe
+        def spy(self, chunk, language=None):
+            languages.append(language)
+            return original(self, chunk, language=language)
+        with patch.object(FakeEngine, 'detect_language', return_value='nl') as detect, \
+             patch.object(FakeEngine, 'transcribe', spy):
+            result = services.transcribe_audio(audio)
+        detect.assert_called_once()
+        self.assertEqual(result.language, 'nl')
+        self.assertGreater(len(languages), 1)
+        self.assertEqual(set(languages), {'nl'})
+
+    def test_whisper_ignores_unsupported_language(self):
+        '''Unknown codes are not passed to whisper (it would raise).'''
+
+        seen = []
+        class FakeModel:
+            def transcribe(self, audio, language=None):
+                seen.append(language)
+                return {'text': 'x', 'language': 'en'}
+        with patch.object(whisper_models, 'registry', ModelRegistry(loader=lambda key: FakeModel())):
+            engines.WhisperEngine('small').transcribe(np.zeros(10), language='de')
+            engines.WhisperEngine('small').transcribe(np.zeros(10), language='qq')
+        self.assertEqual(seen, ['de', None])
+
+@override_settings(QUIZ_ASYNC_JOBS=True)
+class CreateQuizLanguageTests(APITestCase):
+    '''Tests for the optional 'language' field of POST /api/createQuiz/.'''
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('api-create-quiz')
+
+    def test_language_stored_on_job(self):
+        '''A valid language is normalized and queued with the job.'''
+
+        resp = self.client.post(self.url, {'url': 'https://youtu.be/AAAAAAAAAAA', 'language': 'de-DE'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(QuizJob.objects.get(pk=resp.data['id']).language, 'de')
+
+    def test_invalid_language(self):
+        '''Invalid codes are rejected with 400.'''
+
+        resp = self.client.post(self.url, {'url': 'https://youtu.be/AAAAAAAAAAA', 'language': 'german!'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data['detail'], 'Invalid language code.')
+        self.assertFalse(QuizJob.objects.exists())
@@ -0,0 +1,161 @@
+'''Tests for token-budgeted map-reduce quiz generation.
+
+Covers:
+- split_transcript keeps sections within the budget, splits on sentences and
+  also handles unpunctuated text; short transcripts stay in one section.
+- count_tokens falls back to a character estimate without a tiktoken encoding.
+- Transcripts over QUIZ_TRANSCRIPT_TOKEN_BUDGET are generated per section on
+  a thread pool, concurrently and bounded by QUIZ_SECTION_CONCURRENCY, and
+  merged into exactly num_questions questions in transcript order.
+- The shared client keeps working across quizzes: its async pool, which is
+  bound to one event loop, is not used (regression: the second long
+  transcript failed with 'Event loop is closed').
+
+Notes:
+- Uses the fake Gemini backend; tiktoken may fall back to the estimate offline.
+'''
+
+import asyncio, hashlib, json, threading, time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import llm, services, tokens
+
+SENTENCE = 'The mitochondria is the powerhouse of the cell and produces energy.'
+
+class SplitTranscriptTests(SimpleTestCase):
+    '''Tests for quiz_app.api.tokens.'''
+
+    def test_sections_respect_budget(self):
+        '''Every section fits the budget and no text is lost.'''
+
+        text = ' '.join([SENTENCE] * 50)
+        sections = tokens.split_transcript(text, budget=100)
+        self.assertGreater(len(sections), 1)
+        self.assertTrue(all(tokens.count_tokens(s) <= 100 for s in sections))
+        self.assertTrue(all(s.endswith('.') for s in sections))
+        self.assertEqual(' '.join(sections), text)
+
+    def test_unpunctuated_text_is_split_by_words(self):
+        '''Caption-style text without sentence ends is still split.'''
+
+        text = ' '.join(['word'] * 2000)
+        sections = tokens.split_transcript(text, budget=100)
+        self.assertGreater(len(sections), 1)
+        self.assertEqual(' '.join(sections).split(), text.split())
+
+    def test_short_transcript_single_section(self):
+        '''Text within the budget is returned unchanged.'''
+
+        self.assertEqual(tokens.split_transcript(SENTENCE, budget=1000), [SENTENCE])
+
+    def test_count_tokens_fallback(self):
+        '''Without an encoding, ~4 characters count as one token.'''
+
+        with patch.object(tokens, '_encoding', return_value=None):
+            self.assertEqual(tokens.count_tokens('x' * 40), 10)
+
+@override_settings(GEMINI_BACKEND='fake', QUIZ_TRANSCRIPT_TOKEN_BUDGET=100, QUIZ_SECTION_CONCURRENCY=4)
+class MapReduceGenerationTests(SimpleTestCase):
+    '''Tests for generate_quiz_with_gemini on long transcripts.'''
+
+    def setUp(self):
+        '''Start every test with a fresh fake client.'''
+
+        llm.reset_gemini_client()
+        self.addCleanup(llm.reset_gemini_client)
+        self.transcript = ' '.join(f"Part {i}. " + ' '.join([SENTENCE] * 4) for i in range(4))
+
+    def test_sections_are_merged(self):
+        '''One request per section; exactly num_questions in section order.'''
+
+        client = llm.get_gemini_client()
+        sections = tokens.split_transcript(self.transcript, 100)
+        quiz = services.generate_quiz_with_gemini(self.transcript, num_questions=5)
+        self.assertEqual(len(client.calls), len(sections))
+        self.assertEqual(len(quiz['questions']), 5)
+        # The fake client tags question titles with a hash of their prompt.
+        tags = [hashlib.sha1(c['contents'].encode('utf-8')).hexdigest()[:6] for c in client.calls]
+        prompts = [next(i for i, s in enumerate(sections) if s in c['contents']) for c in client.calls]
+        order = [prompts[tags.index(q['question_title'].split('(')[1][:6])] for q in quiz['questions']]
+        self.assertEqual(order, sorted(order))
+        self.assertGreater(len(set(order)), 1)
+
+    def test_sections_run_concurrently(self):
+        '''Wall time is about one section; in-flight requests stay bounded.'''
+
+        client = llm.get_gemini_client()
+        state = {'active': 0, 'peak': 0}
+        lock = threading.Lock()
+        original = client.models.generate_content
+
+        def slow(model, contents, config=None):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.2)
+            with lock:
+                state['active'] -= 1
+            return original(model=model, contents=contents, config=config)
+
+        transcript = ' '.join([self.transcript] * 2)
+        n_sections = len(tokens.split_transcript(transcript, 100))
+        self.assertGreater(n_sections, 4)
+        with patch.object(client.models, 'generate_content', slow):
+            start = time.perf_counter()
+            services.generate_quiz_with_gemini(transcript, num_questions=5)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(state['peak'], 4)
+        self.assertLess(elapsed, 0.2 * n_sections)
+
+class LoopBoundClient:
+    '''Stand-in for `genai.Client` backed by real httpx clients.
+
+    The sync API goes through an `httpx.Client`; the async API goes through one
+    shared `httpx.AsyncClient` and, like google-genai's, only works on the
+    event loop it was first used on.
+    '''
+
+    def __init__(self):
+        fake = llm.FakeGeminiClient()
+
+        def handler(request):
+            return httpx.Response(200, text=fake.models.generate_content(
+                model='m', contents=json.loads(request.content)['prompt']).text)
+
+        self.http = httpx.Client(transport=httpx.MockTransport(handler), base_url='http://llm')
+        self.ahttp = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url='http://llm')
+        self.loop = None
+        self.models = SimpleNamespace(generate_content=self._generate)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self._agenerate))
+
+    def _generate(self, model, contents, config=None):
+        return SimpleNamespace(text=self.http.post('/generate', json={'prompt': contents}).text)
+
+    async def _agenerate(self, model, contents, config=None):
+        loop = asyncio.get_running_loop()
+        self.loop = self.loop or loop
+        if loop is not self.loop:
+            raise RuntimeError('Event loop is closed')
+        resp = await self.ahttp.post('/generate', json={'prompt': contents})
+        return SimpleNamespace(text=resp.text)
+
+@override_settings(QUIZ_TRANSCRIPT_TOKEN_BUDGET=100, QUIZ_SECTION_CONCURRENCY=4)
+class SharedClientTests(SimpleTestCase):
+    '''The process-wide client must survive several long-transcript quizzes.'''
+
+    def test_map_reduce_twice_on_one_client(self):
+        '''Two quizzes in a row on the same client both succeed.'''
+
+        client = LoopBoundClient()
+        self.addCleanup(client.http.close)
+        transcript = ' '.join(f"Part {i}. " + ' '.join([SENTENCE] * 4) for i in range(4))
+        sections = tokens.split_transcript(transcript, 100)
+        self.assertGreater(len(sections), 1)
+        with patch.object(services, 'get_gemini_client', return_value=client):
+            for _ in range(2):
+                quiz = services.generate_quiz_with_gemini(transcript, num_questions=5)
+                self.assertEqual(len(quiz['questions']), 5)
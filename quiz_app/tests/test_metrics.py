@@ -0,0 +1,100 @@
+'''Tests for pipeline metrics and the metrics endpoint.
+
+Covers:
+- timed_stage records duration and success/failure per stage.
+- GET /api/metrics/: 401 unauthenticated, 403 for non-staff, 200 with
+  Prometheus text for staff users.
+- A job run by a worker shows up on the worker's own exporter
+  (start_metrics_server / process_quiz_jobs --metrics-port).
+'''
+
+import urllib.request
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api.jobs import claim_next_job, enqueue_quiz_job, run_job
+from quiz_app.api.metrics import (Histogram, jobs_finished, render_prometheus, stage_seconds, stage_total,
+                                  start_metrics_server, timed_stage)
+from quiz_app.models import Quiz
+
+class MetricsTests(APITestCase):
+    '''Tests for quiz_app.api.metrics and MetricsView.'''
+
+    def setUp(self):
+        '''Create a staff and a regular user.'''
+
+        self.url = reverse('api-metrics')
+        self.staff = User.objects.create_user(username='admin', password='Abc123', email='a@x.com', is_staff=True)
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+
+    def test_timed_stage_records_outcome(self):
+        '''Successful and failing calls are counted separately.'''
+
+        @timed_stage('unit_test_stage')
+        def work(fail=False):
+            if fail:
+                raise ValueError('x')
+
+        before = stage_seconds.count(stage='unit_test_stage')
+        work()
+        with self.assertRaises(ValueError):
+            work(fail=True)
+        self.assertEqual(stage_seconds.count(stage='unit_test_stage'), before + 2)
+        self.assertGreaterEqual(stage_total.value(stage='unit_test_stage', outcome='failure'), 1)
+        self.assertIn('quiz_stage_total{outcome="success",stage="unit_test_stage"}', render_prometheus())
+
+    def test_histogram_buckets_are_cumulative(self):
+        '''Bucket counts include all smaller observations.'''
+
+        h = Histogram('h', 'help', buckets=(1, 5))
+        for v in (0.5, 2, 10):
+            h.observe(v)
+        self.assertEqual([s[2] for s in h.samples()], [1, 2, 3, 12.5, 3])
+
+    def test_endpoint_permissions_and_format(self):
+        '''Only staff users can read the metrics.'''
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(self.staff)
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp['Content-Type'].startswith('text/plain'))
+        self.assertIn('# TYPE quiz_stage_duration_seconds histogram', resp.content.decode())
+
+    @patch('quiz_app.api.jobs.create_quiz_from_youtube')
+    def test_worker_exporter_reports_job(self, mock_create):
+        '''Stage and job counters recorded by run_job are served by the exporter.'''
+
+        def fake_pipeline(url, owner, num_questions, progress, language=None):
+            with timed_stage('worker_export_stage'):
+                return Quiz.objects.create(owner=owner, title='T', description='D',
+                                           video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+        mock_create.side_effect = fake_pipeline
+        before = jobs_finished.value(status='succeeded')
+        enqueue_quiz_job('https://youtu.be/AAAAAAAAAAA', owner=self.user)
+
+        server = start_metrics_server(0, '127.0.0.1')
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        run_job(claim_next_job())
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as resp:
+            self.assertTrue(resp.headers['Content-Type'].startswith('text/plain'))
+            body = resp.read().decode()
+
+        self.assertIn('quiz_stage_total{outcome="success",stage="worker_export_stage"} 1', body)
+        self.assertIn(f'quiz_jobs_total{{status="succeeded"}} {before + 1}', body)
+
+    def test_worker_command_metrics_port(self):
+        '''process_quiz_jobs starts the exporter when asked to.'''
+
+        out = StringIO()
+        call_command('process_quiz_jobs', '--once', '--metrics-port', '0', '--metrics-addr', '127.0.0.1', stdout=out)
+        self.assertRegex(out.getvalue(), r'Serving metrics on port [1-9][0-9]*\.')
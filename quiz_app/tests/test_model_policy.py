@@ -0,0 +1,128 @@
+'''Tests for duration- and queue-aware Whisper model selection.
+
+Covers:
+- Policy parsing ('<max seconds>:<model>' tiers, '*' catch-all); a malformed
+  policy is ImproperlyConfigured and fails the quiz_app.E001 system check.
+- Tier choice by duration; unknown durations use the most accurate tier.
+- Each WHISPER_QUEUE_DOWNGRADE_DEPTH pending jobs step down one tier.
+- The pipeline transcribes with the chosen model, records it with the
+  transcript and reuses transcripts of any tier.
+
+Notes:
+- Download/transcription and Gemini are patched in 'quiz_app.api.services'.
+- Single-flight lock files go to a temporary QUIZ_TMP_DIR, not the repository's tmp/.
+'''
+
+import pathlib, tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from quiz_app.api.engines import TranscriptionResult
+from quiz_app.api.model_policy import candidate_models, choose_model, parse_policy, queue_depth
+from quiz_app.api.services import create_quiz_from_youtube
+from quiz_app.checks import check_model_policy
+from quiz_app.models import QuizJob, Transcript
+
+POLICY = '900:small,3600:base,*:tiny'
+QUIZ_DICT = {
+    'title': 'T', 'description': 'D',
+    'questions': [{'question_title': 'Q1', 'question_options': ['A', 'B', 'C', 'D'], 'answer': 'A'}],
+}
+
+@override_settings(WHISPER_MODEL_POLICY=POLICY, WHISPER_QUEUE_DOWNGRADE_DEPTH=5)
+class ChooseModelTests(SimpleTestCase):
+    '''Tests for quiz_app.api.model_policy without the database.'''
+
+    def test_parse_policy(self):
+        '''Tiers are parsed in order; malformed tiers are rejected.'''
+
+        self.assertEqual(parse_policy(POLICY), [(900.0, 'small'), (3600.0, 'base'), (None, 'tiny')])
+        self.assertEqual(parse_policy(''), [])
+        with self.assertRaisesMessage(ImproperlyConfigured, "Invalid WHISPER_MODEL_POLICY tier 'small'."):
+            parse_policy('small')
+        with self.assertRaisesMessage(ImproperlyConfigured, "Invalid WHISPER_MODEL_POLICY limit in tier '15min:base'."):
+            parse_policy('15min:base')
+
+    def test_system_check(self):
+        '''A malformed policy is reported by the system check framework.'''
+
+        self.assertEqual(check_model_policy(), [])
+        with override_settings(WHISPER_MODEL_POLICY='900:small,tiny'):
+            errors = check_model_policy()
+        self.assertEqual([e.id for e in errors], ['quiz_app.E001'])
+
+    @override_settings(WHISPER_MODEL_POLICY='900:small,tiny')
+    def test_pipeline_misconfiguration_is_not_a_client_error(self):
+        '''The pipeline raises ImproperlyConfigured, which the view maps to 500, not 400.'''
+
+        with self.assertRaises(ImproperlyConfigured) as ctx:
+            create_quiz_from_youtube('https://youtu.be/AAAAAAAAAAA', owner=None)
+        self.assertNotIsInstance(ctx.exception, ValueError)
+
+    def test_duration_tiers(self):
+        '''Short clips get the accurate model, long videos the fast one.'''
+
+        self.assertEqual(choose_model(180, depth=0).model_name, 'small')
+        self.assertEqual(choose_model(900, depth=0).model_name, 'small')
+        self.assertEqual(choose_model(1200, depth=0).model_name, 'base')
+        self.assertEqual(choose_model(7200, depth=0).model_name, 'tiny')
+        self.assertEqual(choose_model(None, depth=0).model_name, 'small')
+
+    def test_queue_depth_downgrades(self):
+        '''A long queue moves the choice towards faster models, bounded by the last tier.'''
+
+        self.assertEqual(choose_model(180, depth=4).model_name, 'small')
+        self.assertEqual(choose_model(180, depth=5).model_name, 'base')
+        self.assertEqual(choose_model(180, depth=50).model_name, 'tiny')
+
+    @override_settings(WHISPER_MODEL_POLICY='', WHISPER_MODEL='medium')
+    def test_without_policy(self):
+        '''Without a policy WHISPER_MODEL is always used.'''
+
+        self.assertEqual(candidate_models(), ['medium'])
+        self.assertEqual(choose_model(7200).model_name, 'medium')
+
+@override_settings(WHISPER_MODEL_POLICY=POLICY, WHISPER_QUEUE_DOWNGRADE_DEPTH=5, TRANSCRIPTION_ENGINE='whisper',
+                   WHISPER_QUANTIZE='', QUIZ_USE_CAPTIONS=False, QUIZ_COMPRESSION_RATIO=0)
+class PipelineSelectionTests(TestCase):
+    '''Tests for the model choice inside create_quiz_from_youtube.'''
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(QUIZ_TMP_DIR=pathlib.Path(tmp.name))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_queue_depth_counts_pending_jobs(self):
+        '''Only pending jobs count towards the queue depth.'''
+
+        QuizJob.objects.create(owner=self.user, url='https://youtu.be/AAAAAAAAAAA')
+        QuizJob.objects.create(owner=self.user, url='https://youtu.be/AAAAAAAAAAA', status=QuizJob.RUNNING)
+        self.assertEqual(queue_depth(), 1)
+
+    @patch('quiz_app.api.services.get_or_generate_quiz', return_value=QUIZ_DICT)
+    @patch('quiz_app.api.services._transcribe_video', return_value=TranscriptionResult('long transcript', 'en'))
+    @patch('quiz_app.api.services.ensure_video_available', return_value={'duration': 5400})
+    def test_long_video_uses_fast_model(self, mock_available, mock_transcribe, mock_generate):
+        '''A 90 minute video is transcribed with the last tier and the choice is stored.'''
+
+        create_quiz_from_youtube('https://youtu.be/AAAAAAAAAAA', owner=self.user, num_questions=1)
+        self.assertEqual(mock_transcribe.call_args.kwargs['engine'].model_name, 'tiny')
+        entry = Transcript.objects.get(video_id='AAAAAAAAAAA')
+        self.assertEqual((entry.model_name, entry.transcription_model), ('tiny', 'tiny'))
+        self.assertEqual((entry.duration_sec, entry.queue_depth), (5400, 0))
+
+    @patch('quiz_app.api.services.get_or_generate_quiz', return_value=QUIZ_DICT)
+    @patch('quiz_app.api.services.ensure_video_available')
+    def test_any_tier_is_a_cache_hit(self, mock_available, mock_generate):
+        '''A transcript made by another tier is reused without fetching the video.'''
+
+        Transcript.objects.create(video_id='AAAAAAAAAAA', model_name='base', text='cached')
+        create_quiz_from_youtube('https://youtu.be/AAAAAAAAAAA', owner=self.user, num_questions=1)
+        mock_available.assert_not_called()
+        self.assertEqual(mock_generate.call_args.args[0], 'cached')
@@ -0,0 +1,118 @@
+'''Tests for the opt-in int8 Whisper mode.
+
+Covers:
+- quantize_whisper swaps every Linear layer for a dynamically quantized one
+  in place and keeps the encoder output close to fp32.
+- WHISPER_QUANTIZE=int8 selects the ('model', 'int8') registry entry, a
+  separate transcript cache source and fp32 activations (fp16=False).
+- The benchmark command reports both variants against the fp32 reference;
+  a measurement reports the RSS after load separately from the peaks.
+
+Notes:
+- A tiny randomly initialized Whisper model is built in memory; no weights
+  are downloaded. Benchmark subprocesses are replaced by a direct call stub.
+'''
+
+from io import StringIO
+from unittest.mock import patch
+
+import numpy as np
+import torch
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from whisper.model import ModelDimensions, Whisper
+
+from quiz_app.api import engines, whisper_models
+from quiz_app.api.whisper_models import ModelRegistry, quantize_whisper
+from quiz_app.management.commands import benchmark_quantization
+
+def tiny_whisper() -> Whisper:
+    '''Return a small random Whisper model with the real audio context size.'''
+
+    dims = ModelDimensions(n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+                           n_vocab=51865, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1)
+    torch.manual_seed(0)
+    return Whisper(dims).eval()
+
+class QuantizationTests(SimpleTestCase):
+    '''Tests for quantize_whisper and the quantized WhisperEngine.'''
+
+    def test_linear_layers_are_quantized(self):
+        '''No fp32 Linear remains and the encoder output barely changes.'''
+
+        mel = torch.randn(1, 80, 3000)
+        model = tiny_whisper()
+        with torch.no_grad():
+            reference = model.embed_audio(mel)
+        quantized = quantize_whisper(model)
+        self.assertIs(quantized, model)
+        linear_types = {type(m) for m in quantized.modules() if isinstance(m, torch.nn.Linear)}
+        self.assertEqual(linear_types, set())
+        self.assertTrue(any(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in quantized.modules()))
+        with torch.no_grad():
+            output = quantized.embed_audio(mel)
+        self.assertLess(float((output - reference).abs().max()), 0.1 * float(reference.abs().max()))
+
+    @override_settings(TRANSCRIPTION_ENGINE='whisper', WHISPER_MODEL='small', WHISPER_QUANTIZE='int8')
+    def test_engine_uses_quantized_registry_entry(self):
+        '''The quantized model is cached under its own key and run with fp16=False.'''
+
+        seen = {}
+        class FakeModel:
+            def transcribe(self, audio, **options):
+                seen.update(options)
+                return {'text': ' hello ', 'language': 'en'}
+
+        keys = []
+        fake = ModelRegistry(loader=lambda key: keys.append(key) or FakeModel())
+        engine = engines.get_engine()
+        with patch.object(whisper_models, 'registry', fake):
+            result = engine.transcribe(np.zeros(10, dtype=np.float32))
+        self.assertEqual(keys, [('small', 'int8')])
+        self.assertEqual(engine.source, 'small:int8')
+        self.assertEqual(result, engines.TranscriptionResult('hello', 'en'))
+        self.assertFalse(seen['fp16'])
+
+    def test_unknown_precision(self):
+        '''Only int8 is supported as quantized precision.'''
+
+        with self.assertRaisesMessage(ValueError, "Unsupported Whisper precision 'int4'."):
+            engines.WhisperEngine('small', quantize='int4')
+
+    def test_benchmark_command(self):
+        '''fp32 and int8 are reported, similarity relative to fp32.'''
+
+        results = {None: 'the cell has a nucleus', 'int8': 'the cell has nucleus'}
+        def run(fn, model_name, quantize, audio, language):
+            return {'load_sec': 1.0, 'transcribe_sec': 2.0, 'text': results[quantize],
+                    'rss_after_load_mb': 300.0, 'load_peak_rss_mb': 450.0, 'peak_rss_mb': 500.0}
+
+        out = StringIO()
+        with patch.object(benchmark_quantization, '_run_isolated', run), \
+             patch.object(engines.WhisperEngine, 'load_audio', return_value=np.zeros(32000, dtype=np.float32)):
+            call_command('benchmark_quantization', 'fixture.wav', '--model', 'tiny', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], 'Audio: 2.0 s, model: tiny')
+        self.assertTrue(lines[1].startswith('fp32') and 'similarity=1.000' in lines[1])
+        self.assertTrue(lines[2].startswith('int8') and 'words_per_sec=  2.00' in lines[2])
+        self.assertIn('similarity=0.889', lines[2])
+        self.assertIn('rss_after_load_mb=   300.0 load_peak_rss_mb=   450.0 peak_rss_mb=   500.0', lines[2])
+
+    def test_measure_reports_memory(self):
+        '''RSS after load is measured once the model is loaded, before transcription.'''
+
+        class FakeModel:
+            def transcribe(self, audio, **options):
+                return {'text': 'hello', 'language': 'en'}
+
+        fake = ModelRegistry(loader=lambda key: FakeModel())
+        rss = iter([300.0])
+        peaks = iter([450.0, 500.0])
+        with patch.object(whisper_models, 'registry', fake), \
+             patch.object(benchmark_quantization, '_rss_mb', lambda: next(rss)), \
+             patch.object(benchmark_quantization, '_peak_rss_mb', lambda: next(peaks)):
+            result = benchmark_quantization._measure('tiny', None, np.zeros(10, dtype=np.float32), 'en')
+        self.assertEqual(result['text'], 'hello')
+        self.assertEqual((result['rss_after_load_mb'], result['load_peak_rss_mb'], result['peak_rss_mb']),
+                         (300.0, 450.0, 500.0))
+        self.assertGreater(benchmark_quantization._rss_mb(), 0)
@@ -0,0 +1,74 @@
+'''Tests for the LLM quiz result cache.
+
+Covers:
+- A repeated transcript is served from the cache without an LLM call.
+- num_questions, model name and prompt template are part of the key.
+- Entries are evicted by age and by count.
+
+Notes:
+- The fake Gemini backend is used; its call log shows LLM round trips.
+'''
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from quiz_app.api import llm, services
+from quiz_app.models import GeneratedQuiz
+
+@override_settings(GEMINI_BACKEND='fake', QUIZ_RESULT_CACHE_TTL_SEC=3600, QUIZ_RESULT_CACHE_MAX_ENTRIES=100)
+class QuizCacheTests(TestCase):
+    '''Tests for get_or_generate_quiz and quiz_app.api.quiz_cache.'''
+
+    def setUp(self):
+        '''Start with a fresh fake client.'''
+
+        llm.reset_gemini_client()
+        self.addCleanup(llm.reset_gemini_client)
+
+    def llm_calls(self) -> int:
+        '''Return the number of LLM requests made so far.'''
+
+        return len(llm.get_gemini_client().calls)
+
+    def test_repeated_transcript_is_cached(self):
+        '''The second request for the same transcript skips the LLM.'''
+
+        first = services.get_or_generate_quiz('transcript', num_questions=2)
+        with patch('quiz_app.api.services.validate_quiz_dict') as mock_validate:
+            second = services.get_or_generate_quiz('transcript', num_questions=2)
+        self.assertEqual(first, second)
+        self.assertEqual(self.llm_calls(), 1)
+        mock_validate.assert_not_called()
+        self.assertEqual(GeneratedQuiz.objects.get().hits, 1)
+
+    def test_key_components(self):
+        '''Question count, model and prompt template changes miss the cache.'''
+
+        services.get_or_generate_quiz('transcript', num_questions=2)
+        services.get_or_generate_quiz('transcript', num_questions=3)
+        with override_settings(GEMINI_MODEL='other-model'):
+            services.get_or_generate_quiz('transcript', num_questions=2)
+        with patch('quiz_app.api.services.build_quiz_prompt', lambda t, n=10: f"changed: exactly {n} questions {t}"):
+            services.get_or_generate_quiz('transcript', num_questions=2)
+        self.assertEqual(self.llm_calls(), 4)
+        self.assertEqual(GeneratedQuiz.objects.count(), 4)
+
+    def test_expired_entries_are_misses(self):
+        '''Results older than the TTL are regenerated.'''
+
+        services.get_or_generate_quiz('transcript', num_questions=2)
+        GeneratedQuiz.objects.update(created_at=timezone.now() - timedelta(hours=2))
+        services.get_or_generate_quiz('transcript', num_questions=2)
+        self.assertEqual(self.llm_calls(), 2)
+        self.assertEqual(GeneratedQuiz.objects.count(), 1)
+
+    @override_settings(QUIZ_RESULT_CACHE_MAX_ENTRIES=2)
+    def test_size_limit(self):
+        '''Only the most recently used entries are kept.'''
+
+        for text in ('a', 'b', 'c'):
+            services.get_or_generate_quiz(text, num_questions=1)
+        self.assertEqual(GeneratedQuiz.objects.count(), 2)
@@ -0,0 +1,94 @@
+'''API tests for sparse fieldsets on quiz list and detail responses.
+
+Covers:
+- ?fields= limits the quiz keys in list and detail responses.
+- Unrequested columns are not selected and questions are not prefetched
+  when 'questions' is not requested.
+- ?fields[questions]= limits the nested question keys and columns.
+- Combination with ?view=summary and 400 for unknown field names.
+
+Notes:
+- Query checks ignore the ETag validator aggregate (see test_conditional_requests).
+- Uses GET /api/quizzes/ and GET /api/quizzes/<id>/.
+'''
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.models import Question, Quiz
+
+class QuizFieldsetTests(APITestCase):
+    '''Tests for ?fields= and ?fields[questions]=.'''
+
+    def setUp(self):
+        '''Create a user with two quizzes of two questions each.'''
+
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        for i in range(2):
+            quiz = Quiz.objects.create(owner=self.user, title=f'QZ{i}', description='long description',
+                                       video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+            for j in range(2):
+                Question.objects.create(quiz=quiz, question_title=f'Q{j}',
+                                        question_options=['A', 'B', 'C', 'D'], answer='A')
+        self.quiz = quiz
+        self.list_url = reverse('api-quizzes')
+        self.detail_url = reverse('api-quiz-detail', kwargs={'id': quiz.id})
+        self.client.force_authenticate(self.user)
+
+    def test_list_fields_skip_columns_and_prefetch(self):
+        '''Only the requested keys are returned, from a single narrow query.'''
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.list_url, {'fields': 'id,title,updated_at'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual({tuple(sorted(item)) for item in resp.data}, {('id', 'title', 'updated_at')})
+        quiz_queries = [q['sql'] for q in ctx.captured_queries if 'quiz_app_' in q['sql'] and 'MAX(' not in q['sql']]
+        self.assertEqual(len(quiz_queries), 1)
+        self.assertNotIn('description', quiz_queries[0])
+        self.assertNotIn('video_url', quiz_queries[0])
+
+    def test_question_fields(self):
+        '''Nested questions are narrowed by fields[questions].'''
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.detail_url, {'fields': 'id,questions', 'fields[questions]': 'id,question_title'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(resp.data), {'id', 'questions'})
+        self.assertEqual([set(q) for q in resp.data['questions']], [{'id', 'question_title'}] * 2)
+        question_sql = [q['sql'] for q in ctx.captured_queries
+                        if 'quiz_app_question' in q['sql'] and 'MAX(' not in q['sql']]
+        self.assertEqual(len(question_sql), 1)
+        self.assertNotIn('question_options', question_sql[0])
+
+    def test_default_is_full_payload(self):
+        '''Without fieldsets the full quiz with questions is returned.'''
+
+        resp = self.client.get(self.detail_url)
+        self.assertIn('description', resp.data)
+        self.assertEqual(len(resp.data['questions'][0]), 6)
+
+    def test_summary_fields(self):
+        '''Summary fieldsets may include question_count.'''
+
+        resp = self.client.get(self.list_url, {'view': 'summary', 'fields': 'id,question_count'})
+        self.assertEqual(resp.data[0], {'id': resp.data[0]['id'], 'question_count': 2})
+
+    def test_unknown_field(self):
+        '''Unknown names answer 400 with the allowed fields.'''
+
+        resp = self.client.get(self.list_url, {'fields': 'id,secret'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('secret', str(resp.data['fields']))
+        resp = self.client.get(self.detail_url, {'fields[questions]': ''})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_patch_ignores_fieldsets(self):
+        '''Writes still answer with the full quiz.'''
+
+        resp = self.client.patch(f'{self.detail_url}?fields=id', {'title': 'New'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['title'], 'New')
@@ -0,0 +1,167 @@
+'''Tests for asynchronous quiz-generation jobs.
+
+Covers:
+- GET /api/jobs/<id>/: 401 unauthenticated, 404 unknown, 403 foreign job,
+  200 with status/stage/progress for the owner.
+- Worker: a claimed job runs the pipeline and records the quiz id; a
+  ValueError marks the job failed with its message; unexpected errors are
+  logged with their traceback.
+- Claiming is exclusive: a job is handed out only once.
+- A worker whose job was reclaimed (new `started_at`) neither overwrites the
+  job nor keeps its duplicate quiz.
+- The heartbeat refreshes `updated_at` while a stage runs without progress.
+
+Notes:
+- The pipeline is patched in 'quiz_app.api.jobs', so no yt-dlp/Whisper/Gemini
+  work is performed.
+'''
+
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api.jobs import claim_next_job, enqueue_quiz_job, run_job
+from quiz_app.models import Quiz, QuizJob
+
+class QuizJobTests(APITestCase):
+    '''Tests for the job status endpoint and the worker.'''
+
+    def setUp(self):
+        '''Create two users and a pending job for the first one.'''
+
+        self.u1 = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        self.u2 = User.objects.create_user(username='u2', password='Abc123', email='u2@x.com')
+        self.job = enqueue_quiz_job('https://youtu.be/AAAAAAAAAAA', owner=self.u1)
+        self.detail_url = lambda jid: reverse('api-job-detail', kwargs={'id': jid})
+
+    def test_requires_auth(self):
+        '''Unauthenticated requests must return 401.'''
+
+        resp = self.client.get(self.detail_url(self.job.id))
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_404_and_403(self):
+        '''Unknown jobs are 404, other users' jobs are 403.'''
+
+        self.client.force_authenticate(self.u2)
+        self.assertEqual(self.client.get(self.detail_url(999)).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(self.detail_url(self.job.id)).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_status_for_owner(self):
+        '''The owner sees a pending job without a quiz id.'''
+
+        self.client.force_authenticate(self.u1)
+        resp = self.client.get(self.detail_url(self.job.id))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['status'], 'pending')
+        self.assertEqual(resp.data['progress'], 0)
+        self.assertIsNone(resp.data['quiz_id'])
+
+    def test_claim_is_exclusive(self):
+        '''A job is claimed once; the queue is then empty.'''
+
+        claimed = claim_next_job()
+        self.assertEqual(claimed.pk, self.job.pk)
+        self.assertEqual(claimed.status, QuizJob.RUNNING)
+        self.assertIsNone(claim_next_job())
+
+    @patch('quiz_app.api.jobs.create_quiz_from_youtube')
+    def test_worker_runs_job(self, mock_create):
+        '''The worker command runs the pipeline and stores the resulting quiz.'''
+
+        quiz = Quiz.objects.create(owner=self.u1, title='T', description='D',
+                                   video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+        def fake_pipeline(url, owner, num_questions, progress, language=None):
+            progress('transcribing', 35)
+            return quiz
+        mock_create.side_effect = fake_pipeline
+
+        call_command('process_quiz_jobs', '--once', stdout=StringIO())
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, QuizJob.SUCCEEDED)
+        self.assertEqual(self.job.progress, 100)
+        self.client.force_authenticate(self.u1)
+        resp = self.client.get(self.detail_url(self.job.id))
+        self.assertEqual(resp.data['quiz_id'], quiz.id)
+
+    @patch('quiz_app.api.jobs.create_quiz_from_youtube', side_effect=ValueError('Video too long.'))
+    def test_worker_records_failure(self, mock_create):
+        '''Expected pipeline errors mark the job failed with the message.'''
+
+        call_command('process_quiz_jobs', '--once', stdout=StringIO())
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, QuizJob.FAILED)
+        self.assertEqual(self.job.error, 'Video too long.')
+        self.assertIsNone(self.job.quiz)
+
+    @patch('quiz_app.api.jobs.create_quiz_from_youtube', side_effect=RuntimeError('CUDA out of memory'))
+    def test_worker_logs_unexpected_failure(self, mock_create):
+        '''Unexpected errors keep their traceback in the log, not in the job.'''
+
+        with self.settings(DEBUG=False), self.assertLogs('quiz_app.api.jobs', level='ERROR') as logs:
+            run_job(claim_next_job())
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, QuizJob.FAILED)
+        self.assertEqual(self.job.error, 'Internal server error.')
+        self.assertEqual(logs.records[0].getMessage(), f"quiz job {self.job.pk} failed")
+        self.assertIn('CUDA out of memory', logs.output[0])
+        self.assertIsNotNone(logs.records[0].exc_info)
+
+    @patch('quiz_app.api.jobs.create_quiz_from_youtube')
+    def test_superseded_worker_keeps_out(self, mock_create):
+        '''A worker whose job was reclaimed meanwhile must not record its result.'''
+
+        job = claim_next_job()
+        reclaimed_at = job.started_at + timedelta(hours=1)
+        def fake_pipeline(url, owner, num_questions, progress, language=None):
+            # Another worker reclaims the stale job while this one is still busy.
+            QuizJob.objects.filter(pk=job.pk).update(started_at=reclaimed_at, stage='starting', progress=0)
+            progress('transcribing', 35)
+            return Quiz.objects.create(owner=self.u1, title='T', description='D',
+                                       video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+        mock_create.side_effect = fake_pipeline
+
+        run_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.RUNNING)
+        self.assertEqual(job.started_at, reclaimed_at)
+        self.assertEqual((job.stage, job.progress), ('starting', 0))
+        self.assertIsNone(job.quiz)
+        self.assertFalse(Quiz.objects.exists())
+
+class QuizJobHeartbeatTests(TransactionTestCase):
+    '''The heartbeat writes from its own thread, so the job must be committed.'''
+
+    @override_settings(QUIZ_JOB_HEARTBEAT_SEC=0.05)
+    @patch('quiz_app.api.jobs.create_quiz_from_youtube')
+    def test_heartbeat_during_long_stage(self, mock_create):
+        '''`updated_at` advances while the pipeline reports no progress.'''
+
+        owner = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        enqueue_quiz_job('https://youtu.be/AAAAAAAAAAA', owner=owner)
+        job = claim_next_job()
+        QuizJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        beats = []
+        def fake_pipeline(url, owner, num_questions, progress, language=None):
+            time.sleep(0.3)
+            beats.append(QuizJob.objects.get(pk=job.pk).updated_at)
+            raise ValueError('Video too long.')
+        mock_create.side_effect = fake_pipeline
+
+        run_job(job)
+
+        self.assertGreater(beats[0], timezone.now() - timedelta(minutes=1))
+        self.assertEqual(job.status, QuizJob.FAILED)
@@ -0,0 +1,100 @@
+'''API tests for paging and the summary view of the quiz list.
+
+Covers:
+- Without 'limit'/'cursor' the list stays a plain, unpaginated array.
+- Keyset pages follow (created_at, id) newest first without gaps or repeats,
+  also when several quizzes share the same created_at.
+- ?view=summary omits questions and returns a database-computed question_count
+  in a constant number of queries (validators + list).
+- 400 for invalid 'view'/'limit', 404 for an invalid cursor.
+
+Notes:
+- Uses the list endpoint: GET /api/quizzes/.
+'''
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.models import Question, Quiz
+
+class QuizPaginationTests(APITestCase):
+    '''Tests for ?limit=, ?cursor= and ?view=summary on GET /api/quizzes/.'''
+
+    def setUp(self):
+        '''Create seven quizzes for u1 (three sharing a timestamp) and one for u2.'''
+
+        self.url = reverse('api-quizzes')
+        self.u1 = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        self.u2 = User.objects.create_user(username='u2', password='Abc123', email='u2@x.com')
+        for i in range(7):
+            quiz = Quiz.objects.create(owner=self.u1, title=f'QZ{i}', description='d',
+                                       video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+            for j in range(i % 3):
+                Question.objects.create(quiz=quiz, question_title=f'Q{j}',
+                                        question_options=['A', 'B', 'C', 'D'], answer='A')
+        same = timezone.now()
+        Quiz.objects.filter(title__in=['QZ2', 'QZ3', 'QZ4']).update(created_at=same)
+        Quiz.objects.create(owner=self.u2, title='other', description='d',
+                            video_url='https://www.youtube.com/watch?v=BBBBBBBBBBB')
+        self.client.force_authenticate(self.u1)
+
+    def _walk(self, url):
+        '''Follow 'next' links and return the ids of all pages.'''
+
+        ids, pages = [], 0
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in resp.data['results']]
+            url, pages = resp.data['next'], pages + 1
+        return ids, pages
+
+    def test_unpaginated_by_default(self):
+        '''Without paging parameters all quizzes are returned as a list.'''
+
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data), 7)
+
+    def test_pages_cover_all_quizzes_in_order(self):
+        '''Walking the cursor yields every quiz once, newest first.'''
+
+        expected = list(Quiz.objects.filter(owner=self.u1).order_by('-created_at', '-id').values_list('id', flat=True))
+        ids, pages = self._walk(f'{self.url}?limit=2')
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_limit_is_capped(self):
+        '''A limit above QUIZ_PAGE_SIZE_MAX is clamped.'''
+
+        with self.settings(QUIZ_PAGE_SIZE_MAX=3):
+            resp = self.client.get(self.url, {'limit': 50})
+        self.assertEqual(len(resp.data['results']), 3)
+        self.assertIsNotNone(resp.data['next'])
+
+    def test_summary_view(self):
+        '''Summary items carry question_count instead of questions.'''
+
+        # The ETag validator aggregate plus the annotated list query.
+        with self.assertNumQueries(2):
+            resp = self.client.get(self.url, {'view': 'summary'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        counts = {item['title']: item['question_count'] for item in resp.data}
+        self.assertEqual(counts, {f'QZ{i}': i % 3 for i in range(7)})
+        self.assertNotIn('questions', resp.data[0])
+
+    def test_summary_page(self):
+        '''Summary and pagination combine.'''
+
+        ids, _ = self._walk(f'{self.url}?view=summary&limit=3')
+        self.assertEqual(len(set(ids)), 7)
+
+    def test_invalid_parameters(self):
+        '''Bad view/limit answer 400, a bad cursor 404.'''
+
+        self.assertEqual(self.client.get(self.url, {'view': 'huge'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'limit': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'cursor': '!!'}).status_code, status.HTTP_404_NOT_FOUND)
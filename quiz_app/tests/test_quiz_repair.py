@@ -0,0 +1,119 @@
+'''Tests for the partial regeneration (repair) of rejected quiz questions.
+
+Covers:
+- A reply with one invalid question keeps the valid ones and requests exactly
+  one replacement.
+- Replacements that are invalid or repeat an accepted title are discarded and
+  the loop retries within QUIZ_REPAIR_ATTEMPTS.
+- After the attempts are exhausted a ValueError is raised.
+- One generation is counted once in quiz_llm_responses_total, however many
+  repair attempts failed to parse.
+- Replies without the quiz frame (title/description/questions) are not repaired.
+
+Notes:
+- The fake Gemini client's generate_content is patched with a sequence of replies.
+'''
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import llm, services
+from quiz_app.api.metrics import llm_responses
+
+def question(i, answer=None, options=None):
+    '''Return a question dict; override answer/options to make it invalid.'''
+
+    opts = options or [f"Q{i} option {c}" for c in 'ABCD']
+    return {'question_title': f"Question {i}?", 'question_options': opts, 'answer': answer or opts[0]}
+
+def reply(payload):
+    '''Wrap a payload like a generate_content response.'''
+
+    return SimpleNamespace(text=json.dumps(payload))
+
+@override_settings(GEMINI_BACKEND='fake', GEMINI_STRUCTURED_OUTPUT=True, QUIZ_REPAIR_ATTEMPTS=2)
+class QuizRepairTests(SimpleTestCase):
+    '''Tests for generate_quiz_with_gemini / repair_quiz.'''
+
+    def setUp(self):
+        '''Start every test with a fresh fake client.'''
+
+        llm.reset_gemini_client()
+        self.addCleanup(llm.reset_gemini_client)
+
+    def _replies(self, *payloads):
+        '''Make the fake client answer with `payloads` in order.'''
+
+        client = llm.get_gemini_client()
+        return patch.object(client.models, 'generate_content', side_effect=[reply(p) for p in payloads])
+
+    def _quiz(self, questions):
+        return {'title': 'T', 'description': 'D', 'questions': questions}
+
+    def test_only_rejected_question_is_regenerated(self):
+        '''One bad question leads to one request for one replacement.'''
+
+        first = self._quiz([question(1), question(2, answer='nope'), question(3)])
+        before = llm_responses.value(mode='structured', outcome='repaired')
+        with self._replies(first, {'questions': [question(4)]}) as mock_gen:
+            quiz = services.generate_quiz_with_gemini('transcript', num_questions=3)
+        titles = [q['question_title'] for q in quiz['questions']]
+        self.assertEqual(titles, ['Question 1?', 'Question 3?', 'Question 4?'])
+        self.assertEqual(mock_gen.call_count, 2)
+        repair_call = mock_gen.call_args_list[1].kwargs
+        self.assertIn('exactly 1 questions', repair_call['contents'])
+        self.assertIn('- Question 1?', repair_call['contents'])
+        self.assertEqual(repair_call['config'].response_schema.properties['questions'].max_items, 1)
+        self.assertEqual(llm_responses.value(mode='structured', outcome='repaired'), before + 1)
+
+    def test_bad_replacements_are_retried(self):
+        '''Duplicate or invalid replacements do not count; a later attempt fills the gap.'''
+
+        first = self._quiz([question(1), question(2, options=['a', 'a', 'b', 'c'])])
+        with self._replies(first, {'questions': [question(1)]}, {'questions': [question(5)]}) as mock_gen:
+            quiz = services.generate_quiz_with_gemini('transcript', num_questions=2)
+        self.assertEqual([q['question_title'] for q in quiz['questions']], ['Question 1?', 'Question 5?'])
+        self.assertEqual(mock_gen.call_count, 3)
+
+    def test_outcome_counted_once_per_generation(self):
+        '''An unparsable repair reply is retried, not counted as a parse error.'''
+
+        client = llm.get_gemini_client()
+        first = self._quiz([question(1), question(2, answer='nope')])
+        replies = [reply(first), SimpleNamespace(text='not json'), reply({'questions': [question(5)]})]
+        outcomes = ('ok', 'repaired', 'invalid', 'parse_error')
+        before = {o: llm_responses.value(mode='structured', outcome=o) for o in outcomes}
+        with patch.object(client.models, 'generate_content', side_effect=replies):
+            services.generate_quiz_with_gemini('transcript', num_questions=2)
+        after = {o: llm_responses.value(mode='structured', outcome=o) for o in outcomes}
+        self.assertEqual({o: after[o] - before[o] for o in outcomes},
+                         {'ok': 0, 'repaired': 1, 'invalid': 0, 'parse_error': 0})
+
+        replies = [reply(first), SimpleNamespace(text='not json'), SimpleNamespace(text='still not json')]
+        with patch.object(client.models, 'generate_content', side_effect=replies):
+            with self.assertRaises(ValueError):
+                services.generate_quiz_with_gemini('transcript', num_questions=2)
+        final = {o: llm_responses.value(mode='structured', outcome=o) for o in outcomes}
+        self.assertEqual({o: final[o] - after[o] for o in outcomes},
+                         {'ok': 0, 'repaired': 0, 'invalid': 1, 'parse_error': 0})
+
+    def test_attempts_are_bounded(self):
+        '''The quiz fails once QUIZ_REPAIR_ATTEMPTS follow-ups did not help.'''
+
+        first = self._quiz([question(1), question(2, answer='nope')])
+        bad = {'questions': [question(9, answer='nope')]}
+        with self._replies(first, bad, bad) as mock_gen:
+            with self.assertRaisesMessage(ValueError, 'Quiz must contain exactly 2 questions.'):
+                services.generate_quiz_with_gemini('transcript', num_questions=2)
+        self.assertEqual(mock_gen.call_count, 3)
+
+    def test_missing_frame_is_not_repaired(self):
+        '''Without title/description the reply is rejected immediately.'''
+
+        with self._replies({'questions': [question(1)]}) as mock_gen:
+            with self.assertRaisesMessage(ValueError, 'Quiz JSON must contain title, description, questions.'):
+                services.generate_quiz_with_gemini('transcript', num_questions=1)
+        self.assertEqual(mock_gen.call_count, 1)
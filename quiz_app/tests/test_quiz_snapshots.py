@@ -0,0 +1,129 @@
+'''Tests for the precomputed quiz JSON snapshots (Quiz.rendered_json).
+
+Covers:
+- Snapshots equal the QuizSerializer output and follow every write path:
+  the pipeline (bulk insert), API PATCH, ORM/admin saves and deletes.
+- Full list/detail reads are served from the snapshots (no question query)
+  with the same payload as the serializer; sparse reads still serialize.
+- Missing snapshots are rebuilt on read.
+- check_quiz_snapshots reports stale snapshots and repairs them with --fix.
+
+Notes:
+- The response cache is disabled so every read reaches the snapshot path.
+'''
+
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api import services
+from quiz_app.api.serializers import QuizSerializer
+from quiz_app.models import Question, Quiz
+
+QUIZ_DICT = {
+    'title': 'Generated', 'description': 'D',
+    'questions': [{'question_title': f'Q{i}', 'question_options': ['A', 'B', 'C', 'D'], 'answer': 'A'} for i in range(3)],
+}
+
+@override_settings(QUIZ_RESPONSE_CACHE_TTL_SEC=0)
+class QuizSnapshotTests(APITestCase):
+    '''Tests for quiz_app.api.snapshots and check_quiz_snapshots.'''
+
+    def setUp(self):
+        '''Create a quiz with two questions for u1.'''
+
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        self.quiz = Quiz.objects.create(owner=self.user, title='QZ', description='d',
+                                        video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+        self.questions = [
+            Question.objects.create(quiz=self.quiz, question_title=f'Q{i}',
+                                    question_options=['A', 'B', 'C', 'D'], answer='A')
+            for i in range(2)
+        ]
+        self.list_url = reverse('api-quizzes')
+        self.detail_url = reverse('api-quiz-detail', kwargs={'id': self.quiz.id})
+        self.client.force_authenticate(self.user)
+
+    def _assert_current(self, quiz_id):
+        '''The stored snapshot equals a fresh serialization.'''
+
+        quiz = Quiz.objects.get(pk=quiz_id)
+        self.assertEqual(json.loads(quiz.rendered_json), json.loads(json.dumps(QuizSerializer(quiz).data)))
+
+    def test_orm_writes_rebuild(self):
+        '''Saving and deleting questions or the quiz keeps the snapshot current.'''
+
+        self._assert_current(self.quiz.pk)
+        self.questions[0].question_title = 'Edited'
+        self.questions[0].save()
+        self._assert_current(self.quiz.pk)
+        self.questions[1].delete()
+        self._assert_current(self.quiz.pk)
+        self.assertEqual(len(json.loads(Quiz.objects.get(pk=self.quiz.pk).rendered_json)['questions']), 1)
+
+    def test_patch_rebuilds(self):
+        '''API updates refresh the snapshot served by later reads.'''
+
+        self.client.patch(self.detail_url, {'title': 'New'}, format='json')
+        self._assert_current(self.quiz.pk)
+        self.assertEqual(self.client.get(self.detail_url).data['title'], 'New')
+
+    @override_settings(TRANSCRIPTION_ENGINE='fake', QUIZ_USE_CAPTIONS=False, QUIZ_COMPRESSION_RATIO=0)
+    @patch('quiz_app.api.services.get_or_generate_quiz', return_value=QUIZ_DICT)
+    @patch('quiz_app.api.services.get_cached_transcript', return_value='cached transcript')
+    def test_pipeline_builds_snapshot(self, mock_transcript, mock_generate):
+        '''Quizzes created by the pipeline (bulk insert) get a complete snapshot.'''
+
+        quiz = services.create_quiz_from_youtube('https://youtu.be/BBBBBBBBBBB', owner=self.user, num_questions=3)
+        self._assert_current(quiz.pk)
+        self.assertEqual(len(json.loads(quiz.rendered_json)['questions']), 3)
+
+    def test_reads_use_snapshot(self):
+        '''Full reads do not query questions and match the serializer output.'''
+
+        with CaptureQueriesContext(connection) as ctx:
+            detail = self.client.get(self.detail_url)
+            listed = self.client.get(self.list_url)
+            page = self.client.get(self.list_url, {'limit': 1})
+        self.assertFalse([q for q in ctx.captured_queries if 'FROM "quiz_app_question"' in q['sql']])
+        expected = json.loads(json.dumps(QuizSerializer(Quiz.objects.get(pk=self.quiz.pk)).data))
+        self.assertEqual(detail['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(detail.content), expected)
+        self.assertEqual(json.loads(listed.content), [expected])
+        self.assertEqual(json.loads(page.content), {'next': None, 'results': [expected]})
+
+    def test_sparse_reads_serialize(self):
+        '''Fieldsets bypass the snapshot.'''
+
+        resp = self.client.get(self.detail_url, {'fields': 'id,title'})
+        self.assertEqual(resp.data, {'id': self.quiz.pk, 'title': 'QZ'})
+
+    def test_missing_snapshot_rebuilt_on_read(self):
+        '''Quizzes without a snapshot are rendered and stored on first read.'''
+
+        Quiz.objects.filter(pk=self.quiz.pk).update(rendered_json='')
+        resp = self.client.get(self.detail_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data['questions']), 2)
+        self._assert_current(self.quiz.pk)
+
+    def test_check_command(self):
+        '''Stale snapshots fail the check and are repaired with --fix.'''
+
+        Question.objects.filter(pk=self.questions[0].pk).update(question_title='Bulk edited')
+        with self.assertRaises(CommandError):
+            call_command('check_quiz_snapshots', stdout=StringIO())
+        out = StringIO()
+        call_command('check_quiz_snapshots', '--fix', stdout=out)
+        self.assertIn(f'Quiz #{self.quiz.pk}: snapshot stale', out.getvalue())
+        self._assert_current(self.quiz.pk)
+        call_command('check_quiz_snapshots', stdout=StringIO())
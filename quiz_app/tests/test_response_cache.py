@@ -0,0 +1,147 @@
+'''Tests for the per-user response cache of the quiz read endpoints.
+
+Covers:
+- A repeated GET (list or detail) is answered from the cache without queries,
+  also as 304 for a matching If-None-Match.
+- Invalidation by PATCH/DELETE, by ORM/admin writes (signals) and by
+  create_quiz_from_youtube; job status polls have no cache side effects.
+- Entries are per user and per representation; hit/miss counters.
+- The cache is bypassed when disabled and for non-JSON renderers.
+
+Notes:
+- The cache is cleared before every test (the local-memory cache outlives
+  the per-test database rollback).
+'''
+
+import json
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quiz_app.api import services
+from quiz_app.api.metrics import response_cache_lookups
+from quiz_app.models import Question, Quiz, QuizJob
+
+QUIZ_DICT = {
+    'title': 'Generated', 'description': 'D',
+    'questions': [{'question_title': 'Q1', 'question_options': ['A', 'B', 'C', 'D'], 'answer': 'A'}],
+}
+
+@override_settings(QUIZ_RESPONSE_CACHE_TTL_SEC=300)
+class ResponseCacheTests(APITestCase):
+    '''Tests for quiz_app.api.response_cache through the API.'''
+
+    def setUp(self):
+        '''Create a quiz with one question for u1.'''
+
+        cache.clear()
+        self.user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        self.quiz = Quiz.objects.create(owner=self.user, title='QZ', description='d',
+                                        video_url='https://www.youtube.com/watch?v=AAAAAAAAAAA')
+        self.question = Question.objects.create(quiz=self.quiz, question_title='Q1',
+                                                question_options=['A', 'B', 'C', 'D'], answer='A')
+        self.list_url = reverse('api-quizzes')
+        self.detail_url = reverse('api-quiz-detail', kwargs={'id': self.quiz.id})
+        self.client.force_authenticate(self.user)
+
+    def _titles(self):
+        '''Return the quiz titles of the list endpoint.'''
+
+        return [item['title'] for item in json.loads(self.client.get(self.list_url).content)]
+
+    def test_hit_without_queries(self):
+        '''The second identical GET is served from the cache.'''
+
+        hits = response_cache_lookups.value(endpoint='detail', result='hit')
+        first = self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail_url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(second.content), json.loads(first.content))
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(response_cache_lookups.value(endpoint='detail', result='hit'), hits + 1)
+
+    def test_cached_304(self):
+        '''A matching If-None-Match is answered from the cache.'''
+
+        etag = self.client.get(self.list_url)['ETag']
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_patch_and_delete_invalidate(self):
+        '''Writes through the API drop the cached list and detail.'''
+
+        self.assertEqual(self._titles(), ['QZ'])
+        self.client.get(self.detail_url)
+        self.client.patch(self.detail_url, {'title': 'New'}, format='json')
+        self.assertEqual(self._titles(), ['New'])
+        self.assertEqual(self.client.get(self.detail_url).data['title'], 'New')
+        self.client.delete(self.detail_url)
+        self.assertEqual(self._titles(), [])
+
+    def test_orm_writes_invalidate(self):
+        '''Admin-style ORM writes invalidate through signals.'''
+
+        self.client.get(self.detail_url)
+        self.question.question_title = 'Edited'
+        self.question.save()
+        resp = self.client.get(self.detail_url)
+        self.assertEqual(resp.data['questions'][0]['question_title'], 'Edited')
+
+    @override_settings(TRANSCRIPTION_ENGINE='fake', QUIZ_USE_CAPTIONS=False, QUIZ_COMPRESSION_RATIO=0)
+    @patch('quiz_app.api.services.get_or_generate_quiz', return_value=QUIZ_DICT)
+    @patch('quiz_app.api.services.get_cached_transcript', return_value='cached transcript')
+    def test_pipeline_invalidates(self, mock_transcript, mock_generate):
+        '''A quiz created by the pipeline shows up in the cached list.'''
+
+        self.assertEqual(self._titles(), ['QZ'])
+        services.create_quiz_from_youtube('https://youtu.be/BBBBBBBBBBB', owner=self.user, num_questions=1)
+        self.assertEqual(sorted(self._titles()), ['Generated', 'QZ'])
+
+    def test_job_poll_keeps_cache(self):
+        '''Polling a finished job does not drop the user's cached responses.'''
+
+        self.client.get(self.list_url)
+        job = QuizJob.objects.create(owner=self.user, url='https://www.youtube.com/watch?v=AAAAAAAAAAA',
+                                     status=QuizJob.SUCCEEDED, quiz=self.quiz)
+        version = cache.get(f'quiz-resp:v:{self.user.pk}')
+        self.client.get(reverse('api-job-detail', kwargs={'id': job.id}))
+        self.assertEqual(cache.get(f'quiz-resp:v:{self.user.pk}'), version)
+        with self.assertNumQueries(0):
+            self.client.get(self.list_url)
+
+    def test_per_user_and_representation(self):
+        '''Other users and other query strings do not share entries.'''
+
+        self.client.get(self.list_url)
+        sparse = self.client.get(self.list_url, {'fields': 'id'})
+        self.assertEqual(set(json.loads(sparse.content)[0]), {'id'})
+        other = User.objects.create_user(username='u2', password='Abc123', email='u2@x.com')
+        self.client.force_authenticate(other)
+        self.assertEqual(self._titles(), [])
+
+    @override_settings(QUIZ_RESPONSE_CACHE_TTL_SEC=0)
+    def test_disabled(self):
+        '''With a TTL of 0 every GET reads the database.'''
+
+        self.client.get(self.detail_url)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.detail_url)
+        self.assertGreater(len(ctx.captured_queries), 0)
+
+    def test_browsable_api_not_cached(self):
+        '''Only JSON responses are cached.'''
+
+        self.client.get(self.detail_url, HTTP_ACCEPT='text/html')
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.detail_url, HTTP_ACCEPT='text/html')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(ctx.captured_queries), 0)
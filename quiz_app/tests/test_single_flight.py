@@ -0,0 +1,80 @@
+'''Tests for cross-process single-flight locking.
+
+Covers:
+- A follower blocks until the leader leaves the critical section and then
+  sees the leader's result.
+- After QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC the follower proceeds without the lock.
+- create_quiz_from_youtube re-checks the transcript cache after the wait.
+
+Notes:
+- Lock files are created in a temporary QUIZ_TMP_DIR.
+'''
+
+import pathlib, tempfile, threading, time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import services
+from quiz_app.api.single_flight import single_flight
+
+class SingleFlightTests(SimpleTestCase):
+    '''Tests for quiz_app.api.single_flight.'''
+
+    def setUp(self):
+        '''Point QUIZ_TMP_DIR to a private directory.'''
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(QUIZ_TMP_DIR=pathlib.Path(tmp.name), QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC=5)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_follower_waits_for_leader(self):
+        '''The follower only enters after the leader stored its result.'''
+
+        results, entered = [], threading.Event()
+        def leader():
+            with single_flight('AAAAAAAAAAA') as held:
+                entered.set()
+                time.sleep(0.3)
+                results.append(('leader', held))
+        def follower():
+            entered.wait()
+            with single_flight('AAAAAAAAAAA') as held:
+                results.append(('follower', held, len(results)))
+
+        threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertEqual(results, [('leader', True), ('follower', True, 1)])
+
+    def test_timeout_runs_without_lock(self):
+        '''A follower gives up waiting after the configured timeout.'''
+
+        release, entered, outcome = threading.Event(), threading.Event(), []
+        def leader():
+            with single_flight('BBBBBBBBBBB'):
+                entered.set()
+                release.wait(5)
+        t = threading.Thread(target=leader)
+        t.start()
+        entered.wait()
+        with override_settings(QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC=0.2):
+            with single_flight('BBBBBBBBBBB') as held:
+                outcome.append(held)
+        release.set()
+        t.join()
+        self.assertEqual(outcome, [False])
+
+    @patch('quiz_app.api.services.get_or_generate_quiz', side_effect=ValueError('stop'))
+    @patch('quiz_app.api.services.ensure_video_available')
+    @patch('quiz_app.api.services.get_cached_transcript', side_effect=[None, 'leader transcript'])
+    def test_pipeline_rechecks_cache_after_wait(self, mock_cache, mock_available, mock_gemini):
+        '''A follower uses the leader's transcript instead of downloading.'''
+
+        with self.assertRaisesMessage(ValueError, 'stop'):
+            services.create_quiz_from_youtube('https://youtu.be/AAAAAAAAAAA', owner=None)
+        mock_available.assert_not_called()
+        self.assertEqual(mock_gemini.call_args.args[0], 'leader transcript')
+        self.assertFalse(mock_cache.call_args.kwargs['record'])
@@ -0,0 +1,81 @@
+'''Tests for schema-constrained (structured) Gemini output.
+
+Covers:
+- The request carries response_mime_type=application/json and a schema that
+  matches the shape enforced by validate_quiz_dict.
+- Structured replies are parsed with a single json.loads; non-JSON replies
+  raise ValueError and are counted as parse errors.
+- GEMINI_STRUCTURED_OUTPUT=False keeps the legacy fence-stripping parser.
+- Outcomes are counted per mode in quiz_llm_responses_total.
+
+Notes:
+- Uses the fake Gemini backend; replies are swapped via a patched response.
+'''
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import llm, services
+from quiz_app.api.metrics import llm_responses
+
+@override_settings(GEMINI_BACKEND='fake')
+class StructuredOutputTests(SimpleTestCase):
+    '''Tests for generate_quiz_with_gemini output modes.'''
+
+    def setUp(self):
+        '''Start every test with a fresh fake client.'''
+
+        llm.reset_gemini_client()
+        self.addCleanup(llm.reset_gemini_client)
+
+    def _reply(self, text):
+        '''Make the fake client return `text`.'''
+
+        client = llm.get_gemini_client()
+        return patch.object(client.models, 'generate_content', return_value=SimpleNamespace(text=text))
+
+    def test_request_carries_schema(self):
+        '''The config constrains the reply to the quiz schema.'''
+
+        with override_settings(GEMINI_STRUCTURED_OUTPUT=True):
+            services.generate_quiz_with_gemini('transcript', num_questions=3)
+        config = llm.get_gemini_client().calls[0]['config']
+        self.assertEqual(config.response_mime_type, 'application/json')
+        schema = config.response_schema
+        self.assertEqual(schema.required, list(services.QUIZ_KEYS))
+        questions = schema.properties['questions']
+        self.assertEqual((questions.min_items, questions.max_items), (3, 3))
+        self.assertEqual(questions.items.required, list(services.QUESTION_KEYS))
+        options = questions.items.properties['question_options']
+        self.assertEqual(options.min_items, services.OPTIONS_PER_QUESTION)
+
+    def test_structured_parse_error_is_counted(self):
+        '''A non-JSON structured reply raises and increments parse_error.'''
+
+        before = llm_responses.value(mode='structured', outcome='parse_error')
+        with override_settings(GEMINI_STRUCTURED_OUTPUT=True), self._reply('```json\n{}\n```'):
+            with self.assertRaisesMessage(ValueError, 'Gemini returned invalid JSON.'):
+                services.generate_quiz_with_gemini('transcript', num_questions=1)
+        self.assertEqual(llm_responses.value(mode='structured', outcome='parse_error'), before + 1)
+
+    def test_legacy_mode_strips_fences(self):
+        '''The legacy parser still accepts fenced JSON and sends no config.'''
+
+        quiz = llm.FakeGeminiClient()._generate('m', 'exactly 2 questions').text
+        before = llm_responses.value(mode='legacy', outcome='ok')
+        with override_settings(GEMINI_STRUCTURED_OUTPUT=False), self._reply(f"Here you go:\n```json\n{quiz}\n```") as mock_gen:
+            data = services.generate_quiz_with_gemini('transcript', num_questions=2)
+        self.assertEqual(len(data['questions']), 2)
+        self.assertIsNone(mock_gen.call_args.kwargs['config'])
+        self.assertEqual(llm_responses.value(mode='legacy', outcome='ok'), before + 1)
+
+    def test_invalid_shape_is_counted(self):
+        '''Valid JSON in the wrong shape is counted as invalid.'''
+
+        before = llm_responses.value(mode='structured', outcome='invalid')
+        with override_settings(GEMINI_STRUCTURED_OUTPUT=True), self._reply('{"title": "t"}'):
+            with self.assertRaises(ValueError):
+                services.generate_quiz_with_gemini('transcript', num_questions=1)
+        self.assertEqual(llm_responses.value(mode='structured', outcome='invalid'), before + 1)
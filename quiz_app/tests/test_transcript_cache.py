@@ -0,0 +1,73 @@
+'''Tests for the persistent transcript cache.
+
+Covers:
+- Stored transcripts are returned for the same video/model pair only.
+- Expired entries are treated as misses; the table is trimmed to the size limit.
+- create_quiz_from_youtube skips download and transcription on a cache hit.
+
+Notes:
+- The LLM call is patched in 'quiz_app.api.services' so no network is used.
+'''
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from quiz_app.api import transcript_cache
+from quiz_app.api.services import create_quiz_from_youtube
+from quiz_app.models import Transcript
+
+QUIZ_DICT = {
+    'title': 'T', 'description': 'D',
+    'questions': [{'question_title': 'Q1', 'question_options': ['A', 'B', 'C', 'D'], 'answer': 'A'}],
+}
+
+class TranscriptCacheTests(TestCase):
+    '''Tests for quiz_app.api.transcript_cache.'''
+
+    def test_store_and_lookup(self):
+        '''A stored transcript is a hit for its key and a miss for other models.'''
+
+        transcript_cache.store_transcript('AAAAAAAAAAA', 'small', 'hello world')
+        self.assertEqual(transcript_cache.get_cached_transcript('AAAAAAAAAAA', 'small'), 'hello world')
+        self.assertIsNone(transcript_cache.get_cached_transcript('AAAAAAAAAAA', 'base'))
+        self.assertEqual(Transcript.objects.get(video_id='AAAAAAAAAAA').hits, 1)
+
+    @override_settings(TRANSCRIPT_CACHE_TTL_SEC=60)
+    def test_expired_entry_is_a_miss(self):
+        '''Entries older than the TTL are removed on lookup.'''
+
+        transcript_cache.store_transcript('AAAAAAAAAAA', 'small', 'old')
+        Transcript.objects.update(created_at=timezone.now() - timedelta(seconds=120))
+        self.assertIsNone(transcript_cache.get_cached_transcript('AAAAAAAAAAA', 'small'))
+        self.assertFalse(Transcript.objects.exists())
+
+    @override_settings(TRANSCRIPT_CACHE_MAX_ENTRIES=2, TRANSCRIPT_CACHE_TTL_SEC=None)
+    def test_size_limit_evicts_least_recently_used(self):
+        '''Storing beyond the limit drops the least recently used entry.'''
+
+        transcript_cache.store_transcript('AAAAAAAAAAA', 'small', 'a')
+        transcript_cache.store_transcript('BBBBBBBBBBB', 'small', 'b')
+        Transcript.objects.filter(video_id='AAAAAAAAAAA').update(last_used_at=timezone.now() - timedelta(hours=1))
+        transcript_cache.store_transcript('CCCCCCCCCCC', 'small', 'c')
+        self.assertEqual(sorted(Transcript.objects.values_list('video_id', flat=True)), ['BBBBBBBBBBB', 'CCCCCCCCCCC'])
+
+    @override_settings(WHISPER_MODEL='small')
+    @patch('quiz_app.api.services.generate_quiz_with_gemini', return_value=QUIZ_DICT)
+    @patch('quiz_app.api.services.download_audio')
+    @patch('quiz_app.api.services.ensure_video_available')
+    def test_pipeline_uses_cached_transcript(self, mock_available, mock_download, mock_gemini):
+        '''A cache hit goes straight to the LLM without touching YouTube.'''
+
+        user = User.objects.create_user(username='u1', password='Abc123', email='u1@x.com')
+        transcript_cache.store_transcript('AAAAAAAAAAA', 'small', 'cached transcript')
+
+        quiz = create_quiz_from_youtube('https://youtu.be/AAAAAAAAAAA', owner=user, num_questions=1)
+
+        mock_available.assert_not_called()
+        mock_download.assert_not_called()
+        self.assertEqual(mock_gemini.call_args.args[0], 'cached transcript')
+        self.assertEqual(quiz.questions.count(), 1)
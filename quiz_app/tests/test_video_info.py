@@ -0,0 +1,100 @@
+'''Tests for the shared video metadata fetch.
+
+Covers:
+- ensure_video_available + download_audio perform a single extract_info.
+- Repeated requests for the same video within the TTL skip extraction.
+- QUIZ_METADATA_TTL_SEC=0 disables the cache.
+
+Notes:
+- 'yt_dlp.YoutubeDL' is replaced by a fake that counts extractor calls and
+  writes a small file on download (services imports yt-dlp lazily).
+'''
+
+import pathlib, tempfile
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.api import services
+from quiz_app.api.video_info import video_info_cache
+
+class FakeYoutubeDL:
+    '''Minimal stand-in for yt_dlp.YoutubeDL.'''
+
+    extract_calls = 0
+    download_calls = 0
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        FakeYoutubeDL.extract_calls += 1
+        return {'id': url[-11:], 'ext': 'webm', 'duration': 120}
+
+    @staticmethod
+    def sanitize_info(info, remove_private_keys=False):
+        return dict(info)
+
+    def process_ie_result(self, info, download=True):
+        FakeYoutubeDL.download_calls += 1
+        pathlib.Path(self.prepare_filename(info)).write_bytes(b'audio')
+        return info
+
+    def prepare_filename(self, info):
+        return self.opts['outtmpl'].replace('%(ext)s', info['ext'])
+
+@patch('yt_dlp.YoutubeDL', FakeYoutubeDL)
+class VideoInfoTests(SimpleTestCase):
+    '''Tests for fetch_video_info / ensure_video_available / download_audio.'''
+
+    URL = 'https://www.youtube.com/watch?v=AAAAAAAAAAA'
+
+    def setUp(self):
+        '''Reset counters, cache and use a private tmp dir.'''
+
+        FakeYoutubeDL.extract_calls = FakeYoutubeDL.download_calls = 0
+        video_info_cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(video_info_cache.clear)
+
+    def test_single_extraction_for_check_and_download(self):
+        '''The availability check's info dict is reused by the download.'''
+
+        with override_settings(QUIZ_TMP_DIR=pathlib.Path(self.tmp.name), QUIZ_METADATA_TTL_SEC=300):
+            info = services.ensure_video_available(self.URL, max_duration_sec=600)
+            path = services.download_audio(self.URL, info=info)
+        self.assertTrue(path.endswith('AAAAAAAAAAA.webm'))
+        self.assertEqual(FakeYoutubeDL.extract_calls, 1)
+        self.assertEqual(FakeYoutubeDL.download_calls, 1)
+
+    def test_repeated_requests_hit_cache(self):
+        '''Within the TTL a second request does not extract again.'''
+
+        with override_settings(QUIZ_METADATA_TTL_SEC=300):
+            services.ensure_video_available(self.URL)
+            services.ensure_video_available('https://youtu.be/AAAAAAAAAAA')
+        self.assertEqual(FakeYoutubeDL.extract_calls, 1)
+
+    def test_duration_limit_uses_cached_info(self):
+        '''The duration check works on cached metadata.'''
+
+        with override_settings(QUIZ_METADATA_TTL_SEC=300):
+            services.ensure_video_available(self.URL)
+            with self.assertRaisesMessage(ValueError, 'Video too long.'):
+                services.ensure_video_available(self.URL, max_duration_sec=60)
+        self.assertEqual(FakeYoutubeDL.extract_calls, 1)
+
+    def test_ttl_zero_disables_cache(self):
+        '''With caching disabled every call extracts.'''
+
+        with override_settings(QUIZ_METADATA_TTL_SEC=0):
+            services.ensure_video_available(self.URL)
+            services.ensure_video_available(self.URL)
+        self.assertEqual(FakeYoutubeDL.extract_calls, 2)
@@ -0,0 +1,128 @@
+'''Unit tests for the process-wide Whisper model registry.
+
+Covers:
+- A model is loaded once and served warm on later calls (load/hit counters).
+- Concurrent first access triggers a single load.
+- Explicit eviction forces a reload on the next access.
+- Inference on one model is never run by two threads at once (lease), also
+  through WhisperEngine.transcribe and detect_language; other models stay parallel.
+
+Notes:
+- A fake loader replaces whisper.load_model so no weights are touched.
+'''
+
+import threading, time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from quiz_app.api import whisper_models
+from quiz_app.api.engines import WhisperEngine
+from quiz_app.api.whisper_models import ModelRegistry
+
+class OverlapModel:
+    '''Fake Whisper model recording the peak number of threads inside it.'''
+
+    dims = SimpleNamespace(n_mels=80)
+    device = 'cpu'
+
+    def __init__(self):
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def _run(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+
+    def transcribe(self, audio, language=None, **options):
+        self._run()
+        return {'text': 'x', 'language': 'en'}
+
+    def detect_language(self, mel):
+        self._run()
+        return None, {'en': 0.9, 'de': 0.1}
+
+class ModelRegistryTests(SimpleTestCase):
+    '''Tests for ModelRegistry.'''
+
+    def setUp(self):
+        '''Create a registry with a counting fake loader.'''
+
+        self.calls = []
+        def loader(name):
+            self.calls.append(name)
+            return object()
+        self.registry = ModelRegistry(loader=loader)
+
+    def test_loads_once_then_hits(self):
+        '''Repeated access returns the same object and counts warm hits.'''
+
+        first = self.registry.get('small')
+        second = self.registry.get('small')
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, ['small'])
+        self.assertEqual(self.registry.stats(), {'loads': 1, 'hits': 1, 'loaded': ['small']})
+
+    def test_concurrent_cold_access_loads_once(self):
+        '''Threads racing on a cold model share a single load.'''
+
+        threads = [threading.Thread(target=self.registry.get, args=('base',)) for _ in range(8)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertEqual(self.calls, ['base'])
+        self.assertEqual(self.registry.stats()['hits'], 7)
+
+    def test_evict_forces_reload(self):
+        '''Evicted models are reloaded on next access.'''
+
+        self.registry.get('small')
+        self.registry.get('tiny')
+        self.assertEqual(self.registry.evict('small'), 1)
+        self.assertEqual(self.registry.loaded(), ['tiny'])
+        self.registry.get('small')
+        self.assertEqual(self.calls, ['small', 'tiny', 'small'])
+        self.assertEqual(self.registry.evict(), 2)
+        self.assertEqual(self.registry.loaded(), [])
+
+    def test_lease_is_exclusive_per_model(self):
+        '''Leases of one key never overlap; leases of different keys do.'''
+
+        state = {'active': {}, 'peak': {}}
+        lock = threading.Lock()
+
+        def use(key):
+            with self.registry.lease(key):
+                with lock:
+                    state['active'][key] = state['active'].get(key, 0) + 1
+                    state['peak'][key] = max(state['peak'].get(key, 0), state['active'][key])
+                    both = len([k for k, v in state['active'].items() if v])
+                    state['parallel'] = max(state.get('parallel', 0), both)
+                time.sleep(0.05)
+                with lock:
+                    state['active'][key] -= 1
+
+        threads = [threading.Thread(target=use, args=(key,)) for key in ['small'] * 4 + ['tiny'] * 4]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertEqual(state['peak'], {'small': 1, 'tiny': 1})
+        self.assertEqual(state['parallel'], 2)
+
+    def test_engine_never_runs_model_concurrently(self):
+        '''transcribe and detect_language from several threads are serialized.'''
+
+        model = OverlapModel()
+        registry = ModelRegistry(loader=lambda key: model)
+        engine = WhisperEngine('small')
+        audio = np.zeros(16000, dtype=np.float32)
+        calls = [lambda: engine.transcribe(audio)] * 3 + [lambda: engine.detect_language(audio)] * 3
+        with patch.object(whisper_models, 'registry', registry):
+            threads = [threading.Thread(target=call) for call in calls]
+            for t in threads: t.start()
+            for t in threads: t.join()
+        self.assertEqual(model.peak, 1)
@@ -43,12 +43,54 @@ CSRF_TRUSTED_ORIGINS = [o for o in os.getenv('CSRF_TRUSTED_ORIGINS', '').split('
 # COOKIE_SAMESITE = os.getenv('COOKIE_SAMESITE', 'Lax')
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
+GEMINI_BACKEND = os.getenv('GEMINI_BACKEND', 'google')
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+GEMINI_TIMEOUT_SEC = int(os.getenv('GEMINI_TIMEOUT_SEC', 120))
+GEMINI_STRUCTURED_OUTPUT = os.getenv('GEMINI_STRUCTURED_OUTPUT', 'True').lower() == 'true'
+QUIZ_REPAIR_ATTEMPTS = int(os.getenv('QUIZ_REPAIR_ATTEMPTS', 2))
+QUIZ_TRANSCRIPT_TOKEN_BUDGET = int(os.getenv('QUIZ_TRANSCRIPT_TOKEN_BUDGET', 8000)) or None
+QUIZ_SECTION_CONCURRENCY = int(os.getenv('QUIZ_SECTION_CONCURRENCY', 4))
+QUIZ_TOKEN_ENCODING = os.getenv('QUIZ_TOKEN_ENCODING', 'cl100k_base')
+QUIZ_COMPRESSION_RATIO = float(os.getenv('QUIZ_COMPRESSION_RATIO', 1.0))
 WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'small')
+WHISPER_MODEL_POLICY = os.getenv('WHISPER_MODEL_POLICY', '')
+WHISPER_QUEUE_DOWNGRADE_DEPTH = int(os.getenv('WHISPER_QUEUE_DOWNGRADE_DEPTH', 10))
+TRANSCRIPTION_ENGINE = os.getenv('TRANSCRIPTION_ENGINE', 'whisper')
+WHISPER_QUANTIZE = os.getenv('WHISPER_QUANTIZE', '')
+FASTER_WHISPER_COMPUTE_TYPE = os.getenv('FASTER_WHISPER_COMPUTE_TYPE', 'int8')
+# Parallel chunked transcription is opt-in (0 = off): every one of the WHISPER_WORKERS
+# pool processes loads its own copy of the model next to the one in the web/worker
+# process, e.g. about 1 GB RSS each for 'small' and 2-3 GB for 'medium' in fp32
+# (less with WHISPER_QUANTIZE=int8). Size WHISPER_WORKERS by free memory, not only cores.
+WHISPER_CHUNK_SEC = int(os.getenv('WHISPER_CHUNK_SEC', 0))
+WHISPER_WORKERS = int(os.getenv('WHISPER_WORKERS', max(1, (os.cpu_count() or 1) // 2)))
+TRANSCRIPT_CACHE_TTL_SEC = int(os.getenv('TRANSCRIPT_CACHE_TTL_SEC', 30 * 24 * 3600)) or None
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv('TRANSCRIPT_CACHE_MAX_ENTRIES', 5000)) or None
+QUIZ_RESULT_CACHE_TTL_SEC = int(os.getenv('QUIZ_RESULT_CACHE_TTL_SEC', 7 * 24 * 3600)) or None
+QUIZ_RESULT_CACHE_MAX_ENTRIES = int(os.getenv('QUIZ_RESULT_CACHE_MAX_ENTRIES', 1000)) or None
+QUIZ_METADATA_TTL_SEC = int(os.getenv('QUIZ_METADATA_TTL_SEC', 300))
+QUIZ_STREAM_AUDIO = os.getenv('QUIZ_STREAM_AUDIO', 'True').lower() == 'true'
+QUIZ_USE_CAPTIONS = os.getenv('QUIZ_USE_CAPTIONS', 'True').lower() == 'true'
+QUIZ_CAPTION_LANGS = [l for l in os.getenv('QUIZ_CAPTION_LANGS', '').split(',') if l]
+QUIZ_CAPTION_MIN_CHARS = int(os.getenv('QUIZ_CAPTION_MIN_CHARS', 200))
+QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC = int(os.getenv('QUIZ_SINGLE_FLIGHT_TIMEOUT_SEC', 1800)) or None
+QUIZ_ASYNC_JOBS = os.getenv('QUIZ_ASYNC_JOBS', 'True').lower() == 'true'
+QUIZ_JOB_STALE_SEC = int(os.getenv('QUIZ_JOB_STALE_SEC', 3600)) or None
+QUIZ_JOB_HEARTBEAT_SEC = float(os.getenv('QUIZ_JOB_HEARTBEAT_SEC', 60))
+QUIZ_PAGE_SIZE = int(os.getenv('QUIZ_PAGE_SIZE', 20))
+QUIZ_PAGE_SIZE_MAX = int(os.getenv('QUIZ_PAGE_SIZE_MAX', 100))
+# Per-process caches (locmem/dummy) cannot be invalidated from the job worker or
+# other web processes, so the response cache is only on by default with a shared CACHE_BACKEND.
+QUIZ_RESPONSE_CACHE_TTL_SEC = int(os.getenv(
+    'QUIZ_RESPONSE_CACHE_TTL_SEC',
+    0 if os.getenv('CACHE_BACKEND', 'locmem').lower().rsplit('.', 1)[-1] in ('locmem', 'locmemcache', 'dummycache') else 300,
+))
+QUIZ_RESPONSE_CACHE_ALIAS = os.getenv('QUIZ_RESPONSE_CACHE_ALIAS', 'default')
 FFMPEG_DIR = os.getenv('FFMPEG_DIR', r"C:\ffmpeg\bin")
 if FFMPEG_DIR and FFMPEG_DIR not in os.environ.get('PATH', ''):
     os.environ['PATH'] = FFMPEG_DIR + os.pathsep + os.environ.get('PATH', '')
 
-if not DEBUG and not GEMINI_API_KEY:
+if not DEBUG and not GEMINI_API_KEY and GEMINI_BACKEND != 'fake':
     raise RuntimeError('GEMINI_API_KEY not set in environment')
 
 
@@ -126,6 +168,16 @@ DATABASES = {
     }
 }
 
+# Local memory by default (per process, so QUIZ_RESPONSE_CACHE_TTL_SEC defaults to 0);
+# e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION=redis://127.0.0.1:6379 share the cache between processes.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'quizly'),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators